@@ -7,8 +7,12 @@ from fastapi.middleware.cors import CORSMiddleware
 
 from backend.api.routes import router
 from backend.application.backtest_service import BacktestService
+from backend.application.events import JobEventBus
 from backend.application.interfaces import TaskExecutionService
+from backend.application.progress import JobProgressRegistry
 from backend.application.ranking_service import RankingService
+from backend.application.strategy.calendar import ConfigTradeCalendarProvider
+from backend.application.strategy.loader import default_registry
 from backend.application.sync import DataSyncService, InProcessSyncScheduler, SyncScheduleService
 from backend.application.tasks import ResearchJobService
 from backend.infrastructure.data_sources import create_data_source
@@ -18,6 +22,7 @@ from backend.infrastructure.persistence.duckdb_repository import (
     DuckDBScanJobRepository,
     DuckDBStockRepository,
 )
+from backend.infrastructure.persistence.panel_store import OHLCVPanelStore
 
 logger = logging.getLogger(__name__)
 
@@ -34,11 +39,23 @@ def create_app(
     config = app_config or load_app_config()
     configure_logging(config)
     db_path = get_duckdb_path(config)
-    repository = repository or DuckDBStockRepository(db_path)
+    repository = repository or DuckDBStockRepository(
+        db_path,
+        market_cache_mb=config.get("storage", {}).get("market_cache_mb", 256),
+    )
     job_repository = job_repository or DuckDBScanJobRepository(db_path)
+    strategy_registry = default_registry()
     unified_job_repository = unified_job_repository or DuckDBJobRepository(db_path)
     if job_service is None:
+        panel_dir = config.get("storage", {}).get("panel_dir")
+        panel_store = OHLCVPanelStore(panel_dir, repository) if panel_dir else None
         data_config = config.get("data_source", {})
+        events = JobEventBus()
+        progress = JobProgressRegistry(
+            persist=unified_job_repository.save_progress,
+            persist_interval=config.get("defaults", {}).get("progress_persist_interval", 2.0),
+            notify=events.publish_progress,
+        )
         data_source = create_data_source(
             data_config.get("provider", "tencent"),
             timeout=data_config.get("timeout"),
@@ -49,10 +66,19 @@ def create_app(
             data_source=data_source,
             stock_fetch_timeout=data_config.get("stock_fetch_timeout", data_config.get("timeout", 10.0)),
             daily_fetch_workers=data_config.get("daily_fetch_workers", 8),
+            panel_store=panel_store,
+            write_batch_rows=data_config.get("write_batch_rows", 50_000),
+            write_flush_interval=data_config.get("write_flush_interval", 2.0),
+            write_queue_size=data_config.get("write_queue_size", 64),
+            incremental=data_config.get("incremental_sync", False),
+            refetch_days=data_config.get("incremental_refetch_days", 2),
+            calendar_provider=ConfigTradeCalendarProvider(config),
+            progress=progress,
         )
         backtest_service = BacktestService(
             stock_repository=repository,
             job_repository=unified_job_repository,
+            progress=progress,
         )
         job_service = ResearchJobService(
             stock_repository=repository,
@@ -60,7 +86,13 @@ def create_app(
             app_config=config,
             sync_service=sync_service,
             backtest_service=backtest_service,
+            panel_store=panel_store,
+            progress=progress,
+            events=events,
+            strategy_registry=strategy_registry,
         )
+        if config.get("defaults", {}).get("scan_after_sync", False):
+            sync_service.on_new_bars = job_service.scan_new_bars
     if sync_schedule_service is None and hasattr(job_service, "submit_sync"):
         sync_schedule_service = SyncScheduleService(
             schedule_repository=unified_job_repository,
@@ -98,6 +130,7 @@ def create_app(
     app.state.job_service = job_service
     app.state.sync_schedule_service = sync_schedule_service
     app.state.ranking_service = ranking_service
+    app.state.strategy_registry = strategy_registry
     app.state.sync_scheduler = scheduler
     app.add_middleware(
         CORSMiddleware,
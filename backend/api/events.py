@@ -0,0 +1,57 @@
+"""Server-sent events stream for job status and progress."""
+
+import asyncio
+import json
+from collections.abc import AsyncIterator, Callable
+
+from fastapi import Request
+
+from backend.application.events import TERMINAL_STATUSES, JobEventBus
+
+KEEPALIVE_SECONDS = 15.0
+QUEUE_SIZE = 100
+
+
+def subscribe_job(events: JobEventBus, job_id: str) -> tuple[asyncio.Queue, Callable[[], None]]:
+    """Subscribe on the running loop; events published from worker threads are handed over thread-safely."""
+    loop = asyncio.get_running_loop()
+    queue: asyncio.Queue = asyncio.Queue(maxsize=QUEUE_SIZE)
+    unsubscribe = events.subscribe(job_id, lambda event: loop.call_soon_threadsafe(_offer, queue, event))
+    return queue, unsubscribe
+
+
+async def job_event_stream(
+    request: Request,
+    job: dict,
+    queue: asyncio.Queue,
+    unsubscribe: Callable[[], None],
+    keepalive: float = KEEPALIVE_SECONDS,
+) -> AsyncIterator[str]:
+    """Send the current job, then every change until the job finishes or the client leaves."""
+    try:
+        yield format_event("status", job)
+        if job.get("status") in TERMINAL_STATUSES:
+            return
+        while not await request.is_disconnected():
+            try:
+                event = await asyncio.wait_for(queue.get(), timeout=keepalive)
+            except asyncio.TimeoutError:
+                yield ": keepalive\n\n"
+                continue
+            yield format_event(event["event"], event["data"])
+            if event["event"] == "status" and event["data"].get("status") in TERMINAL_STATUSES:
+                return
+    finally:
+        unsubscribe()
+
+
+def format_event(name: str, data: dict) -> str:
+    return f"event: {name}\ndata: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+
+def _offer(queue: asyncio.Queue, event: dict) -> None:
+    # A slow client loses the oldest events rather than growing the queue;
+    # the newest status and progress always get through.
+    if queue.full():
+        queue.get_nowait()
+    queue.put_nowait(event)
@@ -1,8 +1,11 @@
 from datetime import datetime
 from typing import Annotated
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
+from backend.api.events import job_event_stream, subscribe_job
 from backend.api.schemas import (
     BacktestCreatedResponse,
     BacktestRequest,
@@ -13,7 +16,9 @@ from backend.api.schemas import (
     ScanCreatedResponse,
     ScanJobResponse,
     ScanRequest,
+    SignalCachePurgeResponse,
     StrategyInfo,
+    StrategyReloadResponse,
     StrategyResultResponse,
     SyncCreatedResponse,
     SyncRequest,
@@ -23,7 +28,7 @@ from backend.api.schemas import (
 )
 from backend.application.interfaces import TaskExecutionService
 from backend.application.ranking_service import RankingService
-from backend.application.strategy import load_strategies_from_config
+from backend.application.strategy import StrategyRegistry, default_registry
 from backend.application.sync import SyncScheduleService
 
 router = APIRouter(prefix="/api/v1")
@@ -44,14 +49,27 @@ def get_sync_schedule_service(request: Request):
     return service
 
 
+def get_strategy_registry(request: Request):
+    return getattr(request.app.state, "strategy_registry", None) or default_registry()
+
+
 def get_ranking_service(request: Request):
     return request.app.state.ranking_service
 
 
+def get_signal_cache(request: Request):
+    repository = getattr(request.app.state, "repository", None)
+    if getattr(repository, "purge_signals", None) is None:
+        raise HTTPException(status_code=503, detail="信号缓存不可用")
+    return repository
+
+
 ConfigDep = Annotated[dict, Depends(get_config)]
 JobServiceDep = Annotated[TaskExecutionService, Depends(get_job_service)]
 SyncScheduleServiceDep = Annotated[SyncScheduleService, Depends(get_sync_schedule_service)]
 RankingServiceDep = Annotated[RankingService, Depends(get_ranking_service)]
+StrategyRegistryDep = Annotated[StrategyRegistry, Depends(get_strategy_registry)]
+SignalCacheDep = Annotated[object, Depends(get_signal_cache)]
 JobIdPath = Annotated[str, Path()]
 JobTypeQuery = Annotated[str | None, Query(alias="type")]
 JobLimitQuery = Annotated[int, Query(ge=1, le=200)]
@@ -70,13 +88,23 @@ def health(config: ConfigDep):
 
 
 @router.get("/strategies", response_model=list[StrategyInfo])
-def strategies():
+def strategies(config: ConfigDep, registry: StrategyRegistryDep):
     return [
         {"class_name": s.__class__.__name__, "name": s.name}
-        for s in load_strategies_from_config()
+        for s in registry.load(config)
     ]
 
 
+@router.post("/strategies/reload", response_model=StrategyReloadResponse)
+def reload_strategies(registry: StrategyRegistryDep):
+    return registry.reload()
+
+
+@router.delete("/signal-cache", response_model=SignalCachePurgeResponse)
+def purge_signal_cache(signal_cache: SignalCacheDep, strategy: Annotated[str | None, Query()] = None):
+    return {"deleted": signal_cache.purge_signals(strategy)}
+
+
 @router.get("/rankings/high-low-gain", response_model=list[HighLowGainRankResponse])
 def list_high_low_gain_rank(
     ranking_service: RankingServiceDep,
@@ -103,12 +131,15 @@ def create_scan(
     request_body: Annotated[ScanRequest, Body()],
     job_service: JobServiceDep,
 ):
+    # The legacy ScanJobService has no engine option; only pass it when chosen.
+    options = {} if request_body.engine is None else {"engine": request_body.engine}
     try:
         job = job_service.submit_scan(
             start_date=request_body.start,
             end_date=request_body.end,
             target_dates=request_body.targets,
             strategy_classes=request_body.strategy_classes,
+            **options,
         )
     except ValueError as exc:
         raise HTTPException(status_code=400, detail=str(exc)) from exc
@@ -201,6 +232,24 @@ def get_job(job_id: JobIdPath, job_service: JobServiceDep):
     return job
 
 
+@router.get("/jobs/{job_id}/events")
+async def stream_job_events(job_id: JobIdPath, request: Request, job_service: JobServiceDep):
+    events = getattr(job_service, "events", None)
+    if events is None:
+        raise HTTPException(status_code=404, detail="当前任务服务不支持事件推送")
+    # Subscribe before reading the job so no change between the two is missed.
+    queue, unsubscribe = subscribe_job(events, job_id)
+    job = await run_in_threadpool(job_service.get_unified_job, job_id)
+    if job is None:
+        unsubscribe()
+        raise HTTPException(status_code=404, detail="任务不存在")
+    return StreamingResponse(
+        job_event_stream(request, job, queue, unsubscribe),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
 @router.get("/scans/{job_id}", response_model=ScanJobResponse)
 def get_scan(job_id: JobIdPath, job_service: JobServiceDep):
     getter = getattr(job_service, "get_scan_job", job_service.get_job)
@@ -211,10 +260,13 @@ def get_scan(job_id: JobIdPath, job_service: JobServiceDep):
 
 
 @router.get("/scans/{job_id}/results", response_model=list[StrategyResultResponse])
-def get_scan_results(job_id: JobIdPath, job_service: JobServiceDep):
+def get_scan_results(job_id: JobIdPath, job_service: JobServiceDep, response: Response):
     getter = getattr(job_service, "get_scan_job", job_service.get_job)
-    if getter(job_id) is None:
+    job = getter(job_id)
+    if job is None:
         raise HTTPException(status_code=404, detail="扫描任务不存在")
+    # Hits are written in batches while the scan runs, so earlier reads may be partial.
+    response.headers["X-Scan-Complete"] = "true" if job.get("status") == "completed" else "false"
     return job_service.get_results(job_id)
 
 
@@ -14,11 +14,22 @@ class StrategyInfo(BaseModel):
     name: str
 
 
+class StrategyReloadResponse(BaseModel):
+    reloaded: list[str]
+    removed: list[str]
+    strategy_count: int
+
+
+class SignalCachePurgeResponse(BaseModel):
+    deleted: int
+
+
 class ScanRequest(BaseModel):
     start: str | None = None
     end: str | None = None
     targets: list[str] | None = None
     strategy_classes: list[str] | None = None
+    engine: Literal["executor", "panel"] | None = None
 
 
 class ScanCreatedResponse(BaseModel):
@@ -29,6 +40,16 @@ class ScanCreatedResponse(BaseModel):
     target_dates: list[str]
 
 
+class StrategyProfileResponse(BaseModel):
+    strategy: str
+    calls: int
+    hits: int
+    errors: int
+    wall_seconds: float
+    p50_ms: float
+    p99_ms: float
+
+
 class ScanJobResponse(BaseModel):
     job_id: str
     type: str | None = None
@@ -40,6 +61,8 @@ class ScanJobResponse(BaseModel):
     total_items: int | None = None
     success_count: int | None = None
     failed_count: int | None = None
+    results_complete: bool | None = None
+    strategy_profile: list[StrategyProfileResponse] | None = None
     error: str | None = None
     created_at: str | None = None
     started_at: str | None = None
@@ -83,6 +106,16 @@ class BacktestRequest(BaseModel):
     slippage: float
 
 
+class JobProgressResponse(BaseModel):
+    phase: str
+    processed: int
+    total: int
+    rate: float
+    eta_seconds: float | None = None
+    elapsed_seconds: float | None = None
+    updated_at: str | None = None
+
+
 class JobResponse(BaseModel):
     job_id: str
     type: str
@@ -95,6 +128,8 @@ class JobResponse(BaseModel):
     created_at: str | None = None
     started_at: str | None = None
     finished_at: str | None = None
+    progress: JobProgressResponse | None = None
+    strategy_profile: list[StrategyProfileResponse] | None = None
 
 
 class SyncCreatedResponse(JobResponse):
@@ -3,6 +3,7 @@
 import logging
 
 from backend.application.interfaces import BacktestRunner
+from backend.application.progress import JobProgressRegistry, track
 from backend.application.strategy.calendar import validate_date
 from backend.backtrader_integration import BacktestEngine, DualMATrendStrategyBT
 from backend.domain.models import BacktestResultRecord
@@ -22,9 +23,11 @@ class BacktestService(BacktestRunner):
         self,
         stock_repository: StockRepository,
         job_repository: JobRepository,
+        progress: JobProgressRegistry | None = None,
     ):
         self.stock_repository = stock_repository
         self.job_repository = job_repository
+        self.progress = progress
 
     def list_supported_strategies(self) -> list[str]:
         return list(self.SUPPORTED_STRATEGIES)
@@ -54,6 +57,8 @@ class BacktestService(BacktestRunner):
         engine = BacktestEngine(self.stock_repository)
         records: list[BacktestResultRecord] = []
         failed_count = 0
+        tracker = track(self.progress, job_id)
+        tracker.start("backtest", len(resolved_codes))
         for stock_code in resolved_codes:
             try:
                 result = engine.run_single_stock(
@@ -85,6 +90,7 @@ class BacktestService(BacktestRunner):
             except Exception:
                 failed_count += 1
                 logger.exception("回测 %s 失败", stock_code)
+            tracker.advance()
 
         self.job_repository.save_backtest_results(records)
         return {
@@ -0,0 +1,60 @@
+"""In-process publish/subscribe for job status and progress events."""
+
+import logging
+import threading
+from collections import defaultdict
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+JobEventCallback = Callable[[dict], None]
+
+TERMINAL_STATUSES = frozenset({"completed", "failed"})
+
+
+class JobEventBus:
+    """Fan job events out to subscribers of that job.
+
+    Events are plain dicts with an ``event`` key: ``status`` carries the job
+    payload, ``progress`` carries the progress snapshot.  ``publish`` runs on
+    the publishing thread, so callbacks must only hand the event off (for
+    example to an event loop) and never block.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: dict[str, list[JobEventCallback]] = defaultdict(list)
+
+    def subscribe(self, job_id: str, callback: JobEventCallback) -> Callable[[], None]:
+        """Register ``callback`` for ``job_id`` and return a function that removes it."""
+        with self._lock:
+            self._subscribers[job_id].append(callback)
+
+        def unsubscribe() -> None:
+            with self._lock:
+                callbacks = self._subscribers.get(job_id)
+                if callbacks and callback in callbacks:
+                    callbacks.remove(callback)
+                    if not callbacks:
+                        del self._subscribers[job_id]
+
+        return unsubscribe
+
+    def subscriber_count(self, job_id: str) -> int:
+        with self._lock:
+            return len(self._subscribers.get(job_id, ()))
+
+    def publish(self, job_id: str, event: dict) -> None:
+        with self._lock:
+            callbacks = list(self._subscribers.get(job_id, ()))
+        for callback in callbacks:
+            try:
+                callback(event)
+            except Exception:
+                logger.exception("任务事件推送失败: job_id=%s", job_id)
+
+    def publish_status(self, job: dict) -> None:
+        self.publish(job["job_id"], {"event": "status", "data": job})
+
+    def publish_progress(self, job_id: str, progress: dict) -> None:
+        self.publish(job_id, {"event": "progress", "data": {"job_id": job_id, "progress": progress}})
@@ -53,6 +53,18 @@ class TradeDataProvider(ABC):
     ) -> pd.DataFrame:
         ...
 
+    @abstractmethod
+    def get_histories_for_scan(
+        self,
+        codes: list[str],
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        names: dict[str, str] | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Load scan histories for a batch of codes, keyed by code; ``names`` maps codes to display names."""
+        ...
+
 
 class StrategyExecutionRunner(ABC):
     """Contract for executing configured stock-picking strategies."""
@@ -78,7 +90,7 @@ class StrategyScanRunner(Protocol):
         target_dates: list[str],
         job_id: str | None = None,
         strategy_classes: list[str] | None = None,
-    ) -> list[dict]:
+    ) -> list[dict] | int:
         ...
 
 
@@ -137,6 +149,10 @@ class TradeCalendarProvider(ABC):
     def normalize_targets(self, target_dates: list[str]) -> list[str]:
         ...
 
+    def trade_dates(self, start_date: str, end_date: str) -> list[str] | None:
+        """Trading days in ``[start_date, end_date]``, or None when unknown."""
+        return None
+
 
 class TaskExecutionService(ABC):
     """Contract for creating, running, and querying asynchronous jobs."""
@@ -158,6 +174,8 @@ class TaskExecutionService(ABC):
         end_date: str | None = None,
         target_dates: list[str] | None = None,
         strategy_classes: list[str] | None = None,
+        engine: str | None = None,
+        stock_codes: list[str] | None = None,
     ) -> dict:
         ...
 
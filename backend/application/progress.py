@@ -0,0 +1,147 @@
+"""Live progress of running jobs."""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+
+class JobProgressRegistry:
+    """In-memory progress of running jobs with throttled persistence.
+
+    Workflows report through :func:`track`; every update only touches memory
+    under a lock.  A snapshot is handed to ``persist`` when the phase changes,
+    when a phase completes, and otherwise at most every ``persist_interval``
+    seconds, so the job row shows progress even to other processes without a
+    database write per item.  ``notify`` receives snapshots the same way at
+    the shorter ``notify_interval``, for pushing progress to live clients.
+    ``rate`` is items per second over roughly the last ``rate_window``
+    seconds, so a stall shows up as a falling rate.
+    """
+
+    def __init__(
+        self,
+        persist: Callable[[str, dict], None] | None = None,
+        persist_interval: float = 2.0,
+        rate_window: float = 10.0,
+        clock: Callable[[], float] = time.monotonic,
+        notify: Callable[[str, dict], None] | None = None,
+        notify_interval: float = 0.5,
+    ):
+        self.persist = persist
+        self.persist_interval = persist_interval
+        self.notify = notify
+        self.notify_interval = notify_interval
+        self.rate_window = rate_window
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._jobs: dict[str, _JobProgress] = {}
+
+    def start(self, job_id: str, phase: str, total: int) -> None:
+        now = self.clock()
+        with self._lock:
+            state = _JobProgress(phase, max(0, int(total)), now)
+            self._jobs[job_id] = state
+            snapshot = self._snapshot(state, now)
+        self._emit(self.persist, job_id, snapshot)
+        self._emit(self.notify, job_id, snapshot)
+
+    def advance(self, job_id: str, count: int = 1) -> None:
+        now = self.clock()
+        with self._lock:
+            state = self._jobs.get(job_id)
+            if state is None or count <= 0:
+                return
+            state.processed += count
+            if now - state.samples[-1][0] >= self.rate_window / state.samples.maxlen:
+                state.samples.append((now, state.processed))
+            done = bool(state.total) and state.processed >= state.total
+            persist_due = done or now - state.persisted_at >= self.persist_interval
+            notify_due = self.notify is not None and (done or now - state.notified_at >= self.notify_interval)
+            if not persist_due and not notify_due:
+                return
+            snapshot = self._snapshot(state, now)
+            if persist_due:
+                state.persisted_at = now
+            if notify_due:
+                state.notified_at = now
+        if persist_due:
+            self._emit(self.persist, job_id, snapshot)
+        if notify_due:
+            self._emit(self.notify, job_id, snapshot)
+
+    def snapshot(self, job_id: str) -> dict | None:
+        with self._lock:
+            state = self._jobs.get(job_id)
+            return self._snapshot(state, self.clock()) if state is not None else None
+
+    def finish(self, job_id: str) -> dict | None:
+        """Drop the job from memory and return its last snapshot."""
+        now = self.clock()
+        with self._lock:
+            state = self._jobs.pop(job_id, None)
+            return self._snapshot(state, now) if state is not None else None
+
+    def _snapshot(self, state: "_JobProgress", now: float) -> dict:
+        since, processed_then = state.samples[0]
+        elapsed = now - since
+        rate = (state.processed - processed_then) / elapsed if elapsed > 0 else 0.0
+        remaining = max(0, state.total - state.processed)
+        eta = remaining / rate if rate > 0 else None
+        return {
+            "phase": state.phase,
+            "processed": state.processed,
+            "total": state.total,
+            "rate": round(rate, 2),
+            "eta_seconds": round(eta, 1) if eta is not None else (0.0 if not remaining else None),
+            "elapsed_seconds": round(now - state.started_at, 1),
+            "updated_at": datetime.now().isoformat(),
+        }
+
+    @staticmethod
+    def _emit(target: Callable[[str, dict], None] | None, job_id: str, snapshot: dict) -> None:
+        if target is None:
+            return
+        try:
+            target(job_id, snapshot)
+        except Exception:
+            # Progress is informational; a failed write or push must not fail the job.
+            logger.exception("保存任务进度失败: job_id=%s", job_id)
+
+
+class ProgressTracker:
+    """Progress reporting bound to one job; a no-op without a registry or job id."""
+
+    def __init__(self, registry: JobProgressRegistry | None = None, job_id: str | None = None):
+        self.registry = registry if job_id is not None else None
+        self.job_id = job_id
+
+    def start(self, phase: str, total: int) -> None:
+        if self.registry is not None:
+            self.registry.start(self.job_id, phase, total)
+
+    def advance(self, count: int = 1) -> None:
+        if self.registry is not None:
+            self.registry.advance(self.job_id, count)
+
+
+def track(registry: JobProgressRegistry | None, job_id: str | None) -> ProgressTracker:
+    return ProgressTracker(registry, job_id)
+
+
+class _JobProgress:
+    __slots__ = ("phase", "total", "processed", "started_at", "persisted_at", "notified_at", "samples")
+
+    def __init__(self, phase: str, total: int, started_at: float):
+        self.phase = phase
+        self.total = total
+        self.processed = 0
+        self.started_at = started_at
+        self.persisted_at = started_at
+        self.notified_at = started_at
+        # (time, processed) samples spaced over the rate window.
+        self.samples: deque = deque([(started_at, 0)], maxlen=10)
@@ -108,6 +108,7 @@ class ScanJobService:
     ) -> list[dict]:
         from backend.application.strategy.execution import StrategyExecutor, TradeDataService
         from backend.application.strategy.loader import load_strategies_from_config
+        from backend.domain.indicators import required_indicator_columns
         from backend.infrastructure.data_sources import create_data_source
 
         data_config = self.app_config.get("data_source", {})
@@ -115,20 +116,27 @@ class ScanJobService:
             data_config.get("provider", "tencent"),
             timeout=data_config.get("timeout"),
         )
+        strategies = load_strategies_from_config(
+            config=self.app_config,
+            strategy_classes=strategy_classes,
+        )
         trade_data_service = TradeDataService(
             repository=self.stock_repository,
             data_source=data_source,
             allow_online_fetch=False,
-        )
-        strategies = load_strategies_from_config(
-            config=self.app_config,
-            strategy_classes=strategy_classes,
+            indicator_columns=required_indicator_columns(strategies),
         )
         executor = StrategyExecutor(
             trade_data_service=trade_data_service,
             repository=self.stock_repository,
             strategies=strategies,
             max_workers=self.app_config["defaults"]["max_workers"],
+            history_batch_size=self.app_config["defaults"].get("history_batch_size", 500),
+            execution_mode=self.app_config["defaults"].get("scan_execution", "thread"),
+            process_workers=self.app_config["defaults"].get("scan_processes"),
+            result_flush_rows=self.app_config["defaults"].get("result_flush_rows", 1000),
+            signal_cache=self.app_config["defaults"].get("signal_cache", False),
+            sql_prefilter=self.app_config["defaults"].get("scan_prefilter", False),
         )
         return executor.run(start_date, end_date, target_dates)
 
@@ -7,13 +7,18 @@ from backend.application.strategy.calendar import (
     validate_date,
 )
 from backend.application.strategy.execution import StrategyExecutor, TradeDataService, scan_stock_data
-from backend.application.strategy.loader import load_strategies_from_config
+from backend.application.strategy.loader import StrategyRegistry, default_registry, load_strategies_from_config
+from backend.application.strategy.panel import SCAN_ENGINES, PanelScanEngine
 
 __all__ = [
     "AkshareTradeCalendarProvider",
     "ConfigTradeCalendarProvider",
+    "PanelScanEngine",
+    "SCAN_ENGINES",
     "StrategyExecutor",
+    "StrategyRegistry",
     "TradeDataService",
+    "default_registry",
     "load_strategies_from_config",
     "resolve_scan_dates",
     "scan_stock_data",
@@ -5,6 +5,7 @@ from __future__ import annotations
 from datetime import datetime
 
 from backend.application.interfaces import TradeCalendarProvider
+from backend.application.strategy.planner import lookback_start
 
 
 class AkshareTradeCalendarProvider(TradeCalendarProvider):
@@ -35,6 +36,17 @@ class AkshareTradeCalendarProvider(TradeCalendarProvider):
         trade_days = sorted(trade_cal.loc[trade_cal["trade_date"] <= max_target, "trade_date"].tolist())
         return _map_targets_to_recent_trade_dates(parsed_targets, trade_days)
 
+    def trade_dates(self, start_date: str, end_date: str) -> list[str] | None:
+        import akshare as ak
+        import pandas as pd
+
+        start = datetime.strptime(start_date, "%Y%m%d").date()
+        end = datetime.strptime(end_date, "%Y%m%d").date()
+        trade_cal = ak.tool_trade_date_hist_sina()
+        trade_cal["trade_date"] = pd.to_datetime(trade_cal["trade_date"]).dt.date
+        trade_days = sorted(item for item in trade_cal["trade_date"] if start <= item <= end)
+        return [item.strftime("%Y%m%d") for item in trade_days]
+
 
 class ConfigTradeCalendarProvider(TradeCalendarProvider):
     """Trading calendar that prefers configured dates and falls back to akshare."""
@@ -60,6 +72,15 @@ class ConfigTradeCalendarProvider(TradeCalendarProvider):
         trade_days = [item for item in configured_dates if item <= max_target]
         return _map_targets_to_recent_trade_dates(parsed_targets, trade_days)
 
+    def trade_dates(self, start_date: str, end_date: str) -> list[str] | None:
+        configured_dates = self._configured_dates()
+        end = datetime.strptime(end_date, "%Y%m%d").date()
+        if not configured_dates or configured_dates[-1] < end:
+            # A configured list that stops early cannot tell holes from missing config.
+            return self.fallback.trade_dates(start_date, end_date)
+        start = datetime.strptime(start_date, "%Y%m%d").date()
+        return [item.strftime("%Y%m%d") for item in configured_dates if start <= item <= end]
+
     def _configured_dates(self) -> list:
         configured_dates = self.app_config.get("trade_calendar", {}).get("dates")
         if not configured_dates:
@@ -73,7 +94,14 @@ def resolve_scan_dates(
     end_date: str | None,
     target_dates: list[str] | None,
     calendar_provider: TradeCalendarProvider | None = None,
+    lookback: int | None = None,
 ) -> tuple[str, str, list[str]]:
+    """Validate or default the scan range and target dates.
+
+    Without an explicit range, ``lookback`` (trading days the selected
+    strategies need) sizes the window to end at the latest target; otherwise
+    the last ``defaults.check_days`` trading days are used.
+    """
     calendar_provider = calendar_provider or ConfigTradeCalendarProvider(app_config)
     if start_date:
         validate_date(start_date)
@@ -83,9 +111,6 @@ def resolve_scan_dates(
     if bool(start_date) != bool(end_date):
         raise ValueError("start 和 end 必须同时提供")
 
-    if not start_date or not end_date:
-        start_date, end_date = calendar_provider.recent_range(app_config["defaults"]["check_days"])
-
     if target_dates:
         for td in target_dates:
             validate_date(td)
@@ -94,6 +119,13 @@ def resolve_scan_dates(
         _, default_target = calendar_provider.recent_range(15)
         target_dates = [default_target]
 
+    if not start_date or not end_date:
+        if lookback:
+            start_date = min(lookback_start(calendar_provider, target, lookback) for target in target_dates)
+            end_date = max(target_dates)
+        else:
+            start_date, end_date = calendar_provider.recent_range(app_config["defaults"]["check_days"])
+
     return start_date, end_date, target_dates
 
 
@@ -1,14 +1,38 @@
 """Strategy execution workflow."""
 
+import inspect
 import logging
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import os
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from functools import lru_cache
 
+import numpy as np
 import pandas as pd
 
 from backend.application.interfaces import StrategyExecutionRunner, TradeDataProvider
+from backend.application.progress import JobProgressRegistry, ProgressTracker, track
+from backend.application.strategy.planner import ScanPlanner
+from backend.application.strategy.process_pool import (
+    create_process_pool,
+    pack_shard,
+    release_shard,
+    scan_shard,
+    scan_shard_profiled,
+)
+from backend.application.strategy.profiling import StrategyProfiler
+from backend.application.strategy.results import DEFAULT_FLUSH_ROWS, ScanResultSink
+from backend.application.strategy.signal_cache import (
+    SignalCache,
+    StockSignals,
+    fingerprint_span,
+    row_hash_sums,
+    strategy_key,
+    window_fingerprints,
+)
 from backend.domain.market import get_market_code
-from backend.domain.ports import MarketDataSource, StockRepository
-from backend.domain.strategy import BaseStrategy
+from backend.domain.ports import MarketDataSource, MarketPanelStore, StockRepository
+from backend.domain.strategy import BaseStrategy, StrategyContext
 
 logger = logging.getLogger(__name__)
 
@@ -21,10 +45,14 @@ class TradeDataService(TradeDataProvider):
         repository: StockRepository,
         data_source: MarketDataSource,
         allow_online_fetch: bool = True,
+        panel_store: MarketPanelStore | None = None,
+        indicator_columns: list[str] | None = None,
     ):
         self.repository = repository
         self.data_source = data_source
         self.allow_online_fetch = allow_online_fetch
+        self.panel_store = panel_store
+        self.indicator_columns = list(indicator_columns or [])
 
     def list_stocks(self) -> pd.DataFrame:
         stocks = self.repository.list_stocks()
@@ -48,13 +76,108 @@ class TradeDataService(TradeDataProvider):
         end_date: str,
         target_dates: list[str],
     ) -> pd.DataFrame:
-        return self.ensure_daily_data(
+        history = self.ensure_daily_data(
             code=code,
             name=name,
             start_date=start_date,
             end_date=end_date,
             required_dates=target_dates,
         )
+        return self._attach_indicators({code: history}, start_date, end_date)[code]
+
+    def get_histories_for_scan(
+        self,
+        codes: list[str],
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        names: dict[str, str] | None = None,
+    ) -> dict[str, pd.DataFrame]:
+        """Load a batch of histories in one query.
+
+        Incomplete histories are fetched online one after another on the
+        calling thread; :class:`StrategyExecutor` therefore uses this only
+        for local-only scans.
+        """
+        names = names or {}
+        missing = self._missing_target_dates(codes, target_dates)
+        if missing is not None:
+            return self._load_with_coverage(codes, start_date, end_date, target_dates, missing, names)
+
+        histories = self._load_histories(codes, start_date, end_date)
+        if not self.allow_online_fetch:
+            return self._attach_indicators(histories, start_date, end_date)
+
+        for code in codes:
+            local_data = histories.get(code)
+            if local_data is None or self._needs_online_fetch(local_data, target_dates):
+                histories[code] = self.ensure_daily_data(
+                    code=code,
+                    name=names.get(code, code),
+                    start_date=start_date,
+                    end_date=end_date,
+                    required_dates=target_dates,
+                )
+        return self._attach_indicators(histories, start_date, end_date)
+
+    def _missing_target_dates(self, codes: list[str], target_dates: list[str]) -> dict[str, list[str]] | None:
+        finder = getattr(self.repository, "get_missing_trade_dates", None)
+        if finder is None or not target_dates:
+            return None
+        return finder(codes, target_dates)
+
+    def _load_with_coverage(
+        self,
+        codes: list[str],
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        missing: dict[str, list[str]],
+        names: dict[str, str],
+    ) -> dict[str, pd.DataFrame]:
+        """Load a batch using the coverage index instead of inspecting each history.
+
+        Without online fetch, a stock missing every target date cannot produce
+        a hit and is not loaded at all.
+        """
+        if not self.allow_online_fetch:
+            wanted = len(set(target_dates))
+            loadable = [code for code in codes if len(set(missing.get(code, ()))) < wanted]
+            histories = self._load_histories(loadable, start_date, end_date) if loadable else {}
+            return self._attach_indicators(histories, start_date, end_date)
+
+        histories = self._load_histories([code for code in codes if code not in missing], start_date, end_date)
+        for code in codes:
+            if code in missing:
+                histories[code] = self.ensure_daily_data(
+                    code=code,
+                    name=names.get(code, code),
+                    start_date=start_date,
+                    end_date=end_date,
+                    required_dates=target_dates,
+                )
+        return self._attach_indicators(histories, start_date, end_date)
+
+    def _attach_indicators(
+        self,
+        histories: dict[str, pd.DataFrame],
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, pd.DataFrame]:
+        return attach_indicators(self.repository, histories, self.indicator_columns, start_date, end_date)
+
+    def _load_histories(self, codes: list[str], start_date: str, end_date: str) -> dict[str, pd.DataFrame]:
+        histories = None
+        if self.panel_store is not None:
+            histories = self.panel_store.get_histories(codes, start_date, end_date)
+        if histories is None:
+            return self.repository.get_stock_histories(codes, start_date, end_date)
+
+        # Codes written outside a panel refresh are still read from the repository.
+        missing = [code for code in codes if code not in histories]
+        if missing:
+            histories.update(self.repository.get_stock_histories(missing, start_date, end_date))
+        return histories
 
     def ensure_daily_data(
         self,
@@ -79,6 +202,14 @@ class TradeDataService(TradeDataProvider):
             )
             if not fetched_data.empty:
                 self.repository.upsert_daily_data(fetched_data, source=getattr(self.data_source, "name", None))
+                refresh_indicators(self.repository, code, fetched_data)
+                if self.panel_store is not None:
+                    written_days = pd.to_datetime(fetched_data["date"])
+                    self.panel_store.invalidate(
+                        [code],
+                        written_days.min().strftime("%Y%m%d"),
+                        written_days.max().strftime("%Y%m%d"),
+                    )
                 local_data = self.repository.get_stock_history(code, start_date, end_date)
 
         return local_data.sort_values("date").reset_index(drop=True)
@@ -87,15 +218,27 @@ class TradeDataService(TradeDataProvider):
     def _needs_online_fetch(local_data: pd.DataFrame, target_dates: list[str]) -> bool:
         if local_data.empty:
             return True
-        available_dates = {
-            item.strftime("%Y%m%d")
-            for item in pd.to_datetime(local_data["date"], errors="coerce").dropna()
-        }
-        return any(td not in available_dates for td in target_dates)
+        available_days = _trade_days(local_data["date"])
+        return not np.isin(_target_days(target_dates), available_days).all()
 
 
 class StrategyExecutor(StrategyExecutionRunner):
-    """Run configured strategies across all listed stocks."""
+    """Run configured strategies across all listed stocks.
+
+    ``execution_mode="process"`` evaluates history chunks in a process pool of
+    ``process_workers`` (default: one per core) instead of threads; it needs a
+    trade data service with ``get_histories_for_scan``.
+
+    Hits are written to the repository every ``result_flush_rows`` as workers
+    finish.  :meth:`run` also returns them; :meth:`stream` keeps only a count.
+    Stocks done are reported to ``progress`` under the job id.
+
+    With ``signal_cache`` the thread mode reuses cached signals whose
+    strategy version and input window are unchanged, and caches new ones.
+    With ``sql_prefilter`` a local-only scan loads only the stocks that pass
+    the strategies' ``prefilter_sql`` (see :meth:`ScanPlanner.candidate_codes`).
+    Strategy calls are timed into ``profiler`` when one is given.
+    """
 
     def __init__(
         self,
@@ -103,36 +246,219 @@ class StrategyExecutor(StrategyExecutionRunner):
         repository: StockRepository,
         strategies: list[BaseStrategy],
         max_workers: int = 8,
+        history_batch_size: int = 500,
+        execution_mode: str = "thread",
+        process_workers: int | None = None,
+        result_flush_rows: int = DEFAULT_FLUSH_ROWS,
+        progress: JobProgressRegistry | None = None,
+        signal_cache: bool = False,
+        sql_prefilter: bool = False,
+        profiler: StrategyProfiler | None = None,
     ):
         self.trade_data_service = trade_data_service
         self.repository = repository
         self.strategies = strategies
         self.max_workers = max_workers
+        self.history_batch_size = max(1, int(history_batch_size or 1))
+        self.execution_mode = execution_mode
+        self.process_workers = process_workers or os.cpu_count() or 1
+        self.result_flush_rows = result_flush_rows
+        self.progress = progress
+        self.signal_cache = signal_cache
+        self.sql_prefilter = sql_prefilter
+        self.profiler = profiler
 
-    def run(self, start_date: str, end_date: str, target_dates: list[str], job_id: str | None = None) -> list[dict]:
+    def run(
+        self,
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        job_id: str | None = None,
+        stock_codes: list[str] | None = None,
+    ) -> list[dict]:
+        sink = ScanResultSink(self.repository, job_id, self.result_flush_rows, keep=True)
+        self._scan(sink, start_date, end_date, target_dates, stock_codes)
+        return sink.results
+
+    def stream(
+        self,
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        job_id: str | None = None,
+        stock_codes: list[str] | None = None,
+    ) -> int:
+        """Scan like :meth:`run` but keep no hits in memory; returns the hit count."""
+        sink = ScanResultSink(self.repository, job_id, self.result_flush_rows)
+        self._scan(sink, start_date, end_date, target_dates, stock_codes)
+        return sink.count
+
+    def _scan(
+        self,
+        sink: ScanResultSink,
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        stock_codes: list[str] | None = None,
+    ) -> None:
         stocks = self.trade_data_service.list_stocks()
-        logger.info("获取到 %s 只股票", len(stocks))
-
-        result_stocks: list[dict] = []
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            futures = {
-                executor.submit(
-                    self._scan_stock, str(row["code"]), row["name"],
-                    start_date, end_date, target_dates,
-                ): row
-                for _, row in stocks[["code", "name"]].iterrows()
-            }
-            for future in as_completed(futures):
-                try:
-                    result = future.result()
-                    if result:
-                        result_stocks.extend(result)
-                except Exception as exc:
-                    logger.error("处理任务出错: %s", exc)
-
-        self.repository.upsert_strategy_results(result_stocks, job_id=job_id)
-        logger.info("策略执行完成，共找到 %s 条符合条件的记录", len(result_stocks))
-        return result_stocks
+        rows = [(str(code), name) for code, name in zip(stocks["code"], stocks["name"])]
+        if stock_codes is not None:
+            wanted = set(stock_codes)
+            rows = [(code, name) for code, name in rows if code in wanted]
+        logger.info("获取到 %s 只股票", len(rows))
+
+        rows = self._eligible_rows(rows, start_date, end_date)
+        rows = self._prefiltered_rows(rows, target_dates)
+        tracker = track(self.progress, sink.job_id)
+        tracker.start("scan", len(rows))
+        cache = self._open_signal_cache()
+        bulk_loader = getattr(self.trade_data_service, "get_histories_for_scan", None)
+        if bulk_loader is not None and getattr(self.trade_data_service, "allow_online_fetch", True):
+            # Online fetches are per stock, so the worker pool runs them concurrently.
+            if self.execution_mode == "process":
+                logger.info("允许在线补抓时按股票线程扫描，不使用进程模式")
+            bulk_loader = None
+        if self.execution_mode == "process" and bulk_loader is not None:
+            self._run_processes(bulk_loader, rows, start_date, end_date, target_dates, sink, tracker)
+        else:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                if bulk_loader is None:
+                    futures = [
+                        executor.submit(self._scan_stock, code, name, start_date, end_date, target_dates)
+                        for code, name in rows
+                    ]
+                    self._collect(futures, sink, tracker)
+                else:
+                    # Load chunk N+1 while the pool is still evaluating chunk N.
+                    pending: list = []
+                    for offset in range(0, len(rows), self.history_batch_size):
+                        chunk = rows[offset:offset + self.history_batch_size]
+                        futures = self._submit_chunk(
+                            executor, bulk_loader, chunk, start_date, end_date, target_dates, cache,
+                        )
+                        if not futures:
+                            tracker.advance(len(chunk))
+                        self._collect(pending, sink, tracker)
+                        if cache is not None:
+                            cache.flush()
+                        pending = futures
+                    self._collect(pending, sink, tracker)
+
+        sink.flush()
+        if cache is not None:
+            cache.flush()
+            logger.info("信号缓存复用 %s 次策略判断", cache.reused)
+        logger.info("策略执行完成，共找到 %s 条符合条件的记录", sink.count)
+
+    def _open_signal_cache(self) -> SignalCache | None:
+        if not self.signal_cache or getattr(self.repository, "get_signals", None) is None:
+            return None
+        return SignalCache(self.repository, self.strategies)
+
+    def _eligible_rows(self, rows: list[tuple[str, str]], start_date: str, end_date: str) -> list[tuple[str, str]]:
+        """Skip stocks too short for every strategy before loading anything.
+
+        Only applies to local-only scans; with online fetch a short local
+        history may still be completed from the data source.
+        """
+        if getattr(self.trade_data_service, "allow_online_fetch", True):
+            return rows
+        eligible = set(ScanPlanner(self.strategies).eligible_codes(
+            self.repository, [code for code, _ in rows], start_date, end_date,
+        ))
+        return [(code, name) for code, name in rows if code in eligible]
+
+    def _prefiltered_rows(self, rows: list[tuple[str, str]], target_dates: list[str]) -> list[tuple[str, str]]:
+        if not self.sql_prefilter or getattr(self.trade_data_service, "allow_online_fetch", True):
+            return rows
+        try:
+            candidates = set(ScanPlanner(self.strategies).candidate_codes(
+                self.repository, [code for code, _ in rows], target_dates,
+            ))
+        except Exception:
+            # The prefilter only saves work; a broken condition must not lose hits.
+            logger.exception("SQL 预筛失败，改为扫描全部股票")
+            return rows
+        return [(code, name) for code, name in rows if code in candidates]
+
+    def _run_processes(
+        self, bulk_loader, rows, start_date, end_date, target_dates, sink: ScanResultSink, tracker: ProgressTracker,
+    ) -> None:
+        """Scan in worker processes, one shared-memory shard per worker and chunk.
+
+        Hits are handed to the sink as each shard finishes, and at most two
+        shards per worker are in flight so loading in the parent stays just ahead.
+        """
+        in_flight: dict = {}
+        try:
+            with create_process_pool(self.strategies, self.process_workers) as pool:
+                for offset in range(0, len(rows), self.history_batch_size):
+                    chunk = rows[offset:offset + self.history_batch_size]
+                    codes = [code for code, _ in chunk]
+                    try:
+                        histories = bulk_loader(codes, start_date, end_date, target_dates, names=dict(chunk))
+                    except Exception as exc:
+                        logger.exception("批量读取 %s 只股票历史数据出错: %s", len(codes), exc)
+                        tracker.advance(len(chunk))
+                        continue
+                    shard_size = -(-len(chunk) // self.process_workers)
+                    for shard_offset in range(0, len(chunk), shard_size):
+                        shard_rows = chunk[shard_offset:shard_offset + shard_size]
+                        packed = pack_shard(shard_rows, histories)
+                        # Stocks without history are done as soon as they are skipped.
+                        tracker.advance(len(shard_rows) - (len(packed[0].codes) if packed else 0))
+                        if packed is None:
+                            continue
+                        shard, memory = packed
+                        worker = scan_shard if self.profiler is None else scan_shard_profiled
+                        in_flight[pool.submit(worker, shard, target_dates)] = (shard, memory)
+                        while len(in_flight) >= 2 * self.process_workers:
+                            self._drain(in_flight, sink, tracker)
+                while in_flight:
+                    self._drain(in_flight, sink, tracker)
+        finally:
+            for _, memory in in_flight.values():
+                release_shard(memory)
+
+    def _drain(self, in_flight: dict, sink: ScanResultSink, tracker: ProgressTracker) -> None:
+        done, _ = wait(list(in_flight), return_when=FIRST_COMPLETED)
+        for future in done:
+            shard, memory = in_flight.pop(future)
+            release_shard(memory)
+            tracker.advance(len(shard.codes))
+            try:
+                results = future.result()
+                if self.profiler is not None:
+                    results, profile = results
+                    self.profiler.merge(profile)
+                sink.add(results)
+            except Exception as exc:
+                logger.error("处理任务出错: %s", exc)
+
+    def _submit_chunk(self, executor, bulk_loader, chunk, start_date, end_date, target_dates, cache=None) -> list:
+        codes = [code for code, _ in chunk]
+        try:
+            histories = bulk_loader(codes, start_date, end_date, target_dates, names=dict(chunk))
+            signals = cache.lookup(codes, target_dates) if cache is not None else {}
+        except Exception as exc:
+            logger.exception("批量读取 %s 只股票历史数据出错: %s", len(codes), exc)
+            return []
+        return [
+            executor.submit(
+                self._scan_history, code, name, histories.get(code), target_dates, signals.get(code), cache,
+            )
+            for code, name in chunk
+        ]
+
+    @staticmethod
+    def _collect(futures, sink: ScanResultSink, tracker: ProgressTracker) -> None:
+        for future in as_completed(futures):
+            tracker.advance()
+            try:
+                sink.add(future.result())
+            except Exception as exc:
+                logger.error("处理任务出错: %s", exc)
 
     def _scan_stock(self, code, name, start_date, end_date, target_dates) -> list[dict]:
         try:
@@ -143,52 +469,243 @@ class StrategyExecutor(StrategyExecutionRunner):
                 end_date=end_date,
                 target_dates=target_dates,
             )
-            if hist_data.empty:
+        except Exception as exc:
+            logger.exception("处理 %s(%s) 出错: %s", name, code, exc)
+            return []
+        return self._scan_history(code, name, hist_data, target_dates)
+
+    def _scan_history(self, code, name, hist_data, target_dates, signals=None, cache=None) -> list[dict]:
+        try:
+            if hist_data is None or hist_data.empty:
                 logger.warning("%s(%s) 历史数据为空", name, code)
                 return []
-            return scan_stock_data(code, name, hist_data, target_dates, self.strategies)
+            results = scan_stock_data(code, name, hist_data, target_dates, self.strategies, signals, self.profiler)
+            if signals is not None and cache is not None:
+                cache.record(signals)
+            return results
         except Exception as exc:
             logger.exception("处理 %s(%s) 出错: %s", name, code, exc)
             return []
 
 
+def attach_indicators(
+    repository: StockRepository,
+    histories: dict[str, pd.DataFrame],
+    columns: list[str],
+    start_date: str,
+    end_date: str,
+) -> dict[str, pd.DataFrame]:
+    """Join the precomputed indicator ``columns`` to each history, if stored."""
+    loader = getattr(repository, "get_indicator_histories", None)
+    if not columns or loader is None or not histories:
+        return histories
+
+    indicators = loader(list(histories), start_date, end_date)
+    for code, history in histories.items():
+        frame = indicators.get(code)
+        if frame is None or history.empty:
+            continue
+        history = history.assign(date=history["date"].astype("datetime64[ns]"))
+        histories[code] = history.merge(frame[["date", *columns]], on="date", how="left")
+    return histories
+
+
+def refresh_indicators(repository: StockRepository, code: str, written: pd.DataFrame) -> None:
+    """Recompute stored indicators for ``code`` from the first bar just written."""
+    refresh_written_indicators(repository, {code: written})
+
+
+def refresh_written_indicators(repository: StockRepository, written: dict[str, pd.DataFrame]) -> None:
+    """Recompute stored indicators of every code in ``written`` in one batch.
+
+    Each code is refreshed from the first bar just written for it.
+    """
+    if getattr(repository, "refresh_indicators", None) is None:
+        return
+    starts = {}
+    for code, data in written.items():
+        dates = pd.to_datetime(data["date"], errors="coerce").dropna() if data is not None and not data.empty else None
+        if dates is not None and not dates.empty:
+            starts[code] = dates.min().strftime("%Y%m%d")
+    if not starts:
+        return
+    batch = getattr(repository, "refresh_indicators_batch", None)
+    try:
+        if batch is not None:
+            batch(starts)
+        else:
+            for code, start_date in starts.items():
+                repository.refresh_indicators(code, start_date)
+    except Exception:
+        # Indicators are derived data; strategies recompute them when missing.
+        logger.exception("刷新技术指标失败: %s", ", ".join(starts))
+
+
 def scan_stock_data(
     code: str,
     name: str,
     hist_data: pd.DataFrame,
     target_dates: list[str],
     strategies: list[BaseStrategy],
+    signals: StockSignals | None = None,
+    profiler: StrategyProfiler | None = None,
 ) -> list[dict]:
-    """Run all strategies for one stock and return hit payloads."""
-    hist_data = hist_data.sort_values("date").reset_index(drop=True)
-    date_to_index = {
-        row["date"].strftime("%Y%m%d"): idx
-        for idx, row in hist_data.iterrows()
-    }
+    """Run all strategies for one stock and return hit payloads.
+
+    With ``signals``, strategies whose cached result for every target still
+    matches the input window are not evaluated, and new evaluations are
+    appended to ``signals.fresh``.  Each strategy call is recorded in
+    ``profiler``.
+    """
+    if not hist_data["date"].is_monotonic_increasing:
+        hist_data = hist_data.sort_values("date", kind="stable")
+    if not isinstance(hist_data.index, pd.RangeIndex) or hist_data.index.start != 0:
+        hist_data = hist_data.reset_index(drop=True)
+
+    # Locate every target date with one binary search over the sorted days.
+    days = _trade_days(hist_data["date"])
+    targets = _target_days(target_dates)
+    positions = np.searchsorted(days, targets)
+    found = positions < len(days)
+    found[found] = days[positions[found]] == targets[found]
+
+    target_positions = positions[found]
+    if not len(target_positions):
+        return []
+    found_dates = [target_date for target_date, is_found in zip(target_dates, found) if is_found]
+    context = StrategyContext(hist_data)
+    if signals is None:
+        flags = [_strategy_hits(strategy, context, target_positions, profiler) for strategy in strategies]
+    else:
+        flags = _cached_strategy_hits(code, strategies, context, target_positions, found_dates, signals, profiler)
 
     results = []
-    for target_date in target_dates:
-        if target_date not in date_to_index:
+    for column, (target_date, target_index) in enumerate(zip(found_dates, target_positions)):
+        today = hist_data.iloc[target_index]
+        for strategy, hits in zip(strategies, flags):
+            if hits[column]:
+                results.append({
+                    "code": code,
+                    "name": name,
+                    "strategy": strategy.name,
+                    "target_date": target_date,
+                    "current_price": _to_opt_float(today.get("close")),
+                    "current_volume": _to_opt_int(today.get("volume")),
+                })
+
+    return results
+
+
+def _cached_strategy_hits(
+    code: str,
+    strategies: list[BaseStrategy],
+    context: StrategyContext,
+    target_positions: np.ndarray,
+    found_dates: list[str],
+    signals: StockSignals,
+    profiler: StrategyProfiler | None = None,
+) -> list[np.ndarray]:
+    sums = None
+    flags = []
+    for strategy in strategies:
+        key = strategy_key(strategy)
+        version = signals.versions.get(key)
+        if version is None:
+            flags.append(_strategy_hits(strategy, context, target_positions, profiler))
+            continue
+        if sums is None:
+            sums = row_hash_sums(context.hist_data)
+        fingerprints = window_fingerprints(sums, target_positions, fingerprint_span(strategy))
+        cached = [signals.known.get((key, target_date)) for target_date in found_dates]
+        if all(entry is not None and entry[0] == fingerprint for entry, fingerprint in zip(cached, fingerprints)):
+            flags.append(np.array([entry[1] for entry in cached], dtype=bool))
+            signals.reused += len(cached)
             continue
-        target_index = date_to_index[target_date]
-        hist_data_for_check = hist_data.iloc[:target_index + 1]
-        today = hist_data_for_check.iloc[-1]
 
-        for strategy in strategies:
-            try:
-                if strategy.check(hist_data_for_check):
-                    results.append({
-                        "code": code,
-                        "name": name,
-                        "strategy": strategy.name,
-                        "target_date": target_date,
-                        "current_price": _to_opt_float(today.get("close")),
-                        "current_volume": _to_opt_int(today.get("volume")),
-                    })
-            except Exception as exc:
-                logger.error("策略 %s 执行出错: %s", strategy.__class__.__name__, exc)
+        hits, clean = _evaluate(strategy, context, target_positions, profiler)
+        flags.append(hits)
+        # A miss caused by an exception is not a result worth remembering.
+        if clean:
+            signals.fresh.extend(
+                (key, code, target_date, version, int(fingerprint), bool(hit))
+                for target_date, fingerprint, hit, entry in zip(found_dates, fingerprints, hits, cached)
+                if entry is None or entry[0] != fingerprint
+            )
+    return flags
 
-    return results
+
+def _strategy_hits(
+    strategy: BaseStrategy,
+    context: StrategyContext,
+    target_positions: np.ndarray,
+    profiler: StrategyProfiler | None = None,
+) -> np.ndarray:
+    """Evaluate one strategy at every target row, vectorized when it supports it."""
+    return _evaluate(strategy, context, target_positions, profiler)[0]
+
+
+def _evaluate(
+    strategy: BaseStrategy,
+    context: StrategyContext,
+    target_positions: np.ndarray,
+    profiler: StrategyProfiler | None = None,
+) -> tuple[np.ndarray, bool]:
+    """Return the hits and whether every target was evaluated without an exception."""
+    key = strategy.__class__.__name__
+    check_series = getattr(strategy, "check_series", None)
+    if check_series is not None:
+        started = time.perf_counter()
+        try:
+            series = _call_with_context(check_series, context)
+            if series is not None:
+                hits = np.asarray(series, dtype=bool)[target_positions]
+                _record(profiler, key, started, int(hits.sum()))
+                return hits, True
+        except Exception as exc:
+            _record(profiler, key, started, error=True)
+            logger.error("策略 %s 向量化执行出错，回退为逐日判断: %s", key, exc)
+
+    hits = np.zeros(len(target_positions), dtype=bool)
+    clean = True
+    for column, target_index in enumerate(target_positions):
+        started = time.perf_counter()
+        try:
+            hits[column] = bool(_call_with_context(strategy.check, context.window(target_index)))
+            _record(profiler, key, started, int(hits[column]))
+        except Exception as exc:
+            clean = False
+            _record(profiler, key, started, error=True)
+            logger.error("策略 %s 执行出错: %s", key, exc)
+    return hits, clean
+
+
+def _record(profiler: StrategyProfiler | None, strategy: str, started: float, hits: int = 0, error: bool = False) -> None:
+    if profiler is not None:
+        profiler.record(strategy, time.perf_counter() - started, hits, error)
+
+
+def _call_with_context(method, context: StrategyContext):
+    """Call ``check``/``check_series``, passing the shared context only if it is accepted."""
+    if _accepts_context(getattr(method, "__func__", method)):
+        return method(context.hist_data, context=context)
+    return method(context.hist_data)
+
+
+@lru_cache(maxsize=None)
+def _accepts_context(function) -> bool:
+    try:
+        return "context" in inspect.signature(function).parameters
+    except (TypeError, ValueError):
+        return False
+
+
+def _trade_days(dates: pd.Series) -> np.ndarray:
+    """Return history dates as ``datetime64[D]`` without per-row parsing."""
+    return pd.to_datetime(dates, errors="coerce").to_numpy(dtype="datetime64[D]")
+
+
+def _target_days(target_dates: list[str]) -> np.ndarray:
+    return pd.to_datetime(pd.Series(target_dates, dtype=object), format="%Y%m%d").to_numpy(dtype="datetime64[D]")
 
 
 def _to_opt_float(v):
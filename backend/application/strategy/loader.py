@@ -1,57 +1,131 @@
 """Strategy discovery and config-driven loading."""
 
 import importlib
+import logging
+import sys
+import threading
 from pathlib import Path
 
 import yaml
 
 from backend.domain.strategy import BaseStrategy
 
+logger = logging.getLogger(__name__)
+
 _STRATEGIES_DIR = Path(__file__).resolve().parents[2] / "strategies"
+_STRATEGIES_PACKAGE = "backend.strategies"
 _DEFAULT_CONFIG_PATH = Path(__file__).resolve().parents[2] / "config" / "app_config.yaml"
 
 
+class StrategyRegistry:
+    """Strategy classes of the strategies package, discovered once.
+
+    Lookups by class name read an in-memory mapping, so requests never touch
+    the filesystem or the import machinery.  :meth:`reload` rescans the
+    directory and re-imports only modules whose file mtime changed; classes of
+    deleted modules are dropped.  Enablement is not cached, it is read from
+    the config passed to :meth:`load` on each call.
+    """
+
+    def __init__(self, strategies_dir: str | Path = _STRATEGIES_DIR, package: str = _STRATEGIES_PACKAGE):
+        self.strategies_dir = Path(strategies_dir)
+        self.package = package
+        self._lock = threading.Lock()
+        self._mtimes: dict[str, float] = {}
+        self._module_classes: dict[str, dict[str, type[BaseStrategy]]] = {}
+        self._classes: dict[str, type[BaseStrategy]] = {}
+        self.reload()
+
+    def classes(self) -> dict[str, type[BaseStrategy]]:
+        """Class name -> strategy class, in module file order."""
+        return self._classes
+
+    def get(self, class_name: str) -> type[BaseStrategy] | None:
+        return self._classes.get(class_name)
+
+    def reload(self) -> dict:
+        """Re-import new and modified strategy modules; returns what changed."""
+        with self._lock:
+            importlib.invalidate_caches()
+            files = {
+                path.stem: path.stat().st_mtime
+                for path in sorted(self.strategies_dir.iterdir())
+                if path.is_file() and path.suffix == ".py" and path.name != "__init__.py"
+            }
+            changed = [stem for stem, mtime in files.items() if self._mtimes.get(stem) != mtime]
+            removed = [stem for stem in self._mtimes if stem not in files]
+            for stem in changed:
+                module_name = f"{self.package}.{stem}"
+                module = sys.modules.get(module_name)
+                module = importlib.reload(module) if module is not None and stem in self._mtimes else importlib.import_module(module_name)
+                self._module_classes[stem] = _strategy_classes(module)
+                self._mtimes[stem] = files[stem]
+            for stem in removed:
+                self._module_classes.pop(stem, None)
+                self._mtimes.pop(stem, None)
+            # Readers hold the previous mapping; it is replaced, never mutated.
+            self._classes = {
+                name: cls
+                for stem in files
+                for name, cls in self._module_classes.get(stem, {}).items()
+            }
+        if changed or removed:
+            logger.info("策略模块已加载: changed=%s removed=%s strategy_count=%s", changed, removed, len(self._classes))
+        return {"reloaded": changed, "removed": removed, "strategy_count": len(self._classes)}
+
+    def enabled_classes(self, config: dict) -> list[str]:
+        strategies_config: dict = config.get("strategies", {}) or {}
+        return [
+            name for name in self._classes
+            if (strategies_config.get(name) or {}).get("enabled", False)
+        ]
+
+    def load(self, config: dict, strategy_classes: list[str] | None = None) -> list[BaseStrategy]:
+        """Instantiate the enabled strategies, optionally filtered by class name."""
+        enabled = self.enabled_classes(config)
+        requested_classes = _normalize_strategy_classes(strategy_classes)
+        if requested_classes is None:
+            return [self._classes[name]() for name in enabled]
+
+        unavailable = [class_name for class_name in requested_classes if class_name not in enabled]
+        if unavailable:
+            raise ValueError(f"不支持或未启用的选股策略: {', '.join(unavailable)}")
+        return [self._classes[class_name]() for class_name in requested_classes]
+
+
+_default_registry: StrategyRegistry | None = None
+_default_registry_lock = threading.Lock()
+
+
+def default_registry() -> StrategyRegistry:
+    """Process-wide registry of ``backend/strategies``, built on first use."""
+    global _default_registry
+    with _default_registry_lock:
+        if _default_registry is None:
+            _default_registry = StrategyRegistry()
+        return _default_registry
+
+
 def load_strategies_from_config(
     config: dict | None = None,
     config_path: str | Path = _DEFAULT_CONFIG_PATH,
     strategy_classes: list[str] | None = None,
+    registry: StrategyRegistry | None = None,
 ) -> list[BaseStrategy]:
     """Load enabled strategy instances, optionally filtered by class name."""
     if config is None:
         with open(config_path, "r", encoding="utf-8") as f:
             config = yaml.safe_load(f)
+    return (registry or default_registry()).load(config, strategy_classes)
+
 
-    strategies_config: dict = config.get("strategies", {})
-    requested_classes = _normalize_strategy_classes(strategy_classes)
-
-    strategy_files = [
-        f.stem
-        for f in _STRATEGIES_DIR.iterdir()
-        if f.is_file() and f.name != "__init__.py" and f.name.endswith(".py")
-    ]
-
-    enabled: list[BaseStrategy] = []
-    for file_name in strategy_files:
-        module = importlib.import_module(f"backend.strategies.{file_name}")
-        for attr_name in dir(module):
-            attr = getattr(module, attr_name)
-            if (
-                isinstance(attr, type)
-                and issubclass(attr, BaseStrategy)
-                and attr is not BaseStrategy
-            ):
-                if strategies_config.get(attr.__name__, {}).get("enabled", False):
-                    enabled.append(attr())
-
-    if requested_classes is None:
-        return enabled
-
-    enabled_by_class = {strategy.__class__.__name__: strategy for strategy in enabled}
-    unavailable = [class_name for class_name in requested_classes if class_name not in enabled_by_class]
-    if unavailable:
-        raise ValueError(f"不支持或未启用的选股策略: {', '.join(unavailable)}")
-
-    return [enabled_by_class[class_name] for class_name in requested_classes]
+def _strategy_classes(module) -> dict[str, type[BaseStrategy]]:
+    classes = {}
+    for attr_name in dir(module):
+        attr = getattr(module, attr_name)
+        if isinstance(attr, type) and issubclass(attr, BaseStrategy) and attr is not BaseStrategy:
+            classes[attr.__name__] = attr
+    return classes
 
 
 def _normalize_strategy_classes(strategy_classes: list[str] | None) -> list[str] | None:
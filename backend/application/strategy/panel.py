@@ -0,0 +1,249 @@
+"""Cross-sectional scan engine evaluating strategies on a date × code panel."""
+
+import logging
+import time
+
+import numpy as np
+import pandas as pd
+
+from backend.application.interfaces import StrategyExecutionRunner
+from backend.application.progress import JobProgressRegistry, ProgressTracker, track
+from backend.application.strategy.execution import (
+    _target_days,
+    _to_opt_float,
+    _to_opt_int,
+    attach_indicators,
+    scan_stock_data,
+)
+from backend.application.strategy.profiling import StrategyProfiler
+from backend.application.strategy.results import DEFAULT_FLUSH_ROWS, ScanResultSink
+from backend.domain.indicators import required_indicator_columns
+from backend.domain.ports import MarketPanelStore, StockRepository
+from backend.domain.strategy import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+SCAN_ENGINES = ("executor", "panel")
+PANEL_FIELDS = ["open", "close", "high", "low", "volume", "amount"]
+# Histories built at a time for strategies without check_panel.
+FALLBACK_BATCH_SIZE = 500
+
+
+class PanelScanEngine(StrategyExecutionRunner):
+    """Evaluate strategies for the whole market at once.
+
+    The window is loaded as one date × code panel.  Strategies implementing
+    ``check_panel`` run once over wide frames, so rolling windows and gap
+    checks are computed for every code in a single pass.  The remaining
+    strategies run per stock through ``scan_stock_data`` on histories cut from
+    the same panel, so results match :class:`StrategyExecutor`.
+    """
+
+    def __init__(
+        self,
+        repository: StockRepository,
+        strategies: list[BaseStrategy],
+        panel_store: MarketPanelStore | None = None,
+        result_flush_rows: int = DEFAULT_FLUSH_ROWS,
+        progress: JobProgressRegistry | None = None,
+        profiler: StrategyProfiler | None = None,
+    ):
+        self.repository = repository
+        self.strategies = strategies
+        self.panel_store = panel_store
+        self.result_flush_rows = result_flush_rows
+        self.progress = progress
+        self.profiler = profiler
+
+    def run(
+        self,
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        job_id: str | None = None,
+        stock_codes: list[str] | None = None,
+    ) -> list[dict]:
+        sink = ScanResultSink(self.repository, job_id, self.result_flush_rows, keep=True)
+        self._run(sink, start_date, end_date, target_dates, stock_codes)
+        return sink.results
+
+    def stream(
+        self,
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        job_id: str | None = None,
+        stock_codes: list[str] | None = None,
+    ) -> int:
+        """Scan like :meth:`run` but keep no hits in memory; returns the hit count."""
+        sink = ScanResultSink(self.repository, job_id, self.result_flush_rows)
+        self._run(sink, start_date, end_date, target_dates, stock_codes)
+        return sink.count
+
+    def _run(
+        self,
+        sink: ScanResultSink,
+        start_date: str,
+        end_date: str,
+        target_dates: list[str],
+        stock_codes: list[str] | None = None,
+    ) -> None:
+        names = {stock.code: stock.name for stock in self.repository.list_stocks()}
+        if stock_codes is not None:
+            wanted = set(stock_codes)
+            names = {code: name for code, name in names.items() if code in wanted}
+        logger.info("获取到 %s 只股票", len(names))
+
+        tracker = track(self.progress, sink.job_id)
+        tracker.start("load", 1)
+        panel = self._load_panel(start_date, end_date)
+        tracker.advance()
+        if panel is not None and names:
+            present = panel["present"]
+            codes = [code for code in present.columns if code in names]
+            panel = {field: frame[codes] for field, frame in panel.items()}
+            # The whole market is evaluated at once, so progress is per strategy.
+            tracker.start("scan", len(self.strategies))
+            if codes and len(present.index):
+                self._scan(panel, names, target_dates, sink, tracker)
+
+        sink.flush()
+        logger.info("面板扫描完成，共找到 %s 条符合条件的记录", sink.count)
+
+    def _load_panel(self, start_date: str, end_date: str) -> dict[str, pd.DataFrame] | None:
+        if self.panel_store is not None:
+            panel = self.panel_store.get_panel(start_date, end_date)
+            if panel is not None:
+                return panel
+        loader = getattr(self.repository, "get_daily_panel", None)
+        if loader is None:
+            raise ValueError("当前仓储不支持面板扫描")
+        return loader(start_date, end_date)
+
+    def _scan(
+        self,
+        panel: dict[str, pd.DataFrame],
+        names: dict[str, str],
+        target_dates: list[str],
+        sink: ScanResultSink,
+        tracker: ProgressTracker,
+    ) -> None:
+        present = panel["present"].to_numpy(dtype=bool)
+        codes = list(panel["present"].columns)
+
+        # Locate target dates on the panel's date axis.
+        days = panel["present"].index.to_numpy(dtype="datetime64[D]")
+        targets = _target_days(target_dates)
+        positions = np.searchsorted(days, targets)
+        found = positions < len(days)
+        found[found] = days[positions[found]] == targets[found]
+        if not found.any():
+            return
+        target_rows = positions[found]
+        found_dates = [target_date for target_date, is_found in zip(target_dates, found) if is_found]
+
+        aligned, bar_rows = _align_bars(panel, present)
+        vectorized, fallback = [], []
+        for strategy in self.strategies:
+            started = time.perf_counter()
+            flags = self._panel_flags(strategy, aligned)
+            if flags is None:
+                fallback.append(strategy)
+            else:
+                vectorized.append((strategy, flags, time.perf_counter() - started))
+                tracker.advance()
+
+        close, volume = panel["close"].to_numpy(), panel["volume"].to_numpy()
+        hit_counts = [0] * len(vectorized)
+        for target_date, row in zip(found_dates, target_rows):
+            columns = np.flatnonzero(present[row])
+            bars = bar_rows[row, columns]
+            for index, (strategy, flags, _) in enumerate(vectorized):
+                hits = [
+                    {
+                        "code": codes[column],
+                        "name": names[codes[column]],
+                        "strategy": strategy.name,
+                        "target_date": target_date,
+                        "current_price": _to_opt_float(close[row, column]),
+                        "current_volume": _to_opt_int(volume[row, column]),
+                    }
+                    for column in columns[flags[bars, columns]]
+                ]
+                hit_counts[index] += len(hits)
+                sink.add(hits)
+        if self.profiler is not None:
+            # One check_panel call covers the whole market and every target.
+            for (strategy, _, seconds), hits in zip(vectorized, hit_counts):
+                self.profiler.record(strategy.__class__.__name__, seconds, hits)
+
+        if fallback:
+            self._scan_per_stock(panel, present, names, target_rows, found_dates, fallback, sink)
+            tracker.advance(len(fallback))
+
+    @staticmethod
+    def _panel_flags(strategy: BaseStrategy, aligned: dict[str, pd.DataFrame]) -> np.ndarray | None:
+        check_panel = getattr(strategy, "check_panel", None)
+        if check_panel is None:
+            return None
+        try:
+            flags = check_panel(aligned)
+        except Exception as exc:
+            logger.error("策略 %s 面板执行出错，回退为逐股判断: %s", strategy.__class__.__name__, exc)
+            return None
+        if flags is None:
+            return None
+        return np.asarray(flags, dtype=bool)
+
+    def _scan_per_stock(self, panel, present, names, target_rows, found_dates, strategies, sink) -> None:
+        dates = panel["present"].index
+        values = {field: panel[field].to_numpy() for field in PANEL_FIELDS}
+        indicator_columns = required_indicator_columns(strategies)
+        columns = np.flatnonzero(present[target_rows].any(axis=0))
+        for offset in range(0, len(columns), FALLBACK_BATCH_SIZE):
+            histories = {}
+            for column in columns[offset:offset + FALLBACK_BATCH_SIZE]:
+                code = panel["present"].columns[column]
+                rows = present[:, column]
+                histories[code] = pd.DataFrame({
+                    "stock_code": code,
+                    "date": dates[rows],
+                    **{field: values[field][rows, column] for field in PANEL_FIELDS},
+                })
+            # Join the same stored indicators as the executor does, so e.g. MACD
+            # reads the full-history diff rather than one recomputed on the window.
+            histories = attach_indicators(
+                self.repository, histories, indicator_columns, dates[0].strftime("%Y%m%d"), dates[-1].strftime("%Y%m%d"),
+            )
+            for code, history in histories.items():
+                try:
+                    sink.add(scan_stock_data(code, names[code], history, found_dates, strategies, profiler=self.profiler))
+                except Exception as exc:
+                    logger.exception("处理 %s(%s) 出错: %s", names[code], code, exc)
+
+
+def _align_bars(panel: dict[str, pd.DataFrame], present: np.ndarray) -> tuple[dict[str, pd.DataFrame], np.ndarray]:
+    """Shift every code's bars to the bottom of its column, closing suspension gaps.
+
+    Row ``i`` of a column then holds the code's bars in order, exactly as a
+    per-stock history would, so ``shift`` and ``rolling`` over the wide frames
+    match ``check_series`` on each stock.  Returns the aligned frames and, for
+    each present panel cell, the aligned row holding that bar.
+    """
+    n_rows = present.shape[0]
+    ordinal = present.cumsum(axis=0) - 1
+    offset = n_rows - present.sum(axis=0)
+    source_rows, source_columns = np.nonzero(present)
+    target_rows = offset[source_columns] + ordinal[source_rows, source_columns]
+
+    bar_rows = np.full(present.shape, -1, dtype=np.int64)
+    bar_rows[source_rows, source_columns] = target_rows
+
+    columns = panel["present"].columns
+    aligned = {}
+    for field in [*PANEL_FIELDS, "position"]:
+        source = ordinal if field == "position" else panel[field].to_numpy(dtype="float64")
+        matrix = np.full(present.shape, np.nan)
+        matrix[target_rows, source_columns] = source[source_rows, source_columns]
+        aligned[field] = pd.DataFrame(matrix, columns=columns)
+    return aligned, bar_rows
@@ -0,0 +1,99 @@
+"""Scan planning from strategy-declared history requirements."""
+
+import logging
+from datetime import datetime, timedelta
+
+from backend.application.interfaces import TradeCalendarProvider
+from backend.domain.strategy import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+
+class ScanPlanner:
+    """Derive the history requirements of a scan from its strategies.
+
+    ``lookback`` is the largest requirement of the selected strategies, so every
+    strategy sees as much history as it reads; ``resolve_scan_dates`` turns it
+    into the load window ending at the latest target.  A stock is skipped only
+    when it has fewer bars than the smallest ``min_history``, since no strategy
+    could hit on it.  When every strategy declares ``prefilter_sql``, only
+    stocks passing one of them on a target date are loaded at all.
+    """
+
+    def __init__(self, strategies: list[BaseStrategy]):
+        self.strategies = strategies
+
+    @property
+    def lookback(self) -> int:
+        return max((int(getattr(strategy, "lookback", 1)) for strategy in self.strategies), default=1)
+
+    @property
+    def min_history(self) -> int:
+        return min((int(getattr(strategy, "min_history", 1)) for strategy in self.strategies), default=1)
+
+    @property
+    def prefilters(self) -> list[str] | None:
+        """The strategies' SQL prefilters, or None when one of them has none."""
+        conditions = [getattr(strategy, "prefilter_sql", None) for strategy in self.strategies]
+        if not conditions or not all(conditions):
+            return None
+        return list(dict.fromkeys(conditions))
+
+    @property
+    def prefilter_lookback(self) -> int:
+        return max((int(getattr(strategy, "prefilter_lookback", 2)) for strategy in self.strategies), default=2)
+
+    def candidate_codes(self, repository, codes: list[str], target_dates: list[str]) -> list[str]:
+        """Keep the codes that pass any strategy's prefilter on any target date.
+
+        One query evaluates the union of the prefilters over the daily table.
+        Repositories without ``get_prefilter_candidates`` keep every code.
+        """
+        finder = getattr(repository, "get_prefilter_candidates", None)
+        conditions = self.prefilters
+        if finder is None or conditions is None or not codes or not target_dates:
+            return codes
+        # Calendar-day estimate errs long; a longer window only widens the prefilter.
+        start_date = lookback_start(None, min(target_dates), self.prefilter_lookback + 1)
+        candidates = finder(conditions, target_dates, start_date)
+        kept = [code for code in codes if code in candidates]
+        logger.info("SQL 预筛保留 %s/%s 只股票", len(kept), len(codes))
+        return kept
+
+    def eligible_codes(self, repository, codes: list[str], start_date: str, end_date: str) -> list[str]:
+        """Drop codes whose local bars in the window cannot satisfy any strategy.
+
+        Uses the repository's coverage counts, so nothing is read from the
+        daily table.  Repositories without ``get_bar_counts`` keep every code.
+        """
+        counter = getattr(repository, "get_bar_counts", None)
+        if counter is None or self.min_history <= 1 or not codes:
+            return codes
+        counts = counter(codes, start_date, end_date)
+        eligible = [code for code in codes if counts.get(code, 0) >= self.min_history]
+        if len(eligible) < len(codes):
+            logger.info("跳过 %s 只历史不足 %s 个交易日的股票", len(codes) - len(eligible), self.min_history)
+        return eligible
+
+
+def lookback_start(calendar_provider: TradeCalendarProvider | None, target_date: str, lookback: int) -> str:
+    """Return the trading day ``lookback - 1`` sessions before ``target_date``.
+
+    Without a usable calendar the span is estimated from calendar days, with
+    headroom for holidays, so the window errs on the long side.
+    """
+    if lookback <= 1:
+        return target_date
+    target = datetime.strptime(target_date, "%Y%m%d")
+    # 交易日约占自然日的 5/7，另为长假留出余量
+    span = lookback * 7 // 5 + 20
+    for _ in range(3):
+        start = (target - timedelta(days=span)).strftime("%Y%m%d")
+        trade_dates = calendar_provider.trade_dates(start, target_date) if calendar_provider is not None else None
+        if trade_dates is None:
+            return start
+        trade_dates = [day for day in trade_dates if day <= target_date]
+        if len(trade_dates) >= lookback:
+            return trade_dates[-lookback]
+        span *= 2
+    return start
@@ -0,0 +1,155 @@
+"""Process-pool scan workers fed through shared memory.
+
+Strategy evaluation is pandas/Python heavy and holds the GIL, so threads do
+not scale with cores.  In process mode the parent keeps loading history
+chunks and packs each one into a single ``SharedMemory`` block: an int64 date
+column followed by one float64 column per field.  Workers attach to the block
+by name, so only the shard descriptor (codes and row offsets) is pickled.
+Strategies are sent once per worker through the pool initializer.
+"""
+
+import logging
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+import pandas as pd
+
+from backend.application.strategy.profiling import StrategyProfiler, StrategyStats
+from backend.domain.strategy import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+_KEY_COLUMNS = ("stock_code", "date")
+_worker_strategies: list[BaseStrategy] = []
+
+
+@dataclass(frozen=True)
+class SharedShard:
+    """Descriptor of one packed chunk; rows of ``codes[i]`` are ``offsets[i]:offsets[i + 1]``."""
+
+    memory_name: str
+    codes: tuple[str, ...]
+    names: tuple[str, ...]
+    offsets: tuple[int, ...]
+    columns: tuple[str, ...]
+
+
+def create_process_pool(strategies: list[BaseStrategy], max_workers: int | None) -> ProcessPoolExecutor:
+    # spawn avoids forking a parent that holds DuckDB connections and threads.
+    return ProcessPoolExecutor(
+        max_workers=max_workers or None,
+        mp_context=multiprocessing.get_context("spawn"),
+        initializer=_init_worker,
+        initargs=(strategies,),
+    )
+
+
+def pack_shard(
+    chunk: list[tuple[str, str]],
+    histories: dict[str, pd.DataFrame],
+) -> tuple[SharedShard, SharedMemory] | None:
+    """Copy the histories of ``chunk`` into one shared memory block.
+
+    Returns the descriptor for workers and the block, which the caller passes
+    to :func:`release_shard` once the shard has been scanned.
+    """
+    frames = [(code, name, histories[code]) for code, name in chunk if _has_rows(histories.get(code))]
+    if not frames:
+        return None
+
+    columns = list(dict.fromkeys(
+        column for _, _, frame in frames for column in frame.columns if column not in _KEY_COLUMNS
+    ))
+    offsets = np.cumsum([0] + [len(frame) for _, _, frame in frames])
+    rows = int(offsets[-1])
+
+    memory = SharedMemory(create=True, size=max(1, rows * (len(columns) + 1) * 8))
+    try:
+        _fill(memory, frames, columns, offsets)
+    except Exception:
+        release_shard(memory)
+        raise
+
+    shard = SharedShard(
+        memory_name=memory.name,
+        codes=tuple(code for code, _, _ in frames),
+        names=tuple(name for _, name, _ in frames),
+        offsets=tuple(int(offset) for offset in offsets),
+        columns=tuple(columns),
+    )
+    return shard, memory
+
+
+def scan_shard(shard: SharedShard, target_dates: list[str]) -> list[dict]:
+    """Worker entry point: rebuild each history from shared memory and scan it."""
+    return _scan_shard(shard, target_dates)
+
+
+def scan_shard_profiled(shard: SharedShard, target_dates: list[str]) -> tuple[list[dict], dict[str, StrategyStats]]:
+    """Like :func:`scan_shard`, also returning the strategy timings for the parent to merge."""
+    profiler = StrategyProfiler()
+    return _scan_shard(shard, target_dates, profiler), profiler.state()
+
+
+def _scan_shard(shard: SharedShard, target_dates: list[str], profiler: StrategyProfiler | None = None) -> list[dict]:
+    from backend.application.strategy.execution import scan_stock_data
+
+    # Spawned workers share the parent's resource tracker, so attaching here
+    # does not hand ownership of the block to this process.
+    memory = SharedMemory(name=shard.memory_name)
+    try:
+        histories = _unpack(shard, memory)
+    finally:
+        memory.close()
+
+    results = []
+    for code, name, history in histories:
+        try:
+            results.extend(scan_stock_data(code, name, history, target_dates, _worker_strategies, profiler=profiler))
+        except Exception as exc:
+            logger.exception("处理 %s(%s) 出错: %s", name, code, exc)
+    return results
+
+
+def release_shard(memory: SharedMemory) -> None:
+    memory.close()
+    memory.unlink()
+
+
+def _init_worker(strategies: list[BaseStrategy]) -> None:
+    global _worker_strategies
+    _worker_strategies = list(strategies)
+
+
+def _fill(memory: SharedMemory, frames, columns: list[str], offsets: np.ndarray) -> None:
+    matrix = np.ndarray((len(columns) + 1, int(offsets[-1])), dtype=np.float64, buffer=memory.buf)
+    dates = matrix[0].view(np.int64)
+    for (_, _, frame), start, end in zip(frames, offsets[:-1], offsets[1:]):
+        dates[start:end] = pd.to_datetime(frame["date"]).to_numpy(dtype="datetime64[ns]").view(np.int64)
+        for position, column in enumerate(columns, 1):
+            if column in frame.columns:
+                values = pd.to_numeric(frame[column], errors="coerce")
+                matrix[position, start:end] = values.to_numpy(dtype="float64", na_value=np.nan)
+            else:
+                matrix[position, start:end] = np.nan
+
+
+def _unpack(shard: SharedShard, memory: SharedMemory) -> list[tuple[str, str, pd.DataFrame]]:
+    matrix = np.ndarray((len(shard.columns) + 1, shard.offsets[-1]), dtype=np.float64, buffer=memory.buf)
+    histories = []
+    for index, (code, name) in enumerate(zip(shard.codes, shard.names)):
+        start, end = shard.offsets[index], shard.offsets[index + 1]
+        # Copy out of the block so it can be closed before scanning.
+        histories.append((code, name, pd.DataFrame({
+            "stock_code": code,
+            "date": matrix[0, start:end].view(np.int64).astype("datetime64[ns]"),
+            **{column: matrix[position, start:end].copy() for position, column in enumerate(shard.columns, 1)},
+        })))
+    return histories
+
+
+def _has_rows(frame: pd.DataFrame | None) -> bool:
+    return frame is not None and not frame.empty
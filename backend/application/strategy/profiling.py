@@ -0,0 +1,92 @@
+"""Per-strategy cost and selectivity of a scan."""
+
+import random
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+
+# Latencies kept per strategy for the percentiles; a full-market scan makes
+# far more calls than this, so a uniform reservoir sample stands in for them.
+LATENCY_SAMPLES = 2048
+
+
+@dataclass
+class StrategyStats:
+    calls: int = 0
+    hits: int = 0
+    errors: int = 0
+    wall_seconds: float = 0.0
+    samples: list[float] = field(default_factory=list)
+
+
+class StrategyProfiler:
+    """Accumulate evaluation time, calls, hits and exceptions per strategy.
+
+    A call is one ``check_series`` over a stock's history, one ``check`` for
+    a target day, or one ``check_panel`` over the market.  ``wall_seconds``
+    sums the time spent inside the calls, across all workers.  Safe to share
+    between threads; process workers profile locally and the parent merges
+    their :meth:`state`.
+    """
+
+    def __init__(self, max_samples: int = LATENCY_SAMPLES, seed: int = 0):
+        self.max_samples = max_samples
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._stats: dict[str, StrategyStats] = {}
+
+    def record(self, strategy: str, seconds: float, hits: int = 0, error: bool = False) -> None:
+        with self._lock:
+            stats = self._stats.setdefault(strategy, StrategyStats())
+            stats.calls += 1
+            stats.hits += hits
+            stats.errors += int(error)
+            stats.wall_seconds += seconds
+            self._sample(stats, seconds, stats.calls)
+
+    def merge(self, state: dict[str, StrategyStats]) -> None:
+        with self._lock:
+            for strategy, other in state.items():
+                stats = self._stats.setdefault(strategy, StrategyStats())
+                seen = stats.calls
+                stats.calls += other.calls
+                stats.hits += other.hits
+                stats.errors += other.errors
+                stats.wall_seconds += other.wall_seconds
+                # Samples of the other side stand for other.calls calls each.
+                weight = other.calls / max(1, len(other.samples))
+                for index, seconds in enumerate(other.samples):
+                    self._sample(stats, seconds, seen + int((index + 1) * weight))
+
+    def state(self) -> dict[str, StrategyStats]:
+        with self._lock:
+            return {
+                strategy: StrategyStats(stats.calls, stats.hits, stats.errors, stats.wall_seconds, list(stats.samples))
+                for strategy, stats in self._stats.items()
+            }
+
+    def summary(self) -> list[dict]:
+        """One entry per strategy, most expensive first."""
+        entries = []
+        for strategy, stats in self.state().items():
+            samples = np.asarray(stats.samples, dtype=float)
+            p50, p99 = np.percentile(samples, [50, 99]) if len(samples) else (0.0, 0.0)
+            entries.append({
+                "strategy": strategy,
+                "calls": stats.calls,
+                "hits": stats.hits,
+                "errors": stats.errors,
+                "wall_seconds": round(stats.wall_seconds, 6),
+                "p50_ms": round(float(p50) * 1000, 3),
+                "p99_ms": round(float(p99) * 1000, 3),
+            })
+        return sorted(entries, key=lambda entry: entry["wall_seconds"], reverse=True)
+
+    def _sample(self, stats: StrategyStats, seconds: float, seen: int) -> None:
+        if len(stats.samples) < self.max_samples:
+            stats.samples.append(seconds)
+            return
+        slot = self._random.randrange(max(seen, self.max_samples))
+        if slot < self.max_samples:
+            stats.samples[slot] = seconds
@@ -0,0 +1,51 @@
+"""Incremental persistence of scan hits."""
+
+import logging
+
+from backend.domain.ports import StockRepository
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_FLUSH_ROWS = 1000
+
+
+class ScanResultSink:
+    """Buffer scan hits and write them to the repository in batches.
+
+    Hits become readable through ``get_strategy_results`` while the scan is
+    still running, and a failure late in a scan keeps every batch already
+    flushed.  With ``keep=False`` the sink holds at most ``flush_rows`` hits,
+    so memory does not grow with the number of stocks, dates or strategies.
+    Only the scanning thread should call :meth:`add`.
+    """
+
+    def __init__(
+        self,
+        repository: StockRepository,
+        job_id: str | None = None,
+        flush_rows: int = DEFAULT_FLUSH_ROWS,
+        keep: bool = False,
+    ):
+        self.repository = repository
+        self.job_id = job_id
+        self.flush_rows = max(1, int(flush_rows or 1))
+        self.count = 0
+        self.results: list[dict] | None = [] if keep else None
+        self._buffer: list[dict] = []
+
+    def add(self, hits: list[dict] | None) -> None:
+        if not hits:
+            return
+        self._buffer.extend(hits)
+        self.count += len(hits)
+        if self.results is not None:
+            self.results.extend(hits)
+        if len(self._buffer) >= self.flush_rows:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._buffer:
+            return
+        batch, self._buffer = self._buffer, []
+        self.repository.upsert_strategy_results(batch, job_id=self.job_id)
+        logger.debug("已写入 %s 条扫描结果，累计 %s 条", len(batch), self.count)
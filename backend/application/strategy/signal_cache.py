@@ -0,0 +1,111 @@
+"""Reuse of earlier strategy evaluations whose inputs have not changed."""
+
+import hashlib
+import inspect
+import logging
+import threading
+from dataclasses import dataclass, field
+
+import numpy as np
+import pandas as pd
+
+from backend.domain.strategy import BaseStrategy
+
+logger = logging.getLogger(__name__)
+
+# Mixes the window length into the fingerprint, so windows of different size
+# over the same rows never collide.
+_LENGTH_MIX = np.uint64(0x9E3779B97F4A7C15)
+
+
+@dataclass
+class StockSignals:
+    """Cached signals of one stock, and the evaluations to write back."""
+
+    known: dict[tuple[str, str], tuple[int, bool]]
+    versions: dict[str, str]
+    fresh: list[tuple[str, str, str, str, int, bool]] = field(default_factory=list)
+    reused: int = 0
+
+
+class SignalCache:
+    """Signal memoization for a scan, backed by a ``SignalCacheRepository``.
+
+    A cached hit or miss of (strategy, code, target_date) is reused when the
+    strategy version and the fingerprint of its input window still match.
+    The window is the strategy's ``lookback`` rows if it declares
+    ``window_bounded``, otherwise every loaded row up to the target, so a
+    scan loading a different range re-evaluates it.
+    """
+
+    def __init__(self, repository, strategies: list[BaseStrategy]):
+        self.repository = repository
+        self.versions = {strategy_key(strategy): strategy_version(strategy) for strategy in strategies}
+        self.reused = 0
+        self._lock = threading.Lock()
+        self._pending: list[tuple[str, str, str, str, int, bool]] = []
+
+    def lookup(self, codes: list[str], target_dates: list[str]) -> dict[str, StockSignals]:
+        """Load the signals of ``codes`` whose strategy version is current."""
+        known: dict[str, dict] = {code: {} for code in codes}
+        if self.versions:
+            rows = self.repository.get_signals(codes, target_dates, list(self.versions))
+            for (strategy, code, target_date), (version, fingerprint, hit) in rows.items():
+                if self.versions.get(strategy) == version and code in known:
+                    known[code][(strategy, target_date)] = (fingerprint, hit)
+        return {code: StockSignals(signals, self.versions) for code, signals in known.items()}
+
+    def record(self, signals: StockSignals) -> None:
+        """Queue the evaluations of a scanned stock; safe to call from workers."""
+        with self._lock:
+            self._pending.extend(signals.fresh)
+            self.reused += signals.reused
+        signals.fresh, signals.reused = [], 0
+
+    def flush(self) -> None:
+        with self._lock:
+            pending, self._pending = self._pending, []
+        if pending:
+            self.repository.save_signals(pending)
+
+
+def strategy_key(strategy: BaseStrategy) -> str:
+    return strategy.__class__.__name__
+
+
+def fingerprint_span(strategy: BaseStrategy) -> int | None:
+    """Rows ending at the target that decide the result; None for all of them."""
+    return strategy.lookback if getattr(strategy, "window_bounded", False) else None
+
+
+def strategy_version(strategy: BaseStrategy) -> str:
+    """Hash the strategy's module source and instance parameters."""
+    digest = hashlib.sha1(strategy_key(strategy).encode())
+    try:
+        digest.update(inspect.getsource(inspect.getmodule(type(strategy))).encode())
+    except (OSError, TypeError):
+        digest.update(type(strategy).__module__.encode())
+    digest.update(repr(sorted((key, repr(value)) for key, value in vars(strategy).items())).encode())
+    return digest.hexdigest()[:16]
+
+
+def row_hash_sums(hist_data: pd.DataFrame) -> np.ndarray:
+    """Prefix sums of per-row hashes, for :func:`window_fingerprints`.
+
+    Row hashes cover every column including the date, so a rewritten,
+    inserted or removed bar in a window changes its fingerprint.
+    """
+    rows = pd.util.hash_pandas_object(hist_data.drop(columns=["stock_code"], errors="ignore"), index=False)
+    return np.concatenate([np.zeros(1, dtype=np.uint64), np.cumsum(rows.to_numpy(dtype=np.uint64), dtype=np.uint64)])
+
+
+def window_fingerprints(sums: np.ndarray, positions: np.ndarray, lookback: int | None) -> np.ndarray:
+    """Fingerprint the ``lookback`` rows ending at each position, as int64.
+
+    With ``lookback=None`` the window starts at the first loaded row.
+    """
+    ends = np.asarray(positions, dtype=np.int64) + 1
+    starts = np.zeros_like(ends) if lookback is None else np.maximum(ends - max(1, int(lookback)), 0)
+    with np.errstate(over="ignore"):
+        fingerprints = (sums[ends] - sums[starts]) ^ ((ends - starts).astype(np.uint64) * _LENGTH_MIX)
+    return fingerprints.view(np.int64)
@@ -0,0 +1,66 @@
+"""Missing-range planning for incremental daily sync."""
+
+from datetime import datetime, timedelta
+
+from backend.domain.models import DailyCoverage
+
+# More holes than this are fetched as one span; a few extra bars are cheaper
+# than many small requests.
+MAX_FETCH_RANGES = 3
+# Trailing trading days fetched on every sync, so a bar written intraday is
+# replaced by the closing bar.
+DEFAULT_REFETCH_DAYS = 2
+
+
+def missing_ranges(
+    coverage: DailyCoverage | None,
+    start_date: str,
+    end_date: str,
+    trade_dates: list[str] | None = None,
+    refetch_days: int = DEFAULT_REFETCH_DAYS,
+) -> list[tuple[str, str]]:
+    """Return the ``(start, end)`` sub-ranges of ``[start_date, end_date]`` to fetch.
+
+    With a trade calendar, the missing trading days plus the last
+    ``refetch_days`` trading days of the range are grouped into consecutive
+    ranges.  Without one, the part from the local watermark on is fetched,
+    including the watermark itself when ``refetch_days`` is positive.
+    """
+    if trade_dates is not None:
+        calendar = [day for day in trade_dates if start_date <= day <= end_date]
+        missing = set(coverage.missing_dates if coverage is not None else calendar)
+        if refetch_days > 0:
+            missing.update(calendar[-refetch_days:])
+        if not missing:
+            return []
+        position = {day: index for index, day in enumerate(trade_dates)}
+        ranges: list[tuple[str, str]] = []
+        for day in sorted(missing):
+            if ranges and position[day] == position[ranges[-1][1]] + 1:
+                ranges[-1] = (ranges[-1][0], day)
+            else:
+                ranges.append((day, day))
+        if len(ranges) > MAX_FETCH_RANGES:
+            return [(ranges[0][0], ranges[-1][1])]
+        return ranges
+
+    last_date = coverage.last_date if coverage is not None else None
+    if last_date is None:
+        return [(start_date, end_date)]
+    if refetch_days > 0:
+        return [(last_date, end_date)]
+    if last_date >= end_date:
+        return []
+    next_day = datetime.strptime(last_date, "%Y%m%d") + timedelta(days=1)
+    return [(next_day.strftime("%Y%m%d"), end_date)]
+
+
+def refetched_dates(
+    start_date: str,
+    end_date: str,
+    trade_dates: list[str],
+    refetch_days: int = DEFAULT_REFETCH_DAYS,
+) -> set[str]:
+    """Trading days of the range that every sync fetches again."""
+    calendar = [day for day in trade_dates if start_date <= day <= end_date]
+    return set(calendar[-refetch_days:]) if refetch_days > 0 else set()
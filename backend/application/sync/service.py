@@ -9,18 +9,27 @@ from typing import Callable
 import akshare as ak
 import pandas as pd
 
-from backend.application.interfaces import DATA_SYNC_SCOPES, DataSyncRunner
+from backend.application.interfaces import DATA_SYNC_SCOPES, DataSyncRunner, TradeCalendarProvider
+from backend.application.progress import JobProgressRegistry, track
 from backend.application.strategy.calendar import validate_date
 from backend.application.strategy.execution import TradeDataService
+from backend.application.sync.incremental import DEFAULT_REFETCH_DAYS, missing_ranges, refetched_dates
+from backend.application.sync.writer import DailyBarWriter
 from backend.domain.market import get_market_code
 from backend.domain.models import Stock, SyncResult
-from backend.domain.ports import JobRepository, MarketDataSource, StockRepository
+from backend.domain.ports import JobRepository, MarketDataSource, MarketPanelStore, StockRepository
 
 logger = logging.getLogger(__name__)
 
+NewBarsCallback = Callable[[str, dict[str, list[str]]], None]
+
 
 class DataSyncService(DataSyncRunner):
-    """Synchronize A-share symbols and daily bars into local DuckDB."""
+    """Synchronize A-share symbols and daily bars into local DuckDB.
+
+    After a daily sync that added trade dates, ``on_new_bars`` is called with
+    the job id and the new YYYYMMDD dates per code.
+    """
 
     VALID_SCOPES = DATA_SYNC_SCOPES
 
@@ -32,6 +41,15 @@ class DataSyncService(DataSyncRunner):
         stock_fetcher: Callable[[], object] | None = None,
         stock_fetch_timeout: float | None = 10.0,
         daily_fetch_workers: int = 8,
+        panel_store: MarketPanelStore | None = None,
+        write_batch_rows: int = 50_000,
+        write_flush_interval: float = 2.0,
+        write_queue_size: int = 64,
+        incremental: bool = False,
+        refetch_days: int = DEFAULT_REFETCH_DAYS,
+        calendar_provider: TradeCalendarProvider | None = None,
+        progress: JobProgressRegistry | None = None,
+        on_new_bars: NewBarsCallback | None = None,
     ):
         self.stock_repository = stock_repository
         self.job_repository = job_repository
@@ -39,6 +57,15 @@ class DataSyncService(DataSyncRunner):
         self.stock_fetcher = stock_fetcher or ak.stock_info_a_code_name
         self.stock_fetch_timeout = stock_fetch_timeout
         self.daily_fetch_workers = max(1, int(daily_fetch_workers or 1))
+        self.panel_store = panel_store
+        self.write_batch_rows = write_batch_rows
+        self.write_flush_interval = write_flush_interval
+        self.write_queue_size = write_queue_size
+        self.incremental = incremental
+        self.refetch_days = max(0, int(refetch_days or 0))
+        self.calendar_provider = calendar_provider
+        self.progress = progress
+        self.on_new_bars = on_new_bars
 
     def run(
         self,
@@ -60,6 +87,7 @@ class DataSyncService(DataSyncRunner):
             len(stock_codes) if stock_codes else "all",
         )
         results: list[SyncResult] = []
+        added_dates: dict[str, list[str]] = {}
         if scope in {"stocks", "all"}:
             results.append(self._sync_stocks(job_id))
 
@@ -68,9 +96,13 @@ class DataSyncService(DataSyncRunner):
                 raise ValueError("同步日线数据时 start 和 end 必须同时提供")
             validate_date(start_date)
             validate_date(end_date)
-            results.extend(self._sync_daily(job_id, start_date, end_date, stock_codes))
+            daily_results, added_dates = self._sync_daily(job_id, start_date, end_date, stock_codes)
+            results.extend(daily_results)
 
         self.job_repository.save_sync_results(results)
+        if scope in {"daily", "all"}:
+            self._refresh_panel(job_id, start_date, end_date, results)
+            self._notify_new_bars(job_id, added_dates)
         failed_count = sum(1 for item in results if item.status == "failed")
         logger.info(
             "数据同步完成: job_id=%s scope=%s total_items=%s failed_count=%s",
@@ -85,10 +117,33 @@ class DataSyncService(DataSyncRunner):
             "failed_count": failed_count,
         }
 
+    def _refresh_panel(self, job_id: str, start_date: str, end_date: str, results: list[SyncResult]) -> None:
+        if self.panel_store is None:
+            return
+        if not any(item.scope == "daily" and item.status == "completed" for item in results):
+            return
+        try:
+            self.panel_store.refresh(start_date, end_date)
+        except Exception:
+            # The panel is derived data; scans fall back to DuckDB until the next refresh.
+            logger.exception("行情面板刷新失败: job_id=%s", job_id)
+
+    def _notify_new_bars(self, job_id: str, added_dates: dict[str, list[str]]) -> None:
+        if self.on_new_bars is None or not added_dates:
+            return
+        try:
+            self.on_new_bars(job_id, added_dates)
+        except Exception:
+            # Follow-up work must not fail a sync whose bars are already written.
+            logger.exception("同步新增日线回调失败: job_id=%s", job_id)
+
     def _sync_stocks(self, job_id: str) -> SyncResult:
+        tracker = track(self.progress, job_id)
+        tracker.start("stocks", 1)
         stocks_df = self._fetch_stock_list()
         stocks_df = stocks_df[["code", "name"]]
         self.stock_repository.upsert_stocks(stocks_df)
+        tracker.advance()
         logger.info("股票列表同步完成: job_id=%s rows_written=%s", job_id, len(stocks_df))
         return SyncResult(
             job_id=job_id,
@@ -105,7 +160,8 @@ class DataSyncService(DataSyncRunner):
         start_date: str,
         end_date: str,
         stock_codes: list[str] | None,
-    ) -> list[SyncResult]:
+    ) -> tuple[list[SyncResult], dict[str, list[str]]]:
+        """Return the sync results and the newly added trade dates per code."""
         stocks = self._resolve_stocks(stock_codes)
         logger.info(
             "日线同步开始: job_id=%s start_date=%s end_date=%s stock_count=%s workers=%s",
@@ -116,48 +172,173 @@ class DataSyncService(DataSyncRunner):
             self.daily_fetch_workers,
         )
         results: list[SyncResult] = []
-        with ThreadPoolExecutor(max_workers=self.daily_fetch_workers, thread_name_prefix="daily-fetch") as executor:
-            futures = {
-                executor.submit(self._fetch_daily_stock, stock, start_date, end_date): stock
-                for stock in stocks
-            }
+        plans, trade_dates = self._plan_daily_ranges(job_id, stocks, start_date, end_date)
+        if plans is not None:
+            current = [stock for stock in stocks if not plans[stock.code]]
+            results.extend(
+                SyncResult(
+                    job_id=job_id,
+                    scope="daily",
+                    code=stock.code,
+                    status="completed",
+                    rows_written=0,
+                    message=f"{stock.name} 日线已是最新",
+                )
+                for stock in current
+            )
+            stocks = [stock for stock in stocks if plans[stock.code]]
+        tracker = track(self.progress, job_id)
+        tracker.start("daily", len(stocks))
+        writer = DailyBarWriter(
+            self.stock_repository,
+            source=getattr(self.data_source, "name", None),
+            batch_rows=self.write_batch_rows,
+            flush_interval=self.write_flush_interval,
+            max_pending=self.write_queue_size,
+        )
+        refetched = refetched_dates(start_date, end_date, trade_dates, self.refetch_days) if trade_dates else set()
+        empty_dates: dict[str, list[str]] = {}
+        with writer, ThreadPoolExecutor(max_workers=self.daily_fetch_workers, thread_name_prefix="daily-fetch") as executor:
+            futures = {}
+            for stock in stocks:
+                ranges = plans[stock.code] if plans is not None else [(start_date, end_date)]
+                expected = [
+                    day for day in trade_dates or []
+                    if day not in refetched and any(start <= day <= end for start, end in ranges)
+                ]
+                futures[executor.submit(self._fetch_daily_stock_into, writer, stock, ranges, expected)] = stock
             for future in as_completed(futures):
                 stock = futures[future]
+                tracker.advance()
                 try:
-                    data = future.result()
-                    self.stock_repository.upsert_daily_data(
-                        data,
-                        source=getattr(self.data_source, "name", None),
-                    )
-                    logger.info(
-                        "日线同步完成: job_id=%s code=%s rows_written=%s",
-                        job_id,
-                        stock.code,
-                        len(data),
-                    )
-                    results.append(
-                        SyncResult(
-                            job_id=job_id,
-                            scope="daily",
-                            code=stock.code,
-                            status="completed",
-                            rows_written=len(data),
-                            message=f"{stock.name} 日线同步完成",
-                        )
-                    )
+                    absent = future.result()
                 except Exception as exc:
                     logger.exception("同步 %s 日线数据失败", stock.code)
-                    results.append(
-                        SyncResult(
-                            job_id=job_id,
-                            scope="daily",
-                            code=stock.code,
-                            status="failed",
-                            rows_written=0,
-                            message=str(exc),
-                        )
-                    )
-        return results
+                    results.append(self._daily_result(job_id, stock, 0, exc))
+                    continue
+                if absent:
+                    empty_dates[stock.code] = absent
+        if plans is None:
+            self._clear_empty_dates(job_id, [stock.code for stock in stocks], start_date, end_date)
+        self._record_empty_dates(job_id, empty_dates)
+
+        for outcome in writer.outcomes:
+            if outcome.error is None:
+                logger.info(
+                    "日线同步完成: job_id=%s code=%s rows_written=%s",
+                    job_id,
+                    outcome.stock.code,
+                    outcome.rows_written,
+                )
+            results.append(self._daily_result(job_id, outcome.stock, outcome.rows_written, outcome.error))
+        logger.info(
+            "日线写入完成: job_id=%s stock_count=%s batches=%s",
+            job_id,
+            len(writer.outcomes),
+            writer.batches,
+        )
+        return results, {code: sorted(days) for code, days in writer.added_dates.items()}
+
+    @staticmethod
+    def _daily_result(job_id: str, stock: Stock, rows_written: int, error: Exception | None) -> SyncResult:
+        if error is not None:
+            return SyncResult(
+                job_id=job_id,
+                scope="daily",
+                code=stock.code,
+                status="failed",
+                rows_written=0,
+                message=str(error),
+            )
+        return SyncResult(
+            job_id=job_id,
+            scope="daily",
+            code=stock.code,
+            status="completed",
+            rows_written=rows_written,
+            message=f"{stock.name} 日线同步完成",
+        )
+
+    def _fetch_daily_stock_into(
+        self,
+        writer: DailyBarWriter,
+        stock: Stock,
+        ranges: list[tuple[str, str]],
+        expected: list[str],
+    ) -> list[str]:
+        """Fetch ``ranges`` into the writer; return the ``expected`` days the source did not return."""
+        frames = [self._fetch_daily_stock(stock, start, end) for start, end in ranges]
+        frames = [frame for frame in frames if not frame.empty] or frames[:1]
+        data = frames[0] if len(frames) == 1 else pd.concat(frames, ignore_index=True)
+        writer.submit(stock, data)
+        if data.empty:
+            # Nothing came back at all, which may be the source rather than a
+            # suspension; the days stay missing and are asked for again.
+            return []
+        returned = set(pd.to_datetime(data["date"]).dt.strftime("%Y%m%d"))
+        return [day for day in expected if day not in returned]
+
+    def _clear_empty_dates(self, job_id: str, codes: list[str], start_date: str, end_date: str) -> None:
+        """Forget the empty days of a fully refetched range, so incremental syncs ask for them again."""
+        clear = getattr(self.stock_repository, "clear_empty_daily_dates", None)
+        if clear is None or not codes:
+            return
+        clear(codes, start_date, end_date)
+        logger.info(
+            "已清除无数据交易日记录: job_id=%s stock_count=%s start_date=%s end_date=%s",
+            job_id,
+            len(codes),
+            start_date,
+            end_date,
+        )
+
+    def _record_empty_dates(self, job_id: str, empty_dates: dict[str, list[str]]) -> None:
+        record = getattr(self.stock_repository, "record_empty_daily_dates", None)
+        if record is None or not empty_dates:
+            return
+        record(empty_dates)
+        logger.info(
+            "数据源未返回的交易日已记录: job_id=%s stock_count=%s dates=%s",
+            job_id,
+            len(empty_dates),
+            sum(len(days) for days in empty_dates.values()),
+        )
+
+    def _plan_daily_ranges(
+        self,
+        job_id: str,
+        stocks: list[Stock],
+        start_date: str,
+        end_date: str,
+    ) -> tuple[dict[str, list[tuple[str, str]]] | None, list[str] | None]:
+        """Map each code to the sub-ranges it is missing, or None for a full refetch.
+
+        Also returns the trade calendar of the range, or None when it is unknown.
+        """
+        get_coverage = getattr(self.stock_repository, "get_daily_coverage", None)
+        if not self.incremental or get_coverage is None or not stocks:
+            return None, None
+
+        trade_dates = None
+        if self.calendar_provider is not None:
+            try:
+                trade_dates = self.calendar_provider.trade_dates(start_date, end_date)
+            except Exception:
+                logger.warning("交易日历获取失败，增量同步按本地最新日期计算: job_id=%s", job_id, exc_info=True)
+        coverage = get_coverage([stock.code for stock in stocks], start_date, end_date, trade_dates)
+        plans = {
+            stock.code: missing_ranges(coverage.get(stock.code), start_date, end_date, trade_dates, self.refetch_days)
+            for stock in stocks
+        }
+        logger.info(
+            "增量日线同步计划: job_id=%s stock_count=%s to_fetch=%s ranges=%s calendar=%s",
+            job_id,
+            len(stocks),
+            sum(1 for ranges in plans.values() if ranges),
+            sum(len(ranges) for ranges in plans.values()),
+            trade_dates is not None,
+        )
+        return plans, trade_dates
 
     def _fetch_daily_stock(self, stock: Stock, start_date: str, end_date: str) -> pd.DataFrame:
         market_code = get_market_code(stock.code)
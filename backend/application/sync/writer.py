@@ -0,0 +1,152 @@
+"""Single-writer batching stage for daily bar sync."""
+
+import logging
+import queue
+import threading
+import time
+from dataclasses import dataclass
+
+import pandas as pd
+
+from backend.application.strategy.execution import refresh_written_indicators
+from backend.domain.models import Stock
+from backend.domain.ports import StockRepository
+
+logger = logging.getLogger(__name__)
+
+_STOP = object()
+
+
+@dataclass
+class WriteOutcome:
+    stock: Stock
+    rows_written: int
+    error: Exception | None = None
+
+
+class DailyBarWriter:
+    """Buffer fetched daily bars and write them to the repository in batches.
+
+    Fetch threads only hand frames to a bounded queue; one writer thread owns
+    every ``upsert_daily_data`` call, so fetchers never wait on the database
+    lock.  A batch is flushed once ``batch_rows`` rows are buffered or
+    ``flush_interval`` seconds have passed since its first frame, and is
+    written in a single transaction; stored indicators of its codes are then
+    refreshed together.  When the queue holds ``max_pending`` frames,
+    :meth:`submit` blocks until the writer catches up.  If the writer thread
+    dies, :meth:`submit` and ``__exit__`` raise instead of waiting on it.
+
+    Use as a context manager; outcomes are complete after ``__exit__``.
+    ``added_dates`` collects the trade dates per code that the repository
+    reports as new, when it tracks them.
+    """
+
+    def __init__(
+        self,
+        repository: StockRepository,
+        source: str | None = None,
+        batch_rows: int = 50_000,
+        flush_interval: float = 2.0,
+        max_pending: int = 64,
+    ):
+        self.repository = repository
+        self.source = source
+        self.batch_rows = max(1, int(batch_rows or 1))
+        self.flush_interval = max(0.0, float(flush_interval or 0.0))
+        self.outcomes: list[WriteOutcome] = []
+        self.added_dates: dict[str, set[str]] = {}
+        self.batches = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=max(1, int(max_pending or 1)))
+        self._thread = threading.Thread(target=self._run, name="daily-writer", daemon=True)
+        self._error: BaseException | None = None
+
+    def __enter__(self) -> "DailyBarWriter":
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc, traceback) -> None:
+        if self._error is None:
+            self._put(_STOP)
+        self._thread.join()
+        if self._error is not None and exc_type is None:
+            raise RuntimeError("日线写入线程异常退出") from self._error
+
+    def submit(self, stock: Stock, data: pd.DataFrame) -> None:
+        """Queue one stock's bars; blocks while the queue is full."""
+        self._put((stock, data))
+
+    def _put(self, item) -> None:
+        while True:
+            if self._error is not None:
+                raise RuntimeError("日线写入线程异常退出") from self._error
+            try:
+                self._queue.put(item, timeout=0.5)
+                return
+            except queue.Full:
+                continue
+
+    def _run(self) -> None:
+        try:
+            self._write_batches()
+        except BaseException as exc:
+            logger.exception("日线写入线程异常退出")
+            self._error = exc
+
+    def _write_batches(self) -> None:
+        pending: list[tuple[Stock, pd.DataFrame]] = []
+        rows = 0
+        deadline = None
+        while True:
+            timeout = None if deadline is None else max(0.0, deadline - time.monotonic())
+            try:
+                item = self._queue.get(timeout=timeout)
+            except queue.Empty:
+                item = None
+            if item is _STOP:
+                self._flush(pending)
+                return
+            if item is not None:
+                pending.append(item)
+                rows += len(item[1])
+                if deadline is None:
+                    deadline = time.monotonic() + self.flush_interval
+                if rows < self.batch_rows and time.monotonic() < deadline:
+                    continue
+            self._flush(pending)
+            pending, rows, deadline = [], 0, None
+
+    def _flush(self, pending: list[tuple[Stock, pd.DataFrame]]) -> None:
+        if not pending:
+            return
+        frames = [data for _, data in pending if data is not None and not data.empty]
+        try:
+            if frames:
+                self._record_added(self.repository.upsert_daily_data(
+                    pd.concat(frames, ignore_index=True) if len(frames) > 1 else frames[0],
+                    source=self.source,
+                ))
+            self.batches += 1
+        except Exception:
+            logger.exception("日线批量写入失败，改为逐只写入: stock_count=%s", len(pending))
+            self._completed([(stock, data) for stock, data in pending if self._write_one(stock, data)])
+            return
+        logger.info("日线批量写入完成: stock_count=%s rows_written=%s", len(pending), sum(len(f) for f in frames))
+        self._completed(pending)
+
+    def _write_one(self, stock: Stock, data: pd.DataFrame) -> bool:
+        # Isolates the frame that broke the batch so the others still land.
+        try:
+            self._record_added(self.repository.upsert_daily_data(data, source=self.source))
+        except Exception as exc:
+            logger.exception("同步 %s 日线数据失败", stock.code)
+            self.outcomes.append(WriteOutcome(stock=stock, rows_written=0, error=exc))
+            return False
+        return True
+
+    def _record_added(self, added: dict[str, list[str]] | None) -> None:
+        for code, days in (added or {}).items():
+            self.added_dates.setdefault(code, set()).update(days)
+
+    def _completed(self, written: list[tuple[Stock, pd.DataFrame]]) -> None:
+        refresh_written_indicators(self.repository, {stock.code: data for stock, data in written})
+        self.outcomes.extend(WriteOutcome(stock=stock, rows_written=len(data)) for stock, data in written)
@@ -29,24 +29,26 @@ class ScanJobHandler(JobHandler):
 
     def run(self, job: Job) -> dict:
         params = job.params
-        if params.get("strategy_classes") is None:
-            results = self.scan_runner(
-                params["start_date"],
-                params["end_date"],
-                params["target_dates"],
-                job_id=job.job_id,
-            )
-        else:
-            results = self.scan_runner(
-                params["start_date"],
-                params["end_date"],
-                params["target_dates"],
-                job_id=job.job_id,
-                strategy_classes=params["strategy_classes"],
-            )
+        # Only forward options the job set, so simple runners keep working.
+        options = {}
+        if params.get("strategy_classes") is not None:
+            options["strategy_classes"] = params["strategy_classes"]
+        if params.get("engine") is not None:
+            options["engine"] = params["engine"]
+        if params.get("stock_codes") is not None:
+            options["stock_codes"] = params["stock_codes"]
+        results = self.scan_runner(
+            params["start_date"],
+            params["end_date"],
+            params["target_dates"],
+            job_id=job.job_id,
+            **options,
+        )
+        # Streaming runners persist hits as they go and only report a count.
+        total = results if isinstance(results, int) else len(results)
         return {
-            "total_items": len(results),
-            "success_count": len(results),
+            "total_items": total,
+            "success_count": total,
             "failed_count": 0,
         }
 
@@ -13,10 +13,15 @@ from backend.application.interfaces import (
     TaskExecutionService,
     TradeCalendarProvider,
 )
+from backend.application.events import JobEventBus
+from backend.application.progress import JobProgressRegistry
 from backend.application.strategy.calendar import ConfigTradeCalendarProvider, resolve_scan_dates, validate_date
+from backend.application.strategy.loader import StrategyRegistry, default_registry
+from backend.application.strategy.panel import SCAN_ENGINES
+from backend.application.strategy.profiling import StrategyProfiler
 from backend.application.tasks.handlers import BacktestJobHandler, JobDispatcher, ScanJobHandler, SyncJobHandler
 from backend.domain.models import Job, JobStatus, JobType
-from backend.domain.ports import JobRepository, StockRepository
+from backend.domain.ports import JobRepository, MarketPanelStore, StockRepository
 
 logger = logging.getLogger(__name__)
 
@@ -35,12 +40,24 @@ class ResearchJobService(TaskExecutionService):
         dispatcher: JobDispatcher | None = None,
         calendar_provider: TradeCalendarProvider | None = None,
         auto_start: bool = True,
+        panel_store: MarketPanelStore | None = None,
+        progress: JobProgressRegistry | None = None,
+        events: JobEventBus | None = None,
+        strategy_registry: StrategyRegistry | None = None,
     ):
         self.stock_repository = stock_repository
         self.job_repository = job_repository
         self.app_config = app_config
         self.sync_service = sync_service
         self.backtest_service = backtest_service
+        self.panel_store = panel_store
+        self.strategy_registry = strategy_registry or default_registry()
+        self.events = events or JobEventBus()
+        self.progress = progress or JobProgressRegistry(
+            persist=getattr(job_repository, "save_progress", None),
+            persist_interval=app_config.get("defaults", {}).get("progress_persist_interval", 2.0),
+            notify=self.events.publish_progress,
+        )
         self.scan_runner = scan_runner or self._default_scan_runner
         self.dispatcher = dispatcher or JobDispatcher({
             JobType.SYNC: SyncJobHandler(sync_service),
@@ -50,6 +67,7 @@ class ResearchJobService(TaskExecutionService):
         self.calendar_provider = calendar_provider or ConfigTradeCalendarProvider(app_config)
         self.auto_start = auto_start
         self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="research-job")
+        self._profilers: dict[str, StrategyProfiler] = {}
 
     def submit_sync(
         self,
@@ -83,26 +101,56 @@ class ResearchJobService(TaskExecutionService):
         end_date: str | None = None,
         target_dates: list[str] | None = None,
         strategy_classes: list[str] | None = None,
+        engine: str | None = None,
+        stock_codes: list[str] | None = None,
     ) -> dict:
+        if engine is not None and engine not in SCAN_ENGINES:
+            raise ValueError(f"不支持的扫描引擎: {engine}，可选: {', '.join(SCAN_ENGINES)}")
+        strategy_classes = self._resolve_strategy_classes(strategy_classes)
         start_date, end_date, target_dates = resolve_scan_dates(
             self.app_config,
             start_date,
             end_date,
             target_dates,
             calendar_provider=self.calendar_provider,
+            lookback=self._scan_lookback(strategy_classes),
         )
-        strategy_classes = self._resolve_strategy_classes(strategy_classes)
-        job = self._create_job(
-            JobType.SCAN,
-            {
-                "start_date": start_date,
-                "end_date": end_date,
-                "target_dates": target_dates,
-                "strategy_classes": strategy_classes,
-            },
-        )
+        params = {
+            "start_date": start_date,
+            "end_date": end_date,
+            "target_dates": target_dates,
+            "strategy_classes": strategy_classes,
+        }
+        if engine is not None:
+            params["engine"] = engine
+        if stock_codes is not None:
+            params["stock_codes"] = stock_codes
+        job = self._create_job(JobType.SCAN, params)
         return self._scan_job_payload(job)
 
+    def scan_new_bars(self, sync_job_id: str, added_dates: dict[str, list[str]]) -> dict | None:
+        """Queue a scan of the trade dates a sync added, for the codes that got them.
+
+        Only the latest ``defaults.scan_after_sync_max_dates`` dates are
+        scanned, so backfilling years of history does not start a full
+        historical scan.
+        """
+        max_dates = self.app_config.get("defaults", {}).get("scan_after_sync_max_dates", 5)
+        target_dates = sorted({day for days in added_dates.values() for day in days})[-max(1, int(max_dates)):]
+        wanted = set(target_dates)
+        stock_codes = sorted(code for code, days in added_dates.items() if wanted.intersection(days))
+        if not stock_codes:
+            return None
+        job = self.submit_scan(target_dates=target_dates, stock_codes=stock_codes)
+        logger.info(
+            "同步新增日线，提交增量扫描: sync_job_id=%s scan_job_id=%s target_dates=%s stock_count=%s",
+            sync_job_id,
+            job["job_id"],
+            target_dates,
+            len(stock_codes),
+        )
+        return job
+
     def submit_backtest(
         self,
         strategy: str,
@@ -145,11 +193,13 @@ class ResearchJobService(TaskExecutionService):
 
         logger.info("任务开始: job_id=%s type=%s params=%s", job.job_id, job.type.value, job.params)
         job.mark_running()
-        self.job_repository.save(job)
+        self._save_and_publish(job)
         try:
             summary = self.dispatcher.run(job)
+            job.progress = self.progress.finish(job.job_id)
+            job.strategy_profile = self._take_profile(job.job_id)
             job.mark_completed(**summary)
-            self.job_repository.save(job)
+            self._save_and_publish(job)
             logger.info(
                 "任务完成: job_id=%s type=%s total_items=%s success_count=%s failed_count=%s",
                 job.job_id,
@@ -160,12 +210,18 @@ class ResearchJobService(TaskExecutionService):
             )
         except Exception as exc:
             logger.exception("任务失败: %s", job_id)
+            job.progress = self.progress.finish(job.job_id)
+            job.strategy_profile = self._take_profile(job.job_id)
             job.mark_failed(error=str(exc))
-            self.job_repository.save(job)
+            self._save_and_publish(job)
 
     def get_unified_job(self, job_id: str) -> dict | None:
         job = self.job_repository.get(job_id)
-        return job.to_dict() if job else None
+        if job is None:
+            return None
+        # Running jobs report from memory; the stored snapshot may be a few seconds old.
+        job.progress = self.progress.snapshot(job_id) or job.progress
+        return job.to_dict()
 
     def recover_unfinished_jobs(self, reason: str = "服务重启，任务执行上下文已丢失") -> int:
         recovered_count = 0
@@ -176,7 +232,7 @@ class ResearchJobService(TaskExecutionService):
             job.status = JobStatus.FAILED
             job.error = reason
             job.finished_at = datetime.now().isoformat()
-            self.job_repository.save(job)
+            self._save_and_publish(job)
             recovered_count += 1
             logger.info(
                 "恢复未完成任务状态: job_id=%s type=%s previous_status=%s",
@@ -220,6 +276,14 @@ class ResearchJobService(TaskExecutionService):
     def shutdown(self) -> None:
         self.executor.shutdown(wait=False, cancel_futures=False)
 
+    def _take_profile(self, job_id: str) -> list[dict] | None:
+        profiler = self._profilers.pop(job_id, None)
+        return profiler.summary() if profiler is not None else None
+
+    def _save_and_publish(self, job: Job) -> None:
+        self.job_repository.save(job)
+        self.events.publish_status(job.to_dict())
+
     def _create_job(self, job_type: JobType, params: dict) -> Job:
         job = Job(job_id=uuid4().hex, type=job_type, status=JobStatus.QUEUED, params=params)
         self.job_repository.save(job)
@@ -235,9 +299,12 @@ class ResearchJobService(TaskExecutionService):
         target_dates: list[str],
         job_id: str | None = None,
         strategy_classes: list[str] | None = None,
-    ) -> list[dict]:
-        from backend.application.strategy.loader import load_strategies_from_config
+        engine: str | None = None,
+        stock_codes: list[str] | None = None,
+    ) -> int:
         from backend.application.strategy.execution import StrategyExecutor, TradeDataService
+        from backend.application.strategy.panel import PanelScanEngine
+        from backend.domain.indicators import required_indicator_columns
         from backend.infrastructure.data_sources import create_data_source
 
         data_config = self.app_config.get("data_source", {})
@@ -245,35 +312,60 @@ class ResearchJobService(TaskExecutionService):
             data_config.get("provider", "tencent"),
             timeout=data_config.get("timeout"),
         )
+        strategies = self.strategy_registry.load(self.app_config, strategy_classes)
+        engine = engine or self.app_config["defaults"].get("scan_engine", "executor")
+        flush_rows = self.app_config["defaults"].get("result_flush_rows", 1000)
+        profiler = StrategyProfiler()
+        if job_id is not None:
+            self._profilers[job_id] = profiler
+        if engine == "panel":
+            panel_engine = PanelScanEngine(
+                repository=self.stock_repository,
+                strategies=strategies,
+                panel_store=self.panel_store,
+                result_flush_rows=flush_rows,
+                progress=self.progress,
+                profiler=profiler,
+            )
+            return panel_engine.stream(start_date, end_date, target_dates, job_id=job_id, stock_codes=stock_codes)
+
         trade_data_service = TradeDataService(
             repository=self.stock_repository,
             data_source=data_source,
             allow_online_fetch=False,
-        )
-        strategies = load_strategies_from_config(
-            config=self.app_config,
-            strategy_classes=strategy_classes,
+            panel_store=self.panel_store,
+            indicator_columns=required_indicator_columns(strategies),
         )
         executor = StrategyExecutor(
             trade_data_service=trade_data_service,
             repository=self.stock_repository,
             strategies=strategies,
             max_workers=self.app_config["defaults"]["max_workers"],
+            history_batch_size=self.app_config["defaults"].get("history_batch_size", 500),
+            execution_mode=self.app_config["defaults"].get("scan_execution", "thread"),
+            process_workers=self.app_config["defaults"].get("scan_processes"),
+            result_flush_rows=flush_rows,
+            progress=self.progress,
+            signal_cache=self.app_config["defaults"].get("signal_cache", False),
+            sql_prefilter=self.app_config["defaults"].get("scan_prefilter", False),
+            profiler=profiler,
         )
-        return executor.run(start_date, end_date, target_dates, job_id=job_id)
+        return executor.stream(start_date, end_date, target_dates, job_id=job_id, stock_codes=stock_codes)
 
     def _resolve_strategy_classes(self, strategy_classes: list[str] | None) -> list[str] | None:
         if strategy_classes is None:
             return None
 
-        from backend.application.strategy.loader import load_strategies_from_config
-
-        strategies = load_strategies_from_config(
-            config=self.app_config,
-            strategy_classes=strategy_classes,
-        )
+        strategies = self.strategy_registry.load(self.app_config, strategy_classes)
         return [strategy.__class__.__name__ for strategy in strategies]
 
+    def _scan_lookback(self, strategy_classes: list[str] | None) -> int | None:
+        """Trading days the selected strategies need, or None when none are enabled."""
+        from backend.application.strategy.planner import ScanPlanner
+
+        strategies = self.strategy_registry.load(self.app_config, strategy_classes)
+        return ScanPlanner(strategies).lookback if strategies else None
+
     def _supported_backtest_strategies(self) -> list[str]:
         lister = getattr(self.backtest_service, "list_supported_strategies", None)
         if lister is not None:
@@ -301,6 +393,8 @@ class ResearchJobService(TaskExecutionService):
             "total_items": job.total_items,
             "success_count": job.success_count,
             "failed_count": job.failed_count,
+            "results_complete": job.status == JobStatus.COMPLETED,
+            "strategy_profile": job.strategy_profile,
             "error": job.error,
             "created_at": job.created_at,
             "started_at": job.started_at,
@@ -0,0 +1,78 @@
+"""技术指标 — 预计算指标列的定义与增量计算。
+
+指标按股票全历史计算并落库；策略读取历史行情时可以附带这些列，
+避免每个目标日期都重新滚动计算。
+"""
+
+import numpy as np
+import pandas as pd
+
+# 列名 -> (来源列, 窗口)
+MOVING_AVERAGES = {
+    "ma20": ("close", 20),
+    "ma60": ("close", 60),
+    "ma100": ("close", 100),
+    "vol_ma20": ("volume", 20),
+}
+EMA_SPANS = {"ema12": 12, "ema26": 26}
+DEA_SPAN = 9
+EMA_STATE_COLUMNS = ["ema12", "ema26", "dea"]
+INDICATOR_COLUMNS = [*MOVING_AVERAGES, *EMA_SPANS, "diff", "dea"]
+# 增量计算时需要在起始日期之前补读的行数（最长均线窗口 - 1）。
+WARMUP_ROWS = max(window for _, window in MOVING_AVERAGES.values()) - 1
+
+
+def compute_indicators(history: pd.DataFrame, start_index: int = 0, state: dict | None = None) -> pd.DataFrame:
+    """计算 ``history`` 中从 ``start_index`` 开始各行的指标。
+
+    Args:
+        history: 按日期升序的行情，至少包含 date, close, volume 列；
+                 ``start_index`` 之前的行只用于均线预热。
+        start_index: 第一条需要输出指标的行。
+        state: 上一交易日的 ema12/ema26/dea，用于延续 EMA；为 None 时
+               EMA 从 ``start_index`` 行的收盘价起算，与全量计算一致。
+
+    Returns:
+        包含 date 与 INDICATOR_COLUMNS 的 DataFrame，索引从 0 开始。
+    """
+    result = pd.DataFrame({"date": history["date"].iloc[start_index:].to_numpy()})
+    for column, (source, window) in MOVING_AVERAGES.items():
+        values = history[source].astype("float64").rolling(window=window).mean()
+        result[column] = values.iloc[start_index:].to_numpy()
+
+    closes = history["close"].astype("float64").iloc[start_index:].reset_index(drop=True)
+    for column, span in EMA_SPANS.items():
+        result[column] = _ema(closes, span, None if state is None else state.get(column))
+    result["diff"] = result["ema12"] - result["ema26"]
+    result["dea"] = _ema(result["diff"], DEA_SPAN, None if state is None else state.get("dea"))
+    return result
+
+
+def precomputed_or_rolling(hist_data: pd.DataFrame, column: str) -> pd.Series:
+    """返回 ``column`` 对应的均线序列，优先使用预计算列。
+
+    预计算列按全历史计算；为与在 ``hist_data`` 上现算的结果一致，前
+    ``window - 1`` 行置为 NaN。预计算列缺值时回退为现算。``hist_data`` 也可以是
+    check_panel() 收到的字段宽表映射，此时按列现算。
+    """
+    source, window = MOVING_AVERAGES[column]
+    if column in hist_data:
+        values = hist_data[column]
+        warm = values.iloc[window - 1:]
+        if not warm.isna().any():
+            return values.mask(np.arange(len(values)) < window - 1)
+    return hist_data[source].rolling(window=window).mean()
+
+
+def required_indicator_columns(strategies) -> list[str]:
+    """汇总一组策略声明的预计算指标列，按 INDICATOR_COLUMNS 的顺序返回。"""
+    wanted = {column for strategy in strategies for column in getattr(strategy, "indicators", ())}
+    return [column for column in INDICATOR_COLUMNS if column in wanted]
+
+
+def _ema(values: pd.Series, span: int, previous: float | None) -> np.ndarray:
+    if previous is None or pd.isna(previous):
+        return values.ewm(span=span, adjust=False).mean().to_numpy()
+    # 以上一日 EMA 作为首项，递推结果与全历史计算相同。
+    seeded = pd.concat([pd.Series([previous]), values], ignore_index=True)
+    return seeded.ewm(span=span, adjust=False).mean().to_numpy()[1:]
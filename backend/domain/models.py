@@ -66,6 +66,15 @@ class HighLowGainRank:
         }
 
 
+@dataclass(frozen=True)
+class DailyCoverage:
+    """一只股票在某个日期区间内的本地日线覆盖情况。"""
+
+    code: str
+    last_date: str | None  # 区间内最新的本地交易日 YYYYMMDD
+    missing_dates: tuple[str, ...] = ()  # 本地缺失且近期未记录为无数据的交易日
+
+
 @dataclass(frozen=True)
 class StrategyHit:
     """策略命中结果。"""
@@ -125,6 +134,8 @@ class Job:
     created_at: str | None = None
     started_at: str | None = None
     finished_at: str | None = None
+    progress: dict | None = None
+    strategy_profile: list[dict] | None = None
 
     def mark_running(self) -> None:
         if self.status != JobStatus.QUEUED:
@@ -166,6 +177,8 @@ class Job:
             "created_at": self.created_at,
             "started_at": self.started_at,
             "finished_at": self.finished_at,
+            "progress": self.progress,
+            "strategy_profile": self.strategy_profile,
         }
 
 
@@ -9,6 +9,7 @@ import pandas as pd
 
 from backend.domain.models import (
     BacktestResultRecord,
+    DailyCoverage,
     HighLowGainRank,
     Job,
     ScanJob,
@@ -30,12 +31,23 @@ class StockRepository(ABC):
     def get_stock_history(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
         ...
 
+    @abstractmethod
+    def get_stock_histories(
+        self,
+        codes: list[str] | None,
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, pd.DataFrame]:
+        """批量读取多只股票的历史行情，codes 为 None 时读取全市场。"""
+        ...
+
     @abstractmethod
     def upsert_stocks(self, stocks: list[Stock]) -> None:
         ...
 
     @abstractmethod
-    def upsert_daily_data(self, data: pd.DataFrame, source: str | None = None) -> None:
+    def upsert_daily_data(self, data: pd.DataFrame, source: str | None = None) -> dict[str, list[str]] | None:
+        """写入日线，返回每只股票此前没有的交易日（YYYYMMDD）；不跟踪时返回 None。"""
         ...
 
     @abstractmethod
@@ -51,6 +63,122 @@ class StockRepository(ABC):
         ...
 
 
+class IndicatorRepository(ABC):
+    """预计算技术指标仓储端口。"""
+
+    @abstractmethod
+    def refresh_indicators(self, code: str, start_date: str | None = None) -> int:
+        """重算 code 自 start_date 起的指标，start_date 为 None 时全量重算，返回写入行数。"""
+        ...
+
+    def refresh_indicators_batch(self, starts: dict[str, str | None]) -> int:
+        """按 {code: start_date} 批量重算指标；默认逐只调用 refresh_indicators。"""
+        return sum(self.refresh_indicators(code, start_date) for code, start_date in starts.items())
+
+    @abstractmethod
+    def get_indicator_histories(
+        self,
+        codes: list[str],
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, pd.DataFrame]:
+        """批量读取指标，每只股票一个包含 date 与指标列的 DataFrame。"""
+        ...
+
+
+class DailyCoverageRepository(ABC):
+    """本地日线覆盖查询端口，供增量同步与扫描预筛使用。"""
+
+    @abstractmethod
+    def get_daily_coverage(
+        self,
+        codes: list[str],
+        start_date: str,
+        end_date: str,
+        trade_dates: list[str] | None = None,
+    ) -> dict[str, DailyCoverage]:
+        """一次查询返回每只股票在区间内的最新日期，以及 trade_dates 中本地缺失的交易日。
+
+        缺失的交易日不含近期已记录为数据源无数据的交易日。
+        """
+        ...
+
+    @abstractmethod
+    def record_empty_daily_dates(self, empty_dates: dict[str, list[str]]) -> None:
+        """记录已向数据源请求但未返回日线的交易日（如停牌、上市前），增量同步在一段时间内不再重复抓取。"""
+        ...
+
+    @abstractmethod
+    def clear_empty_daily_dates(self, codes: list[str], start_date: str, end_date: str) -> None:
+        """清除这些股票在区间内记录的无数据交易日。"""
+        ...
+
+    @abstractmethod
+    def get_missing_trade_dates(
+        self,
+        codes: list[str] | None,
+        trade_dates: list[str],
+    ) -> dict[str, list[str]]:
+        """返回缺少 trade_dates 中任一交易日的股票及其缺失日期；codes 为 None 时检查全市场。"""
+        ...
+
+    @abstractmethod
+    def get_bar_counts(self, codes: list[str], start_date: str, end_date: str) -> dict[str, int]:
+        """返回每只股票在区间内的本地日线条数，不读取行情表。"""
+        ...
+
+
+class DailyPanelRepository(ABC):
+    """全市场日线面板读取端口，供横截面扫描引擎使用。"""
+
+    @abstractmethod
+    def get_daily_panel(self, start_date: str, end_date: str) -> dict[str, pd.DataFrame]:
+        """读取区间内全市场日期 × 股票代码的宽表。
+
+        键为 open, close, high, low, volume, amount 及布尔的 present，
+        present 为 False 的格子表示该股票当日没有行情。
+        """
+        ...
+
+
+class SignalCacheRepository(ABC):
+    """策略信号缓存端口，按 (策略, 股票, 目标日) 保存命中与未命中。"""
+
+    @abstractmethod
+    def get_signals(
+        self,
+        codes: list[str],
+        target_dates: list[str],
+        strategies: list[str],
+    ) -> dict[tuple[str, str, str], tuple[str, int, bool]]:
+        """返回 (strategy, code, target_date) -> (version, fingerprint, hit)。"""
+        ...
+
+    @abstractmethod
+    def save_signals(self, signals: list[tuple[str, str, str, str, int, bool]]) -> None:
+        """写入 (strategy, code, target_date, version, fingerprint, hit)，覆盖同键旧值。"""
+        ...
+
+    @abstractmethod
+    def purge_signals(self, strategy: str | None = None) -> int:
+        """删除某个策略（None 表示全部）的缓存，返回删除行数。"""
+        ...
+
+
+class StrategyPrefilterRepository(ABC):
+    """策略 SQL 预筛端口，在读取完整行情前筛出候选股票。"""
+
+    @abstractmethod
+    def get_prefilter_candidates(self, conditions: list[str], target_dates: list[str], start_date: str) -> set[str]:
+        """返回任一目标日满足任一条件的股票。
+
+        条件是 stock_daily_data 单行上的 SQL 布尔表达式，可使用 open/close/high/low/
+        volume/amount 列与命名窗口 ``w``（按 code 分区、按 trade_date 排序）；
+        窗口只覆盖 start_date 起的K线，条件为 NULL 时视为满足。
+        """
+        ...
+
+
 class ScanJobRepository(ABC):
     """扫描任务仓储端口。"""
 
@@ -103,6 +231,15 @@ class JobRepository(ABC):
         ...
 
 
+class JobProgressStore(ABC):
+    """任务进度持久化端口；进度在内存中实时更新，按间隔写入。"""
+
+    @abstractmethod
+    def save_progress(self, job_id: str, progress: dict) -> None:
+        """只更新任务的进度快照，不改动状态与计数。"""
+        ...
+
+
 class SyncScheduleRepository(ABC):
     """Persistent sync schedule repository."""
 
@@ -130,6 +267,34 @@ class RankingRepository(ABC):
         ...
 
 
+class MarketPanelStore(ABC):
+    """全市场行情面板端口：按日期 × 股票矩阵存放的只读派生数据。"""
+
+    @abstractmethod
+    def refresh(self, start_date: str, end_date: str) -> None:
+        """从行情仓储重建面板中 [start_date, end_date] 的数据。"""
+        ...
+
+    @abstractmethod
+    def invalidate(self, codes: list[str], start_date: str, end_date: str) -> None:
+        """标记面板外写入的行情：在下次 refresh 前，这些股票在该区间改读行情仓储。"""
+        ...
+
+    @abstractmethod
+    def get_histories(
+        self,
+        codes: list[str] | None,
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, pd.DataFrame] | None:
+        """读取多只股票的历史行情；面板未覆盖该日期区间时返回 None。"""
+        ...
+
+    def get_panel(self, start_date: str, end_date: str) -> dict[str, pd.DataFrame] | None:
+        """以 DailyPanelRepository 的格式返回宽表；面板未覆盖该区间时返回 None。"""
+        return None
+
+
 class MarketDataSource(ABC):
     """行情数据源端口。"""
 
@@ -2,15 +2,84 @@
 
 from abc import ABC, abstractmethod
 
+import numpy as np
 import pandas as pd
 
+from backend.domain.indicators import precomputed_or_rolling
+
+
+class StrategyContext:
+    """同一只股票的行情上下文，在多个策略之间共享惰性计算结果。
+
+    ``indicator()`` 按名称（见 ``backend.domain.indicators.MOVING_AVERAGES``）
+    首次访问时计算均线并缓存；``array()`` 以 float64 NumPy 数组返回行情列。
+    上下文与 ``hist_data`` 都是只读的，策略不得修改它们。
+    """
+
+    def __init__(self, hist_data: pd.DataFrame):
+        self.hist_data = hist_data
+        self._indicators: dict[str, pd.Series] = {}
+        self._arrays: dict[str, np.ndarray] = {}
+        self._windows: dict[int, "StrategyContext"] = {}
+
+    def __len__(self) -> int:
+        return len(self.hist_data)
+
+    def indicator(self, name: str) -> pd.Series:
+        series = self._indicators.get(name)
+        if series is None:
+            series = self._indicators[name] = precomputed_or_rolling(self.hist_data, name)
+        return series
+
+    def array(self, column: str) -> np.ndarray:
+        values = self._arrays.get(column)
+        if values is None:
+            values = pd.to_numeric(self.hist_data[column], errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+            self._arrays[column] = values
+        return values
+
+    def window(self, end: int) -> "StrategyContext":
+        """返回 ``hist_data.iloc[:end + 1]`` 的上下文，逐日调用 check() 时由各策略共享。"""
+        context = self._windows.get(end)
+        if context is None:
+            context = self._windows[end] = StrategyContext(self.hist_data.iloc[:end + 1])
+        return context
+
 
 class BaseStrategy(ABC):
     """选股策略基类。
 
-    所有策略必须继承此类并实现 check() 方法。
+    所有策略必须继承此类并实现 check() 方法；可选实现 check_series()，
+    一次向量化计算所有日期的结果，供回填多个目标日期时使用；可选实现
+    check_panel()，在全市场宽表上一次计算所有股票，供横截面扫描引擎使用。
+
+    ``indicators`` 声明策略希望随行情一起读取的预计算指标列（见
+    ``backend.domain.indicators``），缺失时策略应自行计算。
+
+    check() 与 check_series() 可以额外声明 ``context: StrategyContext | None = None``
+    参数；扫描时执行器为每只股票构造一个 StrategyContext，只传给声明了该参数的
+    策略，使同一根均线只计算一次。
+
+    ``min_history`` 是命中所需的最少 K 线数（含目标日），历史不足的股票在读取
+    行情前即被跳过；``lookback`` 是目标日（含）之前需要加载的交易日数，加载更长
+    的历史不改变结果（成交量均值、EMA 等全历史统计除外）。扫描计划按所选策略
+    的最大 ``lookback`` 决定读取区间。``window_bounded`` 声明结果只取决于目标日
+    （含）之前 ``lookback`` 根 K 线、与实际加载的区间长度无关；信号缓存据此只对
+    这段窗口取指纹，未声明的策略按加载的全部 K 线取指纹。
+
+    ``prefilter_sql`` 可选声明一个粗筛条件：stock_daily_data 单行上的 DuckDB 布尔
+    表达式，可使用 ``LAG(close) OVER w`` 等窗口函数（``w`` 按股票分区、按日期排序，
+    至少覆盖目标日及之前 ``prefilter_lookback`` 个交易日）。它必须是命中的必要条件，
+    宁宽勿严；所选策略都声明了预筛时，扫描只读取任一目标日满足其中任一条件的股票。
     """
 
+    indicators: tuple[str, ...] = ()
+    min_history: int = 1
+    lookback: int = 1
+    window_bounded: bool = False
+    prefilter_sql: str | None = None
+    prefilter_lookback: int = 2
+
     def __init__(self, name: str):
         self.name = name
 
@@ -26,3 +95,30 @@ class BaseStrategy(ABC):
             True 表示命中。
         """
 
+    def check_series(self, hist_data: pd.DataFrame) -> pd.Series | None:
+        """一次计算每个交易日是否命中。
+
+        第 i 个元素必须等于 ``check(hist_data.iloc[:i + 1])``。未提供向量化
+        实现的策略返回 None，执行器回退为按目标日期调用 check()。
+
+        Args:
+            hist_data: 与 check() 相同的历史行情，按日期升序。
+
+        Returns:
+            与 hist_data 同索引的布尔 Series，或 None。
+        """
+        return None
+
+    def check_panel(self, panel: dict[str, pd.DataFrame]) -> pd.DataFrame | None:
+        """在全市场宽表上一次计算每只股票每根 K 线是否命中。
+
+        ``panel`` 以行情字段（open, close, high, low, volume, amount）为键，
+        每列是一只股票、按日期升序排列的 K 线，各列末行对齐；``panel['position']``
+        是该 K 线在股票历史中的序号，首根 K 线之前的格子全部为 NaN。每一列的结果
+        必须等于在该股票历史上调用 check_series()。未提供实现的策略返回 None，
+        扫描引擎对其逐股回退。
+
+        Returns:
+            与 panel 字段同形状的布尔 DataFrame，或 None。
+        """
+        return None
@@ -2,16 +2,18 @@
 
 import logging
 from contextlib import contextmanager
-from datetime import datetime
+from datetime import date, datetime
 from pathlib import Path
-from threading import RLock
 
-import duckdb
+import numpy as np
 import pandas as pd
 
+from backend.infrastructure.persistence.duckdb.connection import get_database
+
 logger = logging.getLogger(__name__)
 
 STANDARD_COLUMNS = ["stock_code", "date", "open", "close", "high", "low", "volume", "amount"]
+PRICE_VOLUME_COLUMNS = ["open", "close", "high", "low", "volume", "amount"]
 
 
 def to_optional_float(value) -> float | None:
@@ -26,6 +28,11 @@ def to_optional_int(value) -> int | None:
     return int(value)
 
 
+def parse_trade_date(value: str) -> date:
+    """Convert a public YYYYMMDD string into the DATE value stored in DuckDB."""
+    return datetime.strptime(str(value), "%Y%m%d").date()
+
+
 def format_timestamp(value) -> str | None:
     if value is None:
         return None
@@ -34,7 +41,11 @@ def format_timestamp(value) -> str | None:
     return str(value)
 
 
-def normalize_stock_data(data: pd.DataFrame, stock_code: str | None = None) -> pd.DataFrame:
+def normalize_stock_data(
+    data: pd.DataFrame,
+    stock_code: str | None = None,
+    sort_by: str | list[str] = "date",
+) -> pd.DataFrame:
     """Normalize market data columns and types for DuckDB writes."""
     if data is None or data.empty:
         return pd.DataFrame(columns=STANDARD_COLUMNS)
@@ -46,13 +57,56 @@ def normalize_stock_data(data: pd.DataFrame, stock_code: str | None = None) -> p
         normalized["amount"] = pd.NA
 
     normalized = normalized[STANDARD_COLUMNS]
-    normalized["date"] = pd.to_datetime(normalized["date"], errors="coerce").dt.date
+    # Keep dates as datetime64 so readers compare and index them without
+    # materializing one Python object per row.
+    normalized["date"] = pd.to_datetime(normalized["date"], errors="coerce").dt.normalize()
 
-    for column in ["open", "close", "high", "low", "volume", "amount"]:
+    for column in PRICE_VOLUME_COLUMNS:
         normalized[column] = pd.to_numeric(normalized[column], errors="coerce")
 
     normalized = normalized.dropna(subset=["stock_code", "date"])
-    return normalized.sort_values("date").reset_index(drop=True)
+    return normalized.sort_values(sort_by, kind="stable").reset_index(drop=True)
+
+
+def split_by_code(data: pd.DataFrame) -> dict[str, pd.DataFrame]:
+    """Split a frame sorted by stock_code into per-code slices without copying.
+
+    Group boundaries come from one vectorized comparison over the code column;
+    every slice is an ``iloc`` view of ``data`` with its own 0-based index.
+    """
+    if data.empty:
+        return {}
+    codes = data["stock_code"].to_numpy()
+    boundaries = np.flatnonzero(codes[1:] != codes[:-1]) + 1
+    starts = np.concatenate(([0], boundaries))
+    stops = np.concatenate((boundaries, [len(codes)]))
+
+    histories: dict[str, pd.DataFrame] = {}
+    for start, stop in zip(starts, stops):
+        piece = data.iloc[start:stop]
+        piece.index = pd.RangeIndex(stop - start)
+        histories[str(codes[start])] = piece
+    return histories
+
+
+def is_normalized_stock_data(data: pd.DataFrame | None) -> bool:
+    """Return True when ``data`` already has the shape ``normalize_stock_data`` produces.
+
+    The checks are column-level so large frames are not walked row by row.
+    """
+    if data is None or list(data.columns) != STANDARD_COLUMNS:
+        return False
+    if not all(pd.api.types.is_numeric_dtype(data[column]) for column in PRICE_VOLUME_COLUMNS):
+        return False
+    if data.empty:
+        return True
+    dates = data["date"]
+    if not (
+        pd.api.types.is_datetime64_any_dtype(dates)
+        or pd.api.types.infer_dtype(dates, skipna=False) == "date"
+    ):
+        return False
+    return not (dates.isna().any() or data["stock_code"].isna().any())
 
 
 def table_exists(conn, table_name: str) -> bool:
@@ -81,29 +135,72 @@ def table_columns(conn, table_name: str) -> set[str]:
     return {row[0] for row in rows}
 
 
+def column_type(conn, table_name: str, column_name: str) -> str | None:
+    row = conn.execute(
+        """
+        SELECT data_type
+        FROM information_schema.columns
+        WHERE table_name = ? AND column_name = ?
+        """,
+        (table_name, column_name),
+    ).fetchone()
+    return row[0] if row else None
+
+
+def migrate_date_column(conn, table_name: str, column_name: str, create_sql: str) -> None:
+    """Rebuild ``table_name`` so a VARCHAR YYYYMMDD ``column_name`` becomes DATE.
+
+    DuckDB cannot change the type of a key column in place, so the rows are
+    copied into a freshly created table and the old one is dropped, all inside
+    the caller's transaction.
+    """
+    if column_type(conn, table_name, column_name) != "VARCHAR":
+        return
+
+    legacy_name = f"{table_name}_varchar_dates"
+    logger.info("迁移 %s.%s 为 DATE 类型", table_name, column_name)
+    conn.execute(f"ALTER TABLE {table_name} RENAME TO {legacy_name}")
+    conn.execute(create_sql)
+    columns = [
+        column for column in sorted(table_columns(conn, legacy_name))
+        if column in table_columns(conn, table_name)
+    ]
+    select_list = ", ".join(
+        f"CAST(strptime({column}, '%Y%m%d') AS DATE)" if column == column_name else column
+        for column in columns
+    )
+    conn.execute(
+        f"INSERT INTO {table_name} ({', '.join(columns)}) SELECT {select_list} FROM {legacy_name}"
+    )
+    conn.execute(f"DROP TABLE {legacy_name}")
+
+
 def add_column_if_missing(conn, table_name: str, column_name: str, ddl: str) -> None:
     if column_name not in table_columns(conn, table_name):
         conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {ddl}")
 
 
 class DuckDBBase:
-    """DuckDB connection management shared by repository implementations."""
+    """DuckDB connection management shared by repository implementations.
+
+    All repositories on the same file share one long-lived database handle.
+    ``connection()`` is for reads and may run concurrently from many threads;
+    ``transaction()`` serializes writers and commits atomically.
+    """
 
     def __init__(self, db_path: str = "stock_data.duckdb"):
         self.db_path = Path(db_path)
-        self._lock = RLock()
-
-    def connect(self):
-        return duckdb.connect(str(self.db_path))
+        self.database = get_database(self.db_path)
 
     @contextmanager
     def connection(self):
-        with self._lock:
-            conn = self.connect()
-            try:
-                yield conn
-            finally:
-                conn.close()
+        with self.database.read() as conn:
+            yield conn
+
+    @contextmanager
+    def transaction(self):
+        with self.database.write() as conn:
+            yield conn
 
 
 def now_iso() -> str:
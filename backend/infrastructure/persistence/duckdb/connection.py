@@ -0,0 +1,125 @@
+"""Process-wide DuckDB connection management.
+
+DuckDB allows one read-write database instance per file inside a process.  The
+instance is opened once and kept for the lifetime of the process; every thread
+gets its own cursor on top of it, so reads run concurrently and only writes are
+serialized by a per-database lock.
+"""
+
+import logging
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+import duckdb
+
+logger = logging.getLogger(__name__)
+
+
+class DuckDBDatabase:
+    """Long-lived DuckDB handle with per-thread cursors and a single writer."""
+
+    def __init__(self, db_path: str | Path):
+        self.db_path = Path(db_path)
+        self._conn = duckdb.connect(str(self.db_path))
+        self._local = threading.local()
+        self._cursor_lock = threading.Lock()
+        self._write_lock = threading.RLock()
+        self._closed = False
+        self._shared: dict[str, object] = {}
+
+    def cursor(self):
+        """Return the calling thread's cursor, creating it on first use."""
+        cursor = getattr(self._local, "cursor", None)
+        if cursor is None:
+            with self._cursor_lock:
+                if self._closed:
+                    raise RuntimeError(f"DuckDB 数据库已关闭: {self.db_path}")
+                cursor = self._conn.cursor()
+            self._local.cursor = cursor
+        return cursor
+
+    @contextmanager
+    def read(self):
+        """Yield a cursor for read-only work; readers never take the write lock."""
+        yield self.cursor()
+
+    @contextmanager
+    def write(self):
+        """Yield a cursor inside a transaction while holding the writer lock.
+
+        Nested ``write()`` calls on the same thread join the outer transaction.
+        """
+        with self._write_lock:
+            cursor = self.cursor()
+            depth = getattr(self._local, "write_depth", 0)
+            if depth:
+                self._local.write_depth = depth + 1
+                try:
+                    yield cursor
+                finally:
+                    self._local.write_depth = depth
+                return
+
+            self._local.write_depth = 1
+            cursor.begin()
+            try:
+                yield cursor
+            except BaseException:
+                cursor.rollback()
+                raise
+            else:
+                cursor.commit()
+            finally:
+                self._local.write_depth = 0
+
+    def shared(self, name: str, factory):
+        """Return the process-wide object ``name`` attached to this database.
+
+        ``factory`` runs once; later callers get the same instance, so state
+        such as caches stays consistent across repositories on one file.
+        """
+        with self._cursor_lock:
+            if name not in self._shared:
+                self._shared[name] = factory()
+            return self._shared[name]
+
+    def close(self) -> None:
+        with self._cursor_lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._conn.close()
+
+
+_DATABASES: dict[str, DuckDBDatabase] = {}
+_DATABASES_LOCK = threading.Lock()
+
+
+def get_database(db_path: str | Path) -> DuckDBDatabase:
+    """Return the shared database handle for ``db_path``, opening it once."""
+    key = str(Path(db_path).resolve())
+    with _DATABASES_LOCK:
+        database = _DATABASES.get(key)
+        if database is None:
+            database = DuckDBDatabase(db_path)
+            _DATABASES[key] = database
+            logger.info("DuckDB 数据库已打开: %s", key)
+        return database
+
+
+def close_database(db_path: str | Path) -> None:
+    """Close and forget the shared handle for ``db_path`` if it is open."""
+    key = str(Path(db_path).resolve())
+    with _DATABASES_LOCK:
+        database = _DATABASES.pop(key, None)
+    if database is not None:
+        database.close()
+
+
+def close_all_databases() -> None:
+    with _DATABASES_LOCK:
+        databases = list(_DATABASES.values())
+        _DATABASES.clear()
+    for database in databases:
+        database.close()
@@ -0,0 +1,155 @@
+"""Per-code coverage bitmaps of the days held in ``stock_daily_data``.
+
+Bit ``i`` of a code's bitmap is set when there is a bar for day
+``first_day + i``, counted in days since 1970-01-01.  Bars are never deleted,
+so an upsert only ORs its own days in and the table never has to be rescanned.
+The whole index is a few MB for the full market and is kept in memory after
+the first read.
+"""
+
+import threading
+from dataclasses import dataclass
+from typing import Callable
+
+import numpy as np
+import pandas as pd
+
+STOCK_COVERAGE_DDL = """
+    CREATE TABLE IF NOT EXISTS stock_coverage (
+        code VARCHAR PRIMARY KEY,
+        first_day INTEGER NOT NULL,
+        bits BLOB NOT NULL
+    )
+"""
+
+
+def day_ordinals(values) -> np.ndarray:
+    """Convert dates or YYYYMMDD strings to days since 1970-01-01."""
+    series = pd.Series(values)
+    if series.dtype == object:
+        series = pd.to_datetime(series, format="%Y%m%d")
+    return pd.to_datetime(series).to_numpy(dtype="datetime64[D]").astype(np.int64)
+
+
+def format_ordinals(ordinals: np.ndarray) -> list[str]:
+    return [str(day).replace("-", "") for day in np.asarray(ordinals, dtype="datetime64[D]")]
+
+
+@dataclass(frozen=True)
+class CoverageBitmap:
+    first_day: int
+    bits: np.ndarray  # packed uint8, little-endian bit order
+
+    @classmethod
+    def from_days(cls, days: np.ndarray) -> "CoverageBitmap":
+        days = np.unique(np.asarray(days, dtype=np.int64))
+        first_day = int(days[0])
+        flags = np.zeros(int(days[-1]) - first_day + 1, dtype=bool)
+        flags[days - first_day] = True
+        return cls(first_day, np.packbits(flags, bitorder="little"))
+
+    def days(self) -> np.ndarray:
+        flags = np.unpackbits(self.bits, bitorder="little")
+        return np.flatnonzero(flags).astype(np.int64) + self.first_day
+
+    def merge(self, days: np.ndarray) -> "CoverageBitmap":
+        return CoverageBitmap.from_days(np.concatenate([self.days(), np.asarray(days, dtype=np.int64)]))
+
+    def contains(self, ordinals: np.ndarray) -> np.ndarray:
+        offsets = np.asarray(ordinals, dtype=np.int64) - self.first_day
+        inside = (offsets >= 0) & (offsets < len(self.bits) * 8)
+        present = np.zeros(len(offsets), dtype=bool)
+        offsets = offsets[inside]
+        present[inside] = (self.bits[offsets >> 3] >> (offsets & 7)) & 1
+        return present
+
+    def last_between(self, start: int, end: int) -> int | None:
+        days = self.days()
+        days = days[(days >= start) & (days <= end)]
+        return int(days[-1]) if len(days) else None
+
+
+class CoverageIndex:
+    """In-memory copy of ``stock_coverage`` shared by repositories on one file.
+
+    The mapping is replaced, never mutated, so a snapshot returned by
+    :meth:`snapshot` stays consistent while writers publish new bitmaps.
+    Published bitmaps are ORed into the current ones, so writers that commit
+    concurrently may publish in any order without dropping days.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._bitmaps: dict[str, CoverageBitmap] | None = None
+
+    def snapshot(self, load: Callable[[], dict[str, CoverageBitmap]]) -> dict[str, CoverageBitmap]:
+        with self._lock:
+            if self._bitmaps is None:
+                self._bitmaps = load()
+            return self._bitmaps
+
+    def publish(self, bitmaps: dict[str, CoverageBitmap]) -> None:
+        with self._lock:
+            if self._bitmaps is not None:
+                current = self._bitmaps
+                self._bitmaps = {
+                    **current,
+                    **{
+                        code: current[code].merge(bitmap.days()) if code in current else bitmap
+                        for code, bitmap in bitmaps.items()
+                    },
+                }
+
+
+def load_coverage(conn, codes: list[str] | None = None) -> dict[str, CoverageBitmap]:
+    if codes is None:
+        rows = conn.execute("SELECT code, first_day, bits FROM stock_coverage").fetchall()
+    else:
+        rows = conn.execute(
+            "SELECT code, first_day, bits FROM stock_coverage WHERE code IN (SELECT unnest(?))",
+            (list(codes),),
+        ).fetchall()
+    return {
+        code: CoverageBitmap(int(first_day), np.frombuffer(bits, dtype=np.uint8))
+        for code, first_day, bits in rows
+    }
+
+
+def merge_coverage(conn, bars_sql: str) -> tuple[dict[str, CoverageBitmap], dict[str, list[str]]]:
+    """OR the days selected by ``bars_sql`` (``code, trade_date``) into the table.
+
+    Returns the updated bitmaps, so the caller can publish them after commit,
+    and the YYYYMMDD days per code that were not covered before.
+    """
+    rows = conn.execute(
+        f"""
+        SELECT code, list(DISTINCT CAST(trade_date AS DATE) - DATE '1970-01-01')
+        FROM ({bars_sql})
+        GROUP BY code
+        """
+    ).fetchall()
+    if not rows:
+        return {}, {}
+    existing = load_coverage(conn, [code for code, _ in rows])
+    merged = {
+        code: existing[code].merge(np.array(days)) if code in existing else CoverageBitmap.from_days(np.array(days))
+        for code, days in rows
+    }
+    added = {}
+    for code, days in rows:
+        days = np.sort(np.array(days, dtype=np.int64))
+        if code in existing:
+            days = days[~existing[code].contains(days)]
+        if len(days):
+            added[code] = format_ordinals(days)
+    frame = pd.DataFrame({
+        "code": list(merged),
+        "first_day": [bitmap.first_day for bitmap in merged.values()],
+        "bits": [bitmap.bits.tobytes() for bitmap in merged.values()],
+    })
+    conn.register("incoming_coverage", frame)
+    try:
+        conn.execute("INSERT OR REPLACE INTO stock_coverage SELECT code, first_day, bits FROM incoming_coverage")
+    finally:
+        conn.unregister("incoming_coverage")
+    return merged, added
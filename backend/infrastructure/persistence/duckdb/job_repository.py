@@ -3,11 +3,11 @@
 import json
 
 from backend.domain.models import BacktestResultRecord, Job, JobStatus, JobType, SyncResult, SyncSchedule
-from backend.domain.ports import JobRepository, SyncScheduleRepository
+from backend.domain.ports import JobProgressStore, JobRepository, SyncScheduleRepository
 from backend.infrastructure.persistence.duckdb.base import DuckDBBase, format_timestamp
 
 
-class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
+class DuckDBJobRepository(DuckDBBase, JobRepository, JobProgressStore, SyncScheduleRepository):
     """Unified job and result repository for v2 workflows."""
 
     def __init__(self, db_path: str = "stock_data.duckdb"):
@@ -15,7 +15,7 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
         self._init_schema()
 
     def _init_schema(self):
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS jobs (
                     job_id VARCHAR PRIMARY KEY,
@@ -28,9 +28,13 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
                     error VARCHAR,
                     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     started_at TIMESTAMP,
-                    finished_at TIMESTAMP
+                    finished_at TIMESTAMP,
+                    progress_json VARCHAR,
+                    strategy_profile_json VARCHAR
                 )
             """)
+            conn.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS progress_json VARCHAR")
+            conn.execute("ALTER TABLE jobs ADD COLUMN IF NOT EXISTS strategy_profile_json VARCHAR")
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS sync_results (
                     job_id VARCHAR NOT NULL,
@@ -79,14 +83,17 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
 
     def save(self, job: Job) -> None:
         params_json = json.dumps(job.params, ensure_ascii=False)
-        with self.connection() as conn:
+        progress_json = json.dumps(job.progress, ensure_ascii=False) if job.progress is not None else None
+        profile_json = json.dumps(job.strategy_profile, ensure_ascii=False) if job.strategy_profile is not None else None
+        with self.transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO jobs (
                     job_id, type, status, params_json, total_items,
-                    success_count, failed_count, error, started_at, finished_at
+                    success_count, failed_count, error, started_at, finished_at, progress_json,
+                    strategy_profile_json
                 )
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 ON CONFLICT(job_id) DO UPDATE SET
                     type=excluded.type, status=excluded.status,
                     params_json=excluded.params_json,
@@ -95,7 +102,9 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
                     failed_count=excluded.failed_count,
                     error=excluded.error,
                     started_at=excluded.started_at,
-                    finished_at=excluded.finished_at
+                    finished_at=excluded.finished_at,
+                    progress_json=COALESCE(excluded.progress_json, jobs.progress_json),
+                    strategy_profile_json=COALESCE(excluded.strategy_profile_json, jobs.strategy_profile_json)
                 """,
                 (
                     job.job_id,
@@ -108,16 +117,25 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
                     job.error,
                     job.started_at,
                     job.finished_at,
+                    progress_json,
+                    profile_json,
                 ),
             )
 
+    def save_progress(self, job_id: str, progress: dict) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                "UPDATE jobs SET progress_json = ? WHERE job_id = ?",
+                (json.dumps(progress, ensure_ascii=False), job_id),
+            )
+
     def get(self, job_id: str) -> Job | None:
         with self.connection() as conn:
             row = conn.execute(
                 """
                 SELECT job_id, type, status, params_json, total_items,
                        success_count, failed_count, error, created_at,
-                       started_at, finished_at
+                       started_at, finished_at, progress_json, strategy_profile_json
                 FROM jobs
                 WHERE job_id = ?
                 """,
@@ -131,7 +149,7 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
                 """
                 SELECT job_id, type, status, params_json, total_items,
                        success_count, failed_count, error, created_at,
-                       started_at, finished_at
+                       started_at, finished_at, progress_json, strategy_profile_json
                 FROM jobs
                 ORDER BY created_at DESC
                 LIMIT ?
@@ -147,7 +165,7 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
             (item.job_id, item.scope, item.code, item.status, item.rows_written, item.message)
             for item in results
         ]
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.executemany(
                 """
                 INSERT INTO sync_results (job_id, scope, code, status, rows_written, message)
@@ -200,7 +218,7 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
             )
             for item in results
         ]
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.executemany(
                 """
                 INSERT INTO backtest_results (
@@ -269,7 +287,7 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
 
     def save_sync_schedule(self, schedule: SyncSchedule) -> None:
         stock_codes_json = json.dumps(schedule.stock_codes, ensure_ascii=False) if schedule.stock_codes else None
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO sync_schedules (
@@ -317,6 +335,8 @@ class DuckDBJobRepository(DuckDBBase, JobRepository, SyncScheduleRepository):
             created_at=format_timestamp(row[8]),
             started_at=format_timestamp(row[9]),
             finished_at=format_timestamp(row[10]),
+            progress=json.loads(row[11]) if row[11] else None,
+            strategy_profile=json.loads(row[12]) if row[12] else None,
         )
 
     @staticmethod
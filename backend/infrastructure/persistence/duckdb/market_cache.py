@@ -0,0 +1,213 @@
+"""Process-wide in-memory cache of daily OHLCV history."""
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+from backend.infrastructure.persistence.duckdb.base import STANDARD_COLUMNS
+
+VALUE_COLUMNS = [column for column in STANDARD_COLUMNS if column != "stock_code"]
+# Approximate footprint of one memoized ranking row (a HighLowGainRank).
+RANK_ENTRY_BYTES = 512
+
+
+def to_day(value) -> np.datetime64:
+    """Convert a YYYYMMDD string or date-like value to ``datetime64[D]``."""
+    if isinstance(value, str) and len(value) == 8 and value.isdigit():
+        value = f"{value[:4]}-{value[4:6]}-{value[6:]}"
+    return np.datetime64(pd.Timestamp(value).date(), "D")
+
+
+@dataclass
+class _CachedHistory:
+    """Contiguous column arrays for one code over the window ``[start, end]``."""
+
+    start: np.datetime64
+    end: np.datetime64
+    days: np.ndarray
+    columns: dict[str, np.ndarray]
+    nbytes: int
+    used: int = 0
+
+    def covers(self, start: np.datetime64, end: np.datetime64) -> bool:
+        return self.start <= start and end <= self.end
+
+
+@dataclass
+class _CachedRanking:
+    start: np.datetime64
+    end: np.datetime64
+    ranks: list
+    nbytes: int
+    used: int = 0
+
+
+class MarketDataCache:
+    """LRU cache of per-code history arrays bounded by a byte budget.
+
+    Entries remember the query window they were loaded for, so a cached window
+    answers any narrower request by slicing.  Writes invalidate only the codes
+    and windows they overlap.  Ranking results are memoized alongside, count
+    against the same byte budget and LRU order, and are dropped whenever a
+    write touches their date range.
+    """
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max(int(max_bytes), 0)
+        self._entries: OrderedDict[str, _CachedHistory] = OrderedDict()
+        self._rankings: OrderedDict[tuple, _CachedRanking] = OrderedDict()
+        self._bytes = 0
+        self._tick = 0
+        self._lock = threading.Lock()
+        self.version = 0
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    @property
+    def current_bytes(self) -> int:
+        return self._bytes
+
+    def get(self, code: str, start_date: str, end_date: str) -> pd.DataFrame | None:
+        """Return the cached history for ``code`` or None on a miss."""
+        start, end = to_day(start_date), to_day(end_date)
+        with self._lock:
+            entry = self._entries.get(code)
+            if entry is None or not entry.covers(start, end):
+                self.misses += 1
+                return None
+            self._entries.move_to_end(code)
+            entry.used = self._touch()
+            self.hits += 1
+        return self._slice(code, entry, start, end)
+
+    def put(
+        self,
+        code: str,
+        start_date: str,
+        end_date: str,
+        history: pd.DataFrame,
+        version: int | None = None,
+    ) -> None:
+        """Store a normalized history loaded for ``[start_date, end_date]``.
+
+        Codes without rows are cached as empty entries so repeated misses do
+        not go back to disk either.  ``version`` is the value of
+        :attr:`version` taken before the read; the entry is discarded if a
+        write invalidated the cache in between.
+        """
+        if not self.enabled:
+            return
+        columns = {column: history[column].to_numpy(copy=True) for column in VALUE_COLUMNS}
+        days = columns["date"].astype("datetime64[D]")
+        nbytes = days.nbytes + sum(array.nbytes for array in columns.values())
+        if nbytes > self.max_bytes:
+            return
+        entry = _CachedHistory(to_day(start_date), to_day(end_date), days, columns, nbytes)
+        with self._lock:
+            if version is not None and version != self.version:
+                # A write landed while this history was being read.
+                return
+            previous = self._entries.pop(code, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            entry.used = self._touch()
+            self._entries[code] = entry
+            self._bytes += nbytes
+            self._evict()
+
+    def invalidate(self, code: str, start_date, end_date) -> None:
+        """Drop cached data for ``code`` whose window overlaps the written range."""
+        start, end = to_day(start_date), to_day(end_date)
+        with self._lock:
+            self.version += 1
+            entry = self._entries.get(code)
+            if entry is not None and entry.start <= end and start <= entry.end:
+                del self._entries[code]
+                self._bytes -= entry.nbytes
+            self._invalidate_rankings(start, end)
+
+    def invalidate_rankings(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._bytes -= sum(ranking.nbytes for ranking in self._rankings.values())
+            self._rankings.clear()
+
+    def get_ranking(self, key: tuple) -> list | None:
+        with self._lock:
+            cached = self._rankings.get(key)
+            if cached is None:
+                return None
+            self._rankings.move_to_end(key)
+            cached.used = self._touch()
+        return list(cached.ranks)
+
+    def put_ranking(
+        self,
+        key: tuple,
+        start_date: str,
+        end_date: str,
+        ranks: list,
+        version: int | None = None,
+    ) -> None:
+        if not self.enabled:
+            return
+        nbytes = max(1, len(ranks)) * RANK_ENTRY_BYTES
+        if nbytes > self.max_bytes:
+            return
+        ranking = _CachedRanking(to_day(start_date), to_day(end_date), list(ranks), nbytes)
+        with self._lock:
+            if version is not None and version != self.version:
+                return
+            previous = self._rankings.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous.nbytes
+            ranking.used = self._touch()
+            self._rankings[key] = ranking
+            self._bytes += nbytes
+            self._evict()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.version += 1
+            self._entries.clear()
+            self._rankings.clear()
+            self._bytes = 0
+
+    def _invalidate_rankings(self, start: np.datetime64, end: np.datetime64) -> None:
+        stale = [
+            key for key, ranking in self._rankings.items()
+            if ranking.start <= end and start <= ranking.end
+        ]
+        for key in stale:
+            self._bytes -= self._rankings.pop(key).nbytes
+
+    def _touch(self) -> int:
+        self._tick += 1
+        return self._tick
+
+    def _evict(self) -> None:
+        """Drop least recently used histories or rankings until within budget."""
+        while self._bytes > self.max_bytes and (self._entries or self._rankings):
+            history = next(iter(self._entries.values()), None)
+            ranking = next(iter(self._rankings.values()), None)
+            if ranking is None or (history is not None and history.used < ranking.used):
+                _, evicted = self._entries.popitem(last=False)
+            else:
+                _, evicted = self._rankings.popitem(last=False)
+            self._bytes -= evicted.nbytes
+
+    @staticmethod
+    def _slice(code: str, entry: _CachedHistory, start: np.datetime64, end: np.datetime64) -> pd.DataFrame:
+        lo = np.searchsorted(entry.days, start, side="left")
+        hi = np.searchsorted(entry.days, end, side="right")
+        data = {"stock_code": np.full(hi - lo, code, dtype=object)}
+        for column in VALUE_COLUMNS:
+            data[column] = entry.columns[column][lo:hi].copy()
+        return pd.DataFrame(data, columns=STANDARD_COLUMNS)
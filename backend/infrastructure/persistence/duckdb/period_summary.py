@@ -0,0 +1,132 @@
+"""Monthly and weekly high/low rollups used by range rankings.
+
+Every code gets one ``month`` row per calendar month and one ``week`` row per
+Monday-based week clipped to its month, so week buckets never straddle a month
+boundary.  Each row keeps the lowest low and highest high of the bucket with
+the earliest date reaching them, over the same rows the ranking accepts
+(non-null prices and a positive low).  A ranking range is then covered by
+whole months, whole week buckets and a few raw daily rows at its edges.
+"""
+
+from calendar import monthrange
+from datetime import date, timedelta
+
+PERIOD_SUMMARY_DDL = """
+    CREATE TABLE IF NOT EXISTS stock_period_summary (
+        code VARCHAR NOT NULL,
+        period_type VARCHAR NOT NULL,
+        period_start DATE NOT NULL,
+        period_end DATE NOT NULL,
+        min_low DOUBLE NOT NULL,
+        min_low_date DATE NOT NULL,
+        max_high DOUBLE NOT NULL,
+        max_high_date DATE NOT NULL,
+        trade_days BIGINT NOT NULL,
+        PRIMARY KEY (code, period_type, period_start)
+    )
+"""
+
+_BUCKET_EXPRESSIONS = {
+    "month": (
+        "CAST(date_trunc('month', trade_date) AS DATE)",
+        "last_day(trade_date)",
+    ),
+    "week": (
+        "greatest(CAST(date_trunc('week', trade_date) AS DATE), CAST(date_trunc('month', trade_date) AS DATE))",
+        "least(CAST(date_trunc('week', trade_date) AS DATE) + 6, last_day(trade_date))",
+    ),
+}
+
+
+def refresh_period_summary(conn, touched_sql: str, params: tuple = ()) -> None:
+    """Rebuild the rollup rows of the months listed by ``touched_sql``.
+
+    ``touched_sql`` must select ``code, first_day, last_day`` and is
+    expanded to whole months before the old rows are replaced.
+    """
+    touched = f"""
+        SELECT
+            code,
+            CAST(date_trunc('month', min(first_day)) AS DATE) AS month_start,
+            last_day(max(last_day)) AS month_end
+        FROM ({touched_sql})
+        GROUP BY code
+    """
+    conn.execute(
+        f"""
+        DELETE FROM stock_period_summary
+        USING ({touched}) touched
+        WHERE stock_period_summary.code = touched.code
+          AND stock_period_summary.period_start BETWEEN touched.month_start AND touched.month_end
+        """,
+        params,
+    )
+    for period_type, (start_expr, end_expr) in _BUCKET_EXPRESSIONS.items():
+        conn.execute(
+            f"""
+            INSERT INTO stock_period_summary
+            SELECT
+                code,
+                '{period_type}',
+                period_start,
+                period_end,
+                lowest.price,
+                lowest.day,
+                -highest.price,
+                highest.day,
+                trade_days
+            FROM (
+                SELECT
+                    d.code,
+                    {start_expr} AS period_start,
+                    {end_expr} AS period_end,
+                    min(struct_pack(price := d.low, day := d.trade_date)) AS lowest,
+                    min(struct_pack(price := -d.high, day := d.trade_date)) AS highest,
+                    COUNT(*) AS trade_days
+                FROM stock_daily_data d
+                JOIN ({touched}) touched
+                  ON touched.code = d.code
+                 AND d.trade_date BETWEEN touched.month_start AND touched.month_end
+                WHERE d.high IS NOT NULL
+                  AND d.low IS NOT NULL
+                  AND d.low > 0
+                GROUP BY ALL
+            )
+            """,
+            params,
+        )
+
+
+def decompose_range(start: date, end: date) -> tuple[list[date], list[date], list[tuple[date, date]]]:
+    """Split ``[start, end]`` into month starts, week bucket starts and daily spans.
+
+    Months are preferred over weeks and weeks over days, so a multi-year range
+    reads a few hundred rollup rows per code and at most a couple of weeks of
+    raw rows at each edge.
+    """
+    months: list[date] = []
+    weeks: list[date] = []
+    days: list[tuple[date, date]] = []
+    cursor = start
+    while cursor <= end:
+        month_end = _month_end(cursor)
+        week_end = min(cursor + timedelta(days=6 - cursor.weekday()), month_end)
+        if cursor.day == 1 and month_end <= end:
+            months.append(cursor)
+            cursor = month_end + timedelta(days=1)
+        elif (cursor.weekday() == 0 or cursor.day == 1) and week_end <= end:
+            weeks.append(cursor)
+            cursor = week_end + timedelta(days=1)
+        else:
+            # Raw days up to the next bucket boundary (or the end of the range).
+            span_end = min(week_end, end)
+            if days and days[-1][1] + timedelta(days=1) == cursor:
+                days[-1] = (days[-1][0], span_end)
+            else:
+                days.append((cursor, span_end))
+            cursor = span_end + timedelta(days=1)
+    return months, weeks, days
+
+
+def _month_end(day: date) -> date:
+    return day.replace(day=monthrange(day.year, day.month)[1])
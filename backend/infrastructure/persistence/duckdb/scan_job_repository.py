@@ -4,7 +4,7 @@ import json
 
 from backend.domain.models import JobStatus, ScanJob, StrategyHit
 from backend.domain.ports import ScanJobRepository
-from backend.infrastructure.persistence.duckdb.base import DuckDBBase, format_timestamp
+from backend.infrastructure.persistence.duckdb.base import DuckDBBase, format_timestamp, parse_trade_date
 
 
 class DuckDBScanJobRepository(DuckDBBase, ScanJobRepository):
@@ -15,7 +15,7 @@ class DuckDBScanJobRepository(DuckDBBase, ScanJobRepository):
         self._init_schema()
 
     def _init_schema(self):
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS scan_jobs (
                     job_id VARCHAR PRIMARY KEY,
@@ -33,7 +33,7 @@ class DuckDBScanJobRepository(DuckDBBase, ScanJobRepository):
 
     def save(self, job: ScanJob) -> None:
         targets_json = json.dumps(job.target_dates, ensure_ascii=False)
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.execute(
                 """
                 INSERT INTO scan_jobs (job_id, status, start_date, end_date, targets_json, total_results, error, started_at, finished_at)
@@ -92,7 +92,7 @@ class DuckDBScanJobRepository(DuckDBBase, ScanJobRepository):
         with self.connection() as conn:
             rows = conn.execute(
                 """
-                SELECT code, name, strategy, target_date, current_price, current_volume, created_at
+                SELECT code, name, strategy, strftime(target_date, '%Y%m%d'), current_price, current_volume, created_at
                 FROM strategy_results
                 WHERE job_id = ?
                 ORDER BY target_date, code, strategy
@@ -103,12 +103,12 @@ class DuckDBScanJobRepository(DuckDBBase, ScanJobRepository):
                 placeholders = ", ".join(["?"] * len(job.target_dates))
                 rows = conn.execute(
                     f"""
-                    SELECT code, name, strategy, target_date, current_price, current_volume, created_at
+                    SELECT code, name, strategy, strftime(target_date, '%Y%m%d'), current_price, current_volume, created_at
                     FROM strategy_results
                     WHERE target_date IN ({placeholders})
                     ORDER BY target_date, code, strategy
                     """,
-                    job.target_dates,
+                    [parse_trade_date(item) for item in job.target_dates],
                 ).fetchall()
 
         return [
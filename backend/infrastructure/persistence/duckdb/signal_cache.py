@@ -0,0 +1,34 @@
+"""Cached strategy signals keyed by strategy version and input fingerprint.
+
+One row per (strategy, code, target_date) holds the last evaluation, hit or
+miss, together with the strategy version and the fingerprint of the bars the
+strategy read.  A row is only reused when both still match, so stale rows are
+harmless; writes of daily bars still delete the rows they can affect, which
+are the rows of that code from the first written date on.
+"""
+
+SIGNAL_CACHE_DDL = """
+    CREATE TABLE IF NOT EXISTS strategy_signal_cache (
+        strategy VARCHAR NOT NULL,
+        code VARCHAR NOT NULL,
+        target_date DATE NOT NULL,
+        version VARCHAR NOT NULL,
+        fingerprint BIGINT NOT NULL,
+        hit BOOLEAN NOT NULL,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (strategy, code, target_date)
+    )
+"""
+
+
+def invalidate_signals(conn, written_sql: str) -> None:
+    """Delete cached signals whose input window may include bars from ``written_sql``.
+
+    ``written_sql`` selects ``code`` and ``first_day`` for each written code.
+    """
+    conn.execute(f"""
+        DELETE FROM strategy_signal_cache
+        USING ({written_sql}) AS written
+        WHERE strategy_signal_cache.code = written.code
+          AND strategy_signal_cache.target_date >= written.first_day
+    """)
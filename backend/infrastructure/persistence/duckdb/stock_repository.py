@@ -1,33 +1,145 @@
 """DuckDB stock data repository."""
 
+import logging
 from typing import Iterable
 
+import numpy as np
 import pandas as pd
 
-from backend.domain.models import HighLowGainRank, Stock, StrategyHit
-from backend.domain.ports import RankingRepository, StockRepository
+from backend.domain.indicators import EMA_STATE_COLUMNS, INDICATOR_COLUMNS, WARMUP_ROWS, compute_indicators
+from backend.domain.models import DailyCoverage, HighLowGainRank, Stock, StrategyHit
+from backend.domain.ports import (
+    DailyCoverageRepository,
+    DailyPanelRepository,
+    IndicatorRepository,
+    RankingRepository,
+    SignalCacheRepository,
+    StockRepository,
+    StrategyPrefilterRepository,
+)
 from backend.infrastructure.persistence.duckdb.base import (
+    PRICE_VOLUME_COLUMNS,
     DuckDBBase,
     add_column_if_missing,
     format_timestamp,
+    is_normalized_stock_data,
+    migrate_date_column,
     normalize_stock_data,
     now_iso,
+    parse_trade_date,
+    split_by_code,
     table_columns,
     table_exists,
-    to_optional_float,
-    to_optional_int,
 )
+from backend.infrastructure.persistence.duckdb.coverage import (
+    STOCK_COVERAGE_DDL,
+    CoverageIndex,
+    day_ordinals,
+    format_ordinals,
+    load_coverage,
+    merge_coverage,
+)
+from backend.infrastructure.persistence.duckdb.market_cache import MarketDataCache
+from backend.infrastructure.persistence.duckdb.period_summary import (
+    PERIOD_SUMMARY_DDL,
+    decompose_range,
+    refresh_period_summary,
+)
+from backend.infrastructure.persistence.duckdb.signal_cache import SIGNAL_CACHE_DDL, invalidate_signals
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MARKET_CACHE_MB = 256
+# A day the source did not return is asked for again after this many days,
+# so a response lost to a source glitch heals on its own.
+EMPTY_DATE_TTL_DAYS = 30
+
+STOCK_DAILY_DATA_DDL = """
+    CREATE TABLE IF NOT EXISTS stock_daily_data (
+        code VARCHAR NOT NULL,
+        trade_date DATE NOT NULL,
+        open DOUBLE,
+        close DOUBLE,
+        high DOUBLE,
+        low DOUBLE,
+        volume BIGINT,
+        amount DOUBLE,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        source VARCHAR,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (code, trade_date)
+    )
+"""
 
+STRATEGY_RESULTS_DDL = """
+    CREATE TABLE IF NOT EXISTS strategy_results (
+        job_id VARCHAR NOT NULL,
+        code VARCHAR NOT NULL,
+        name VARCHAR NOT NULL,
+        strategy VARCHAR NOT NULL,
+        target_date DATE NOT NULL,
+        current_price DOUBLE,
+        current_volume BIGINT,
+        created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (job_id, code, strategy, target_date)
+    )
+"""
 
-class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
+STOCK_EMPTY_DAILY_DATES_DDL = """
+    CREATE TABLE IF NOT EXISTS stock_empty_daily_dates (
+        code VARCHAR NOT NULL,
+        trade_date DATE NOT NULL,
+        recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        PRIMARY KEY (code, trade_date)
+    )
+"""
+
+
+STOCK_INDICATORS_DDL = f"""
+    CREATE TABLE IF NOT EXISTS stock_indicators (
+        code VARCHAR NOT NULL,
+        trade_date DATE NOT NULL,
+        {", ".join(f"{column} DOUBLE" for column in INDICATOR_COLUMNS)},
+        PRIMARY KEY (code, trade_date)
+    )
+"""
+
+
+class DuckDBStockRepository(
+    DuckDBBase,
+    StockRepository,
+    RankingRepository,
+    IndicatorRepository,
+    DailyCoverageRepository,
+    DailyPanelRepository,
+    SignalCacheRepository,
+    StrategyPrefilterRepository,
+):
     """DuckDB stock data repository implementation."""
 
-    def __init__(self, db_path: str = "stock_data.duckdb"):
+    def __init__(
+        self,
+        db_path: str = "stock_data.duckdb",
+        market_cache_mb: float = DEFAULT_MARKET_CACHE_MB,
+    ):
         super().__init__(db_path)
+        # One cache per database file, so writes through any repository
+        # invalidate what every reader on that file sees.
+        max_bytes = int(market_cache_mb * 1024 * 1024)
+        self.market_cache = self.database.shared("market_cache", lambda: MarketDataCache(max_bytes))
+        if self.market_cache.max_bytes != max(max_bytes, 0):
+            # Keying caches by size would let a write invalidate only one of them.
+            logger.warning(
+                "行情缓存已按 %s MB 创建，忽略 market_cache_mb=%s: db_path=%s",
+                self.market_cache.max_bytes / 1024 / 1024,
+                market_cache_mb,
+                db_path,
+            )
+        self.coverage_index = self.database.shared("coverage_index", CoverageIndex)
         self._init_schema()
 
     def _init_schema(self):
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.execute("""
                 CREATE TABLE IF NOT EXISTS stocks (
                     code VARCHAR PRIMARY KEY,
@@ -35,22 +147,7 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                     updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
                 )
             """)
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS stock_daily_data (
-                    code VARCHAR NOT NULL,
-                    trade_date VARCHAR NOT NULL,
-                    open DOUBLE,
-                    close DOUBLE,
-                    high DOUBLE,
-                    low DOUBLE,
-                    volume BIGINT,
-                    amount DOUBLE,
-                    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    source VARCHAR,
-                    updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                    PRIMARY KEY (code, trade_date)
-                )
-            """)
+            conn.execute(STOCK_DAILY_DATA_DDL)
             add_column_if_missing(conn, "stock_daily_data", "source", "source VARCHAR")
             add_column_if_missing(
                 conn,
@@ -58,25 +155,37 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                 "updated_at",
                 "updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
             )
+            migrate_date_column(conn, "stock_daily_data", "trade_date", STOCK_DAILY_DATA_DDL)
+            conn.execute(STOCK_INDICATORS_DDL)
+            conn.execute(STOCK_EMPTY_DAILY_DATES_DDL)
+            add_column_if_missing(
+                conn,
+                "stock_empty_daily_dates",
+                "recorded_at",
+                "recorded_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP",
+            )
+            if not table_exists(conn, "stock_period_summary"):
+                conn.execute(PERIOD_SUMMARY_DDL)
+                refresh_period_summary(
+                    conn,
+                    """
+                    SELECT code, min(trade_date) AS first_day, max(trade_date) AS last_day
+                    FROM stock_daily_data
+                    GROUP BY code
+                    """,
+                )
+            if not table_exists(conn, "stock_coverage"):
+                conn.execute(STOCK_COVERAGE_DDL)
+                merge_coverage(conn, "SELECT code, trade_date FROM stock_daily_data")
+            conn.execute(SIGNAL_CACHE_DDL)
             self._init_strategy_results_schema(conn)
 
     def _init_strategy_results_schema(self, conn):
         if table_exists(conn, "strategy_results") and "job_id" not in table_columns(conn, "strategy_results"):
             conn.execute("ALTER TABLE strategy_results RENAME TO strategy_results_legacy")
 
-        conn.execute("""
-            CREATE TABLE IF NOT EXISTS strategy_results (
-                job_id VARCHAR NOT NULL,
-                code VARCHAR NOT NULL,
-                name VARCHAR NOT NULL,
-                strategy VARCHAR NOT NULL,
-                target_date VARCHAR NOT NULL,
-                current_price DOUBLE,
-                current_volume BIGINT,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                PRIMARY KEY (job_id, code, strategy, target_date)
-            )
-        """)
+        conn.execute(STRATEGY_RESULTS_DDL)
+        migrate_date_column(conn, "strategy_results", "target_date", STRATEGY_RESULTS_DDL)
 
         if table_exists(conn, "strategy_results_legacy"):
             conn.execute("""
@@ -85,7 +194,7 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                     current_price, current_volume, created_at
                 )
                 SELECT
-                    'legacy', code, name, strategy, target_date,
+                    'legacy', code, name, strategy, CAST(strptime(target_date, '%Y%m%d') AS DATE),
                     current_price, current_volume, created_at
                 FROM strategy_results_legacy
             """)
@@ -101,6 +210,11 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
             return conn.execute("SELECT code, name FROM stocks ORDER BY code").fetchdf()
 
     def get_stock_history(self, code: str, start_date: str, end_date: str) -> pd.DataFrame:
+        cached = self.market_cache.get(code, start_date, end_date)
+        if cached is not None:
+            return cached
+
+        version = self.market_cache.version
         with self.connection() as conn:
             data = conn.execute(
                 """
@@ -111,9 +225,106 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                 WHERE code = ? AND trade_date BETWEEN ? AND ?
                 ORDER BY trade_date
                 """,
-                (code, start_date, end_date),
+                (code, parse_trade_date(start_date), parse_trade_date(end_date)),
+            ).fetchdf()
+        history = normalize_stock_data(data, stock_code=code)
+        self.market_cache.put(code, start_date, end_date, history, version=version)
+        return history
+
+    def get_stock_histories(
+        self,
+        codes: list[str] | None,
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, pd.DataFrame]:
+        """Load many codes with one columnar query and split them by code.
+
+        ``codes=None`` loads the whole universe.  Codes without local rows are
+        absent from the result.  Codes already held by the market data cache
+        are served from memory and only the rest are queried.
+        """
+        if codes is not None and not codes:
+            return {}
+
+        histories: dict[str, pd.DataFrame] = {}
+        if codes is not None:
+            missing = []
+            for code in dict.fromkeys(codes):
+                cached = self.market_cache.get(code, start_date, end_date)
+                if cached is None:
+                    missing.append(code)
+                elif not cached.empty:
+                    histories[code] = cached
+            if not missing:
+                return histories
+            codes = missing
+
+        version = self.market_cache.version
+        with self.connection() as conn:
+            if codes is None:
+                data = conn.execute(
+                    """
+                    SELECT
+                        code AS stock_code, trade_date AS date,
+                        open, close, high, low, volume, amount
+                    FROM stock_daily_data
+                    WHERE trade_date BETWEEN ? AND ?
+                    ORDER BY code, trade_date
+                    """,
+                    (parse_trade_date(start_date), parse_trade_date(end_date)),
+                ).fetchdf()
+            else:
+                conn.register("requested_codes", pd.DataFrame({"code": codes}))
+                try:
+                    data = conn.execute(
+                        """
+                        SELECT
+                            code AS stock_code, trade_date AS date,
+                            open, close, high, low, volume, amount
+                        FROM stock_daily_data
+                        WHERE code IN (SELECT code FROM requested_codes)
+                          AND trade_date BETWEEN ? AND ?
+                        ORDER BY code, trade_date
+                        """,
+                        (parse_trade_date(start_date), parse_trade_date(end_date)),
+                    ).fetchdf()
+                finally:
+                    conn.unregister("requested_codes")
+        loaded = split_by_code(normalize_stock_data(data, sort_by=["stock_code", "date"]))
+        empty = normalize_stock_data(None)
+        for code in loaded if codes is None else codes:
+            self.market_cache.put(code, start_date, end_date, loaded.get(code, empty), version=version)
+        histories.update(loaded)
+        return histories
+
+    def get_daily_panel(self, start_date: str, end_date: str) -> dict[str, pd.DataFrame]:
+        """Load the whole market as date × code matrices with one columnar query."""
+        with self.connection() as conn:
+            data = conn.execute(
+                """
+                SELECT code, trade_date, open, close, high, low, volume, amount
+                FROM stock_daily_data
+                WHERE trade_date BETWEEN ? AND ?
+                """,
+                (parse_trade_date(start_date), parse_trade_date(end_date)),
             ).fetchdf()
-        return normalize_stock_data(data, stock_code=code)
+
+        codes, columns = np.unique(data["code"].astype(str).to_numpy(), return_inverse=True)
+        days = pd.to_datetime(data["trade_date"]).to_numpy(dtype="datetime64[ns]")
+        dates, rows = np.unique(days, return_inverse=True)
+        index = pd.DatetimeIndex(dates, name="date")
+        labels = pd.Index(codes, name="code")
+        shape = (len(dates), len(codes))
+
+        present = np.zeros(shape, dtype=bool)
+        present[rows, columns] = True
+        panel = {"present": pd.DataFrame(present, index=index, columns=labels)}
+        for field in PRICE_VOLUME_COLUMNS:
+            matrix = np.full(shape, np.nan)
+            values = pd.to_numeric(data[field], errors="coerce")
+            matrix[rows, columns] = values.to_numpy(dtype="float64", na_value=np.nan)
+            panel[field] = pd.DataFrame(matrix, index=index, columns=labels)
+        return panel
 
     def upsert_stocks(self, stocks: list[Stock] | pd.DataFrame | Iterable[dict]) -> None:
         if isinstance(stocks, pd.DataFrame):
@@ -130,7 +341,7 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
             (str(row["code"]), row["name"])
             for _, row in stocks_df[["code", "name"]].dropna().iterrows()
         ]
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.executemany(
                 """
                 INSERT INTO stocks (code, name, updated_at)
@@ -139,41 +350,69 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                 """,
                 records,
             )
+        self.market_cache.invalidate_rankings()
 
-    def upsert_daily_data(self, data: pd.DataFrame, source: str | None = None) -> None:
-        normalized = normalize_stock_data(data)
+    def upsert_daily_data(self, data: pd.DataFrame, source: str | None = None) -> dict[str, list[str]]:
+        normalized = data if is_normalized_stock_data(data) else normalize_stock_data(data)
         if normalized.empty:
-            return
+            return {}
 
-        updated_at = now_iso()
-        records = [
-            (
-                str(row["stock_code"]),
-                row["date"].strftime("%Y%m%d"),
-                to_optional_float(row["open"]),
-                to_optional_float(row["close"]),
-                to_optional_float(row["high"]),
-                to_optional_float(row["low"]),
-                to_optional_int(row["volume"]),
-                to_optional_float(row["amount"]),
-                source,
-                updated_at,
-            )
-            for _, row in normalized.iterrows()
-        ]
-        with self.connection() as conn:
-            conn.executemany(
-                """
-                INSERT INTO stock_daily_data (code, trade_date, open, close, high, low, volume, amount, source, updated_at)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                ON CONFLICT(code, trade_date) DO UPDATE SET
-                    open=excluded.open, close=excluded.close,
-                    high=excluded.high, low=excluded.low,
-                    volume=excluded.volume, amount=excluded.amount,
-                    source=excluded.source, updated_at=excluded.updated_at
-                """,
-                records,
-            )
+        incoming = pd.DataFrame({
+            "code": normalized["stock_code"].astype(str).to_numpy(),
+            "trade_date": normalized["date"].to_numpy(),
+        })
+        for column in PRICE_VOLUME_COLUMNS:
+            incoming[column] = normalized[column].astype("float64").to_numpy()
+        # ON CONFLICT cannot touch the same key twice in one statement.
+        incoming = incoming.drop_duplicates(subset=["code", "trade_date"], keep="last")
+
+        with self.transaction() as conn:
+            conn.register("incoming_daily_data", incoming)
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO stock_daily_data (code, trade_date, open, close, high, low, volume, amount, source, updated_at)
+                    SELECT
+                        code,
+                        CAST(trade_date AS DATE),
+                        open, close, high, low,
+                        CAST(trunc(volume) AS BIGINT),
+                        amount,
+                        ?,
+                        CAST(? AS TIMESTAMP)
+                    FROM incoming_daily_data
+                    ON CONFLICT(code, trade_date) DO UPDATE SET
+                        open=excluded.open, close=excluded.close,
+                        high=excluded.high, low=excluded.low,
+                        volume=excluded.volume, amount=excluded.amount,
+                        source=excluded.source, updated_at=excluded.updated_at
+                    """,
+                    (source, now_iso()),
+                )
+                refresh_period_summary(
+                    conn,
+                    """
+                    SELECT
+                        code,
+                        CAST(min(trade_date) AS DATE) AS first_day,
+                        CAST(max(trade_date) AS DATE) AS last_day
+                    FROM incoming_daily_data
+                    GROUP BY code
+                    """,
+                )
+                coverage, added = merge_coverage(conn, "SELECT code, trade_date FROM incoming_daily_data")
+                invalidate_signals(
+                    conn,
+                    "SELECT code, CAST(min(trade_date) AS DATE) AS first_day FROM incoming_daily_data GROUP BY code",
+                )
+            finally:
+                conn.unregister("incoming_daily_data")
+
+        self.coverage_index.publish(coverage)
+        written = incoming.groupby("code", sort=False)["trade_date"].agg(["min", "max"])
+        for code, first_date, last_date in written.itertuples():
+            self.market_cache.invalidate(code, first_date, last_date)
+        return added
 
     def upsert_strategy_results(self, results: list[StrategyHit] | list[dict], job_id: str | None = None) -> None:
         if not results:
@@ -204,11 +443,11 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                     item.get("current_volume"),
                 ))
 
-        with self.connection() as conn:
+        with self.transaction() as conn:
             conn.executemany(
                 """
                 INSERT INTO strategy_results (job_id, code, name, strategy, target_date, current_price, current_volume)
-                VALUES (?, ?, ?, ?, ?, ?, ?)
+                VALUES (?, ?, ?, ?, CAST(strptime(?, '%Y%m%d') AS DATE), ?, ?)
                 ON CONFLICT(job_id, code, strategy, target_date) DO UPDATE SET
                     name=excluded.name, current_price=excluded.current_price,
                     current_volume=excluded.current_volume
@@ -216,19 +455,347 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                 records,
             )
 
+    def refresh_indicators(self, code: str, start_date: str | None = None) -> int:
+        """Recompute indicators for ``code`` from ``start_date`` to its latest bar.
+
+        Only the tail is recomputed: moving averages are warmed up with the
+        preceding rows and EMAs continue from the stored row before
+        ``start_date``.  Without a matching stored row the whole code is
+        recomputed.
+        """
+        return self.refresh_indicators_batch({code: start_date})
+
+    def refresh_indicators_batch(self, starts: dict[str, str | None]) -> int:
+        """Recompute indicators like :meth:`refresh_indicators` for many codes.
+
+        Warm-up rows, EMA state and tails of every code are read with one
+        query each, and all recomputed rows are written in one transaction.
+        """
+        if not starts:
+            return 0
+        requested = pd.DataFrame({
+            "code": list(starts),
+            "start": pd.to_datetime([parse_trade_date(start) if start else None for start in starts.values()]),
+        })
+        with self.connection() as conn:
+            conn.register("refresh_starts", requested)
+            try:
+                warmups = conn.execute(
+                    """
+                    SELECT d.code, d.trade_date AS date, d.close, d.volume
+                    FROM stock_daily_data d
+                    JOIN refresh_starts s ON d.code = s.code
+                    WHERE d.trade_date < CAST(s.start AS DATE)
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY d.code ORDER BY d.trade_date DESC) <= ?
+                    ORDER BY d.code, d.trade_date
+                    """,
+                    (WARMUP_ROWS,),
+                ).fetchdf()
+                previous = conn.execute(
+                    f"""
+                    SELECT i.code, i.trade_date, {", ".join(f"i.{column}" for column in EMA_STATE_COLUMNS)}
+                    FROM stock_indicators i
+                    JOIN refresh_starts s ON i.code = s.code
+                    WHERE i.trade_date < CAST(s.start AS DATE)
+                    QUALIFY ROW_NUMBER() OVER (PARTITION BY i.code ORDER BY i.trade_date DESC) = 1
+                    """
+                ).fetchdf()
+                warmups = {code: frame.drop(columns="code").reset_index(drop=True) for code, frame in warmups.groupby("code", sort=False)}
+                states = {row.code: row for row in previous.itertuples(index=False)}
+                chained = {}
+                for code in starts:
+                    warmup = warmups.get(code)
+                    state = states.get(code)
+                    if warmup is None:
+                        continue
+                    if state is not None and pd.Timestamp(state.trade_date) == pd.Timestamp(warmup["date"].iloc[-1]):
+                        chained[code] = (warmup, {column: getattr(state, column) for column in EMA_STATE_COLUMNS})
+                # The EMA chain of the other codes is broken or absent; rebuild them from their first bar.
+                requested["start"] = [
+                    start if code in chained else pd.NaT for code, start in zip(requested["code"], requested["start"])
+                ]
+                conn.unregister("refresh_starts")
+                conn.register("refresh_starts", requested)
+                tails = conn.execute(
+                    """
+                    SELECT d.code, d.trade_date AS date, d.close, d.volume
+                    FROM stock_daily_data d
+                    JOIN refresh_starts s ON d.code = s.code
+                    WHERE s.start IS NULL OR d.trade_date >= CAST(s.start AS DATE)
+                    ORDER BY d.code, d.trade_date
+                    """
+                ).fetchdf()
+            finally:
+                conn.unregister("refresh_starts")
+
+        frames = []
+        for code, tail in tails.groupby("code", sort=False):
+            tail = tail.drop(columns="code").reset_index(drop=True)
+            warmup, state = chained.get(code, (None, None))
+            history = tail if warmup is None else pd.concat([warmup, tail], ignore_index=True)
+            indicators = compute_indicators(history, start_index=0 if warmup is None else len(warmup), state=state)
+            indicators.insert(0, "code", code)
+            frames.append(indicators)
+        if not frames:
+            return 0
+
+        indicators = pd.concat(frames, ignore_index=True).rename(columns={"date": "trade_date"})
+        with self.transaction() as conn:
+            conn.register("incoming_indicators", indicators)
+            try:
+                conn.execute(
+                    f"""
+                    INSERT INTO stock_indicators (code, trade_date, {", ".join(INDICATOR_COLUMNS)})
+                    SELECT code, CAST(trade_date AS DATE), {", ".join(INDICATOR_COLUMNS)}
+                    FROM incoming_indicators
+                    ON CONFLICT(code, trade_date) DO UPDATE SET
+                        {", ".join(f"{column}=excluded.{column}" for column in INDICATOR_COLUMNS)}
+                    """
+                )
+            finally:
+                conn.unregister("incoming_indicators")
+        return len(indicators)
+
+    def get_indicator_histories(
+        self,
+        codes: list[str],
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, pd.DataFrame]:
+        if not codes:
+            return {}
+        with self.connection() as conn:
+            conn.register("requested_codes", pd.DataFrame({"code": list(dict.fromkeys(codes))}))
+            try:
+                data = conn.execute(
+                    f"""
+                    SELECT code AS stock_code, trade_date AS date, {", ".join(INDICATOR_COLUMNS)}
+                    FROM stock_indicators
+                    WHERE code IN (SELECT code FROM requested_codes)
+                      AND trade_date BETWEEN ? AND ?
+                    ORDER BY code, trade_date
+                    """,
+                    (parse_trade_date(start_date), parse_trade_date(end_date)),
+                ).fetchdf()
+            finally:
+                conn.unregister("requested_codes")
+        data["date"] = pd.to_datetime(data["date"]).astype("datetime64[ns]")
+        return {
+            code: frame.drop(columns="stock_code")
+            for code, frame in split_by_code(data).items()
+        }
+
     def get_available_dates(self, code: str, start_date: str, end_date: str) -> set[str]:
+        bitmap = self._coverage().get(code)
+        if bitmap is None:
+            return set()
+        days = bitmap.days()
+        start, end = day_ordinals([start_date, end_date])
+        return set(format_ordinals(days[(days >= start) & (days <= end)]))
+
+    def get_daily_coverage(
+        self,
+        codes: list[str],
+        start_date: str,
+        end_date: str,
+        trade_dates: list[str] | None = None,
+    ) -> dict[str, DailyCoverage]:
+        bitmaps = self._coverage()
+        start, end = day_ordinals([start_date, end_date])
+        calendar = [day for day in trade_dates or [] if start_date <= day <= end_date]
+        ordinals = day_ordinals(calendar)
+        known_empty = self._empty_daily_dates(codes, start_date, end_date) if calendar else {}
+        coverage = {}
+        for code in dict.fromkeys(codes):
+            bitmap = bitmaps.get(code)
+            if bitmap is None:
+                coverage[code] = DailyCoverage(code=code, last_date=None, missing_dates=tuple(calendar))
+                continue
+            last_day = bitmap.last_between(start, end)
+            absent = ~bitmap.contains(ordinals)
+            empty = known_empty.get(code, ())
+            coverage[code] = DailyCoverage(
+                code=code,
+                last_date=None if last_day is None else format_ordinals([last_day])[0],
+                missing_dates=tuple(day for day, flag in zip(calendar, absent) if flag and day not in empty),
+            )
+        return coverage
+
+    def record_empty_daily_dates(self, empty_dates: dict[str, list[str]]) -> None:
+        rows = pd.DataFrame(
+            [(code, parse_trade_date(day)) for code, days in empty_dates.items() for day in days],
+            columns=["code", "trade_date"],
+        )
+        if rows.empty:
+            return
+        with self.transaction() as conn:
+            conn.register("incoming_empty_dates", rows)
+            try:
+                conn.execute(
+                    """
+                    INSERT INTO stock_empty_daily_dates (code, trade_date, recorded_at)
+                    SELECT DISTINCT code, CAST(trade_date AS DATE), CAST(? AS TIMESTAMP) FROM incoming_empty_dates
+                    ON CONFLICT(code, trade_date) DO UPDATE SET recorded_at = excluded.recorded_at
+                    """,
+                    (now_iso(),),
+                )
+            finally:
+                conn.unregister("incoming_empty_dates")
+
+    def clear_empty_daily_dates(self, codes: list[str], start_date: str, end_date: str) -> None:
+        with self.transaction() as conn:
+            conn.execute(
+                """
+                DELETE FROM stock_empty_daily_dates
+                WHERE code IN (SELECT unnest(?)) AND trade_date BETWEEN ? AND ?
+                """,
+                (list(dict.fromkeys(codes)), parse_trade_date(start_date), parse_trade_date(end_date)),
+            )
+
+    def _empty_daily_dates(self, codes: list[str], start_date: str, end_date: str) -> dict[str, set[str]]:
         with self.connection() as conn:
             rows = conn.execute(
-                "SELECT trade_date FROM stock_daily_data WHERE code = ? AND trade_date BETWEEN ? AND ?",
-                (code, start_date, end_date),
+                """
+                SELECT code, strftime(trade_date, '%Y%m%d')
+                FROM stock_empty_daily_dates
+                WHERE code IN (SELECT unnest(?)) AND trade_date BETWEEN ? AND ?
+                  AND recorded_at >= CAST(? AS TIMESTAMP) - INTERVAL (?) DAY
+                """,
+                (
+                    list(dict.fromkeys(codes)),
+                    parse_trade_date(start_date),
+                    parse_trade_date(end_date),
+                    now_iso(),
+                    EMPTY_DATE_TTL_DAYS,
+                ),
             ).fetchall()
-        return {row[0] for row in rows}
+        empty: dict[str, set[str]] = {}
+        for code, day in rows:
+            empty.setdefault(code, set()).add(day)
+        return empty
+
+    def get_missing_trade_dates(
+        self,
+        codes: list[str] | None,
+        trade_dates: list[str],
+    ) -> dict[str, list[str]]:
+        bitmaps = self._coverage()
+        if codes is None:
+            codes = sorted({stock.code for stock in self.list_stocks()} | set(bitmaps))
+        ordinals = day_ordinals(trade_dates)
+        missing = {}
+        for code in dict.fromkeys(codes):
+            bitmap = bitmaps.get(code)
+            if bitmap is None:
+                missing[code] = list(trade_dates)
+                continue
+            absent = ~bitmap.contains(ordinals)
+            if absent.any():
+                missing[code] = [day for day, flag in zip(trade_dates, absent) if flag]
+        return missing
+
+    def get_bar_counts(self, codes: list[str], start_date: str, end_date: str) -> dict[str, int]:
+        bitmaps = self._coverage()
+        start, end = day_ordinals([start_date, end_date])
+        counts = {}
+        for code in dict.fromkeys(codes):
+            bitmap = bitmaps.get(code)
+            if bitmap is None:
+                counts[code] = 0
+                continue
+            days = bitmap.days()
+            counts[code] = int(np.searchsorted(days, end, side="right") - np.searchsorted(days, start, side="left"))
+        return counts
+
+    def _coverage(self):
+        def load():
+            with self.connection() as conn:
+                return load_coverage(conn)
+
+        return self.coverage_index.snapshot(load)
+
+    def get_prefilter_candidates(self, conditions: list[str], target_dates: list[str], start_date: str) -> set[str]:
+        if not conditions or not target_dates:
+            return set()
+        # Window functions cannot appear in WHERE, so the union is evaluated
+        # per row first and filtered to the target dates afterwards.  A NULL
+        # condition (no earlier bar inside the window) keeps the stock.
+        candidate = " OR ".join(f"COALESCE(({condition}), TRUE)" for condition in conditions)
+        with self.connection() as conn:
+            rows = conn.execute(
+                f"""
+                WITH flagged AS (
+                    SELECT code, trade_date, {candidate} AS candidate
+                    FROM stock_daily_data
+                    WHERE trade_date BETWEEN ? AND ?
+                    WINDOW w AS (PARTITION BY code ORDER BY trade_date)
+                )
+                SELECT DISTINCT code
+                FROM flagged
+                WHERE candidate AND trade_date IN (SELECT unnest(?))
+                """,
+                (
+                    parse_trade_date(start_date),
+                    parse_trade_date(max(target_dates)),
+                    [parse_trade_date(day) for day in target_dates],
+                ),
+            ).fetchall()
+        return {code for (code,) in rows}
+
+    def get_signals(
+        self,
+        codes: list[str],
+        target_dates: list[str],
+        strategies: list[str],
+    ) -> dict[tuple[str, str, str], tuple[str, int, bool]]:
+        if not codes or not target_dates or not strategies:
+            return {}
+        keys = pd.DataFrame({"code": list(dict.fromkeys(codes))})
+        with self.connection() as conn:
+            conn.register("signal_codes", keys)
+            try:
+                rows = conn.execute(
+                    """
+                    SELECT c.strategy, c.code, strftime(c.target_date, '%Y%m%d'), c.version, c.fingerprint, c.hit
+                    FROM strategy_signal_cache c
+                    JOIN signal_codes USING (code)
+                    WHERE c.strategy IN (SELECT unnest(?))
+                      AND c.target_date IN (SELECT unnest(?))
+                    """,
+                    (list(strategies), [parse_trade_date(day) for day in target_dates]),
+                ).fetchall()
+            finally:
+                conn.unregister("signal_codes")
+        return {(row[0], row[1], row[2]): (row[3], int(row[4]), bool(row[5])) for row in rows}
+
+    def save_signals(self, signals: list[tuple[str, str, str, str, int, bool]]) -> None:
+        if not signals:
+            return
+        with self.transaction() as conn:
+            conn.executemany(
+                """
+                INSERT INTO strategy_signal_cache (strategy, code, target_date, version, fingerprint, hit, updated_at)
+                VALUES (?, ?, CAST(strptime(?, '%Y%m%d') AS DATE), ?, ?, ?, CAST(? AS TIMESTAMP))
+                ON CONFLICT(strategy, code, target_date) DO UPDATE SET
+                    version=excluded.version, fingerprint=excluded.fingerprint,
+                    hit=excluded.hit, updated_at=excluded.updated_at
+                """,
+                [(*signal, now_iso()) for signal in signals],
+            )
+
+    def purge_signals(self, strategy: str | None = None) -> int:
+        with self.transaction() as conn:
+            if strategy is None:
+                deleted = conn.execute("DELETE FROM strategy_signal_cache").fetchone()
+            else:
+                deleted = conn.execute("DELETE FROM strategy_signal_cache WHERE strategy = ?", (strategy,)).fetchone()
+        return int(deleted[0]) if deleted else 0
 
     def get_strategy_results(self, job_id: str) -> list[StrategyHit]:
         with self.connection() as conn:
             rows = conn.execute(
                 """
-                SELECT code, name, strategy, target_date, current_price, current_volume, created_at, job_id
+                SELECT code, name, strategy, strftime(target_date, '%Y%m%d'), current_price, current_volume, created_at, job_id
                 FROM strategy_results
                 WHERE job_id = ?
                 ORDER BY target_date, code, strategy
@@ -259,11 +826,21 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
         min_gain_percent: float | None = None,
     ) -> list[HighLowGainRank]:
         min_gain_rate = (min_gain_percent or 0) / 100
+        if direction not in {"range", "up", "down"}:
+            raise ValueError("direction must be one of range, up, down")
+
+        cache_key = (start_date, end_date, limit, direction, min_gain_rate)
+        cached = self.market_cache.get_ranking(cache_key)
+        if cached is not None:
+            return cached
+
+        version = self.market_cache.version
         if direction == "range":
-            return self._list_range_high_low_gain_rank(start_date, end_date, limit, min_gain_rate)
-        if direction in {"up", "down"}:
-            return self._list_directional_high_low_gain_rank(start_date, end_date, limit, direction, min_gain_rate)
-        raise ValueError("direction must be one of range, up, down")
+            ranks = self._list_range_high_low_gain_rank(start_date, end_date, limit, min_gain_rate)
+        else:
+            ranks = self._list_directional_high_low_gain_rank(start_date, end_date, limit, direction, min_gain_rate)
+        self.market_cache.put_ranking(cache_key, start_date, end_date, ranks, version=version)
+        return ranks
 
     def _list_range_high_low_gain_rank(
         self,
@@ -272,75 +849,75 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
         limit: int,
         min_gain_rate: float,
     ) -> list[HighLowGainRank]:
+        """Combine monthly/weekly rollups with raw rows at the edges of the range.
+
+        Packing prices with their dates keeps the earliest-date tie-break of
+        the lowest low and highest high across buckets.
+        """
+        months, weeks, daily_spans = decompose_range(parse_trade_date(start_date), parse_trade_date(end_date))
+        buckets = pd.DataFrame({
+            "period_type": ["month"] * len(months) + ["week"] * len(weeks),
+            "period_start": pd.to_datetime(pd.Series(months + weeks, dtype=object)),
+        })
+        daily_filter = " OR ".join(["d.trade_date BETWEEN ? AND ?"] * len(daily_spans)) or "FALSE"
+        daily_params = [day for span in daily_spans for day in span]
+
         with self.connection() as conn:
-            rows = conn.execute(
-                """
-                WITH filtered AS (
-                    SELECT
-                        s.code,
-                        s.name,
-                        d.trade_date,
-                        d.high,
-                        d.low
-                    FROM stocks s
-                    JOIN stock_daily_data d ON d.code = s.code
-                    WHERE d.trade_date BETWEEN ? AND ?
-                      AND d.high IS NOT NULL
-                      AND d.low IS NOT NULL
-                      AND d.low > 0
-                ),
-                stats AS (
-                    SELECT
-                        code,
-                        name,
-                        MIN(low) AS lowest_price,
-                        MAX(high) AS highest_price,
-                        COUNT(*) AS trade_days
-                    FROM filtered
-                    GROUP BY code, name
-                ),
-                lowest_dates AS (
-                    SELECT code, trade_date AS lowest_date
-                    FROM (
+            conn.register("ranking_buckets", buckets)
+            try:
+                rows = conn.execute(
+                    f"""
+                    WITH pieces AS (
                         SELECT
-                            code,
-                            trade_date,
-                            ROW_NUMBER() OVER (PARTITION BY code ORDER BY low ASC, trade_date ASC) AS rn
-                        FROM filtered
-                    )
-                    WHERE rn = 1
-                ),
-                highest_dates AS (
-                    SELECT code, trade_date AS highest_date
-                    FROM (
+                            p.code,
+                            p.min_low AS low,
+                            p.min_low_date AS low_date,
+                            p.max_high AS high,
+                            p.max_high_date AS high_date,
+                            p.trade_days
+                        FROM stock_period_summary p
+                        JOIN ranking_buckets b
+                          ON b.period_type = p.period_type
+                         AND CAST(b.period_start AS DATE) = p.period_start
+                        UNION ALL
+                        SELECT d.code, d.low, d.trade_date, d.high, d.trade_date, 1
+                        FROM stock_daily_data d
+                        WHERE ({daily_filter})
+                          AND d.high IS NOT NULL
+                          AND d.low IS NOT NULL
+                          AND d.low > 0
+                    ),
+                    stats AS (
                         SELECT
-                            code,
-                            trade_date,
-                            ROW_NUMBER() OVER (PARTITION BY code ORDER BY high DESC, trade_date ASC) AS rn
-                        FROM filtered
+                            s.code,
+                            s.name,
+                            min(struct_pack(price := pieces.low, day := pieces.low_date)) AS lowest,
+                            min(struct_pack(price := -pieces.high, day := pieces.high_date)) AS highest,
+                            SUM(pieces.trade_days) AS trade_days
+                        FROM stocks s
+                        JOIN pieces ON pieces.code = s.code
+                        GROUP BY s.code, s.name
                     )
-                    WHERE rn = 1
-                )
-                SELECT
-                    stats.code,
-                    stats.name,
-                    stats.lowest_price,
-                    lowest_dates.lowest_date,
-                    stats.highest_price,
-                    highest_dates.highest_date,
-                    (stats.highest_price - stats.lowest_price) / stats.lowest_price AS gain_rate,
-                    ((stats.highest_price - stats.lowest_price) / stats.lowest_price) * 100 AS gain_percent,
-                    stats.trade_days
-                FROM stats
-                JOIN lowest_dates ON lowest_dates.code = stats.code
-                JOIN highest_dates ON highest_dates.code = stats.code
-                WHERE stats.lowest_price > 0
-                  AND ((stats.highest_price - stats.lowest_price) / stats.lowest_price) >= ?
-                ORDER BY gain_rate DESC, stats.code
-                LIMIT ?
-                """,
-                (start_date, end_date, min_gain_rate, limit),
-            ).fetchall()
+                    SELECT
+                        code,
+                        name,
+                        lowest.price AS lowest_price,
+                        strftime(lowest.day, '%Y%m%d'),
+                        -highest.price AS highest_price,
+                        strftime(highest.day, '%Y%m%d'),
+                        (-highest.price - lowest.price) / lowest.price AS gain_rate,
+                        ((-highest.price - lowest.price) / lowest.price) * 100 AS gain_percent,
+                        trade_days
+                    FROM stats
+                    WHERE lowest.price > 0
+                      AND ((-highest.price - lowest.price) / lowest.price) >= ?
+                    ORDER BY gain_rate DESC, code
+                    LIMIT ?
+                    """,
+                    (*daily_params, min_gain_rate, limit),
+                ).fetchall()
+            finally:
+                conn.unregister("ranking_buckets")
 
         return self._rank_rows_to_models(rows, start_date, end_date)
 
@@ -352,23 +929,34 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
         direction: str,
         min_gain_rate: float,
     ) -> list[HighLowGainRank]:
+        """Best ordered (earlier point, later point) pair per code in one pass.
+
+        For each later bar, the best earlier bar is the running extreme of all
+        preceding rows: the lowest low for "up" and the highest high for
+        "down".  Packing the price with its date makes ``min`` return the
+        earliest date among equal prices.  That reproduces the ``lowest_date``
+        / ``highest_date`` tie-breaks of comparing every pair, without
+        materializing O(n²) candidates.
+        """
         if direction == "up":
+            running_extreme = "min(struct_pack(price := low, day := trade_date))"
             select_prices = """
-                first_point.low AS lowest_price,
-                first_point.trade_date AS lowest_date,
-                second_point.high AS highest_price,
-                second_point.trade_date AS highest_date,
-                (second_point.high - first_point.low) / first_point.low AS gain_rate,
-                ((second_point.high - first_point.low) / first_point.low) * 100 AS gain_percent
+                prior.price AS lowest_price,
+                prior.day AS lowest_date,
+                high AS highest_price,
+                trade_date AS highest_date,
+                (high - prior.price) / prior.price AS gain_rate,
+                ((high - prior.price) / prior.price) * 100 AS gain_percent
             """
         else:
+            running_extreme = "min(struct_pack(price := -high, day := trade_date))"
             select_prices = """
-                second_point.low AS lowest_price,
-                second_point.trade_date AS lowest_date,
-                first_point.high AS highest_price,
-                first_point.trade_date AS highest_date,
-                (first_point.high - second_point.low) / first_point.high AS gain_rate,
-                ((first_point.high - second_point.low) / first_point.high) * 100 AS gain_percent
+                low AS lowest_price,
+                trade_date AS lowest_date,
+                -prior.price AS highest_price,
+                prior.day AS highest_date,
+                (-prior.price - low) / -prior.price AS gain_rate,
+                ((-prior.price - low) / -prior.price) * 100 AS gain_percent
             """
 
         with self.connection() as conn:
@@ -389,22 +977,29 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                       AND d.high > 0
                       AND d.low > 0
                 ),
-                trade_day_stats AS (
-                    SELECT code, COUNT(*) AS trade_days
+                running AS (
+                    SELECT
+                        code,
+                        name,
+                        trade_date,
+                        high,
+                        low,
+                        {running_extreme} OVER (
+                            PARTITION BY code
+                            ORDER BY trade_date
+                            ROWS BETWEEN UNBOUNDED PRECEDING AND 1 PRECEDING
+                        ) AS prior,
+                        COUNT(*) OVER (PARTITION BY code) AS trade_days
                     FROM filtered
-                    GROUP BY code
                 ),
                 candidates AS (
                     SELECT
-                        first_point.code,
-                        first_point.name,
+                        code,
+                        name,
                         {select_prices},
-                        trade_day_stats.trade_days
-                    FROM filtered first_point
-                    JOIN filtered second_point
-                      ON second_point.code = first_point.code
-                     AND first_point.trade_date < second_point.trade_date
-                    JOIN trade_day_stats ON trade_day_stats.code = first_point.code
+                        trade_days
+                    FROM running
+                    WHERE prior IS NOT NULL
                 ),
                 ranked AS (
                     SELECT
@@ -420,9 +1015,9 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                     code,
                     name,
                     lowest_price,
-                    lowest_date,
+                    strftime(lowest_date, '%Y%m%d'),
                     highest_price,
-                    highest_date,
+                    strftime(highest_date, '%Y%m%d'),
                     gain_rate,
                     gain_percent,
                     trade_days
@@ -431,7 +1026,7 @@ class DuckDBStockRepository(DuckDBBase, StockRepository, RankingRepository):
                 ORDER BY gain_rate DESC, code
                 LIMIT ?
                 """,
-                (start_date, end_date, min_gain_rate, limit),
+                (parse_trade_date(start_date), parse_trade_date(end_date), min_gain_rate, limit),
             ).fetchall()
 
         return self._rank_rows_to_models(rows, start_date, end_date)
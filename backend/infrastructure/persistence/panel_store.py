@@ -0,0 +1,354 @@
+"""Memory-mapped date × code OHLCV panel derived from DuckDB.
+
+Each field is one C-ordered ``.npy`` matrix (rows are trade dates, columns are
+codes) opened with ``numpy.load(mmap_mode="r")``, so every scan thread shares
+the same page-cache backed mapping instead of deserializing its own copy.
+
+The panel is split into immutable segments of ``SEGMENT_DAYS`` calendar days.
+A refresh rewrites only the segments its date range touches and reuses the
+others, then swaps the ``CURRENT`` manifest atomically, so readers holding an
+older mapping keep a consistent snapshot until they reopen.  Each segment is
+built from one columnar ``get_daily_panel`` query, so a refresh holds at most
+one segment in memory and leaves the repository's history cache alone.
+
+Bars written outside a refresh (the online fetch of a scan) are recorded in
+the manifest by :meth:`OHLCVPanelStore.invalidate`; those codes are served
+from the repository until the next refresh rebuilds their dates.
+"""
+
+import json
+import logging
+import os
+import shutil
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from uuid import uuid4
+
+import numpy as np
+import pandas as pd
+
+from backend.domain.ports import DailyPanelRepository, MarketPanelStore
+from backend.infrastructure.persistence.duckdb.base import STANDARD_COLUMNS
+
+logger = logging.getLogger(__name__)
+
+PANEL_FIELDS = ["open", "close", "high", "low", "volume", "amount"]
+# About 60 trading days.
+SEGMENT_DAYS = 84
+ONE_DAY = np.timedelta64(1, "D")
+
+
+def _to_day(value: str) -> np.datetime64:
+    return np.datetime64(f"{value[:4]}-{value[4:6]}-{value[6:8]}", "D")
+
+
+def _merge_spans(spans: list[tuple[np.datetime64, np.datetime64]]) -> list[tuple[np.datetime64, np.datetime64]]:
+    """Merge overlapping or adjacent day ranges."""
+    merged: list[tuple[np.datetime64, np.datetime64]] = []
+    for start, end in sorted(spans):
+        if merged and start <= merged[-1][1] + ONE_DAY:
+            merged[-1] = (merged[-1][0], max(merged[-1][1], end))
+        else:
+            merged.append((start, end))
+    return merged
+
+
+@dataclass
+class PanelSegment:
+    """Immutable slice of the panel mirroring ``window`` exactly.
+
+    Dates in the window without a row for a code are marked absent in
+    ``present``.
+    """
+
+    name: str
+    dates: np.ndarray
+    codes: np.ndarray
+    window: np.ndarray
+    fields: dict[str, np.ndarray]
+    present: np.ndarray
+
+    def __post_init__(self):
+        self.column_by_code = {str(code): index for index, code in enumerate(self.codes)}
+
+    def rows(self, start: np.datetime64, end: np.datetime64) -> tuple[int, int]:
+        lo = int(np.searchsorted(self.dates, start, side="left"))
+        hi = int(np.searchsorted(self.dates, end, side="right"))
+        return lo, hi
+
+
+@dataclass
+class OHLCVPanel:
+    """One opened panel version: date-ordered segments plus stale code ranges."""
+
+    version: str
+    segments: list[PanelSegment]
+    stale: dict[str, tuple[np.datetime64, np.datetime64]]
+
+    @property
+    def codes(self) -> np.ndarray:
+        if not self.segments:
+            return np.array([], dtype=str)
+        return np.unique(np.concatenate([segment.codes.astype(str) for segment in self.segments]))
+
+    def covers(self, start: np.datetime64, end: np.datetime64) -> bool:
+        reached = start - ONE_DAY
+        for segment in self.segments:
+            if segment.window[1] <= reached:
+                continue
+            if segment.window[0] > reached + ONE_DAY:
+                return False
+            reached = segment.window[1]
+            if reached >= end:
+                return True
+        return False
+
+    def is_stale(self, code: str, start: np.datetime64, end: np.datetime64) -> bool:
+        span = self.stale.get(code)
+        return span is not None and span[0] <= end and start <= span[1]
+
+    def histories(self, codes: list[str], start: np.datetime64, end: np.datetime64) -> dict[str, pd.DataFrame]:
+        parts: dict[str, list[tuple[np.ndarray, dict[str, np.ndarray]]]] = {}
+        for segment in self.segments:
+            lo, hi = segment.rows(start, end)
+            wanted = [code for code in codes if code in segment.column_by_code]
+            if not wanted or lo >= hi:
+                continue
+
+            columns = np.array([segment.column_by_code[code] for code in wanted])
+            # One gather per field reads each touched row of the mapping once.
+            present = segment.present[lo:hi][:, columns]
+            values = {field: segment.fields[field][lo:hi][:, columns] for field in PANEL_FIELDS}
+            dates = segment.dates[lo:hi].astype("datetime64[ns]")
+            for position, code in enumerate(wanted):
+                rows = present[:, position]
+                if rows.any():
+                    parts.setdefault(code, []).append(
+                        (dates[rows], {field: values[field][rows, position] for field in PANEL_FIELDS})
+                    )
+
+        histories: dict[str, pd.DataFrame] = {}
+        for code in codes:
+            pieces = parts.get(code)
+            if not pieces:
+                continue
+            dates = np.concatenate([piece_dates for piece_dates, _ in pieces])
+            data = {"stock_code": np.full(len(dates), code, dtype=object), "date": dates}
+            for field in PANEL_FIELDS:
+                data[field] = np.concatenate([piece_values[field] for _, piece_values in pieces])
+            histories[code] = pd.DataFrame(data, columns=STANDARD_COLUMNS)
+        return histories
+
+    def frames(self, start: np.datetime64, end: np.datetime64) -> dict[str, pd.DataFrame]:
+        codes = self.codes
+        touched = [(segment, *segment.rows(start, end)) for segment in self.segments]
+        touched = [(segment, lo, hi) for segment, lo, hi in touched if lo < hi]
+        dates = (
+            np.concatenate([segment.dates[lo:hi] for segment, lo, hi in touched])
+            if touched else np.array([], dtype="datetime64[D]")
+        )
+        present = np.zeros((len(dates), len(codes)), dtype=np.bool_)
+        values = {field: np.full((len(dates), len(codes)), np.nan) for field in PANEL_FIELDS}
+        row = 0
+        for segment, lo, hi in touched:
+            block = np.ix_(np.arange(row, row + hi - lo), np.searchsorted(codes, segment.codes.astype(str)))
+            present[block] = segment.present[lo:hi]
+            for field in PANEL_FIELDS:
+                values[field][block] = segment.fields[field][lo:hi]
+            row += hi - lo
+
+        index = pd.DatetimeIndex(dates.astype("datetime64[ns]"), name="date")
+        columns = pd.Index(codes, name="code")
+        frames = {"present": pd.DataFrame(present, index=index, columns=columns)}
+        for field in PANEL_FIELDS:
+            frames[field] = pd.DataFrame(values[field], index=index, columns=columns)
+        return frames
+
+
+class OHLCVPanelStore(MarketPanelStore):
+    """Directory of segmented OHLCV panels rebuilt incrementally from a repository."""
+
+    def __init__(self, panel_dir: str | Path, repository: DailyPanelRepository):
+        self.panel_dir = Path(panel_dir)
+        self.repository = repository
+        self._lock = threading.Lock()
+        self._panel: OHLCVPanel | None = None
+
+    def get_histories(
+        self,
+        codes: list[str] | None,
+        start_date: str,
+        end_date: str,
+    ) -> dict[str, pd.DataFrame] | None:
+        panel = self.open()
+        start, end = _to_day(start_date), _to_day(end_date)
+        if panel is None or not panel.covers(start, end):
+            return None
+        requested = [str(code) for code in panel.codes] if codes is None else list(dict.fromkeys(codes))
+        # Stale codes are left out so callers read them from the repository.
+        fresh = [code for code in requested if not panel.is_stale(code, start, end)]
+        return panel.histories(fresh, start, end)
+
+    def get_panel(self, start_date: str, end_date: str) -> dict[str, pd.DataFrame] | None:
+        panel = self.open()
+        start, end = _to_day(start_date), _to_day(end_date)
+        if panel is None or not panel.covers(start, end):
+            return None
+        if any(panel.is_stale(code, start, end) for code in panel.stale):
+            return None
+        return panel.frames(start, end)
+
+    def open(self) -> OHLCVPanel | None:
+        """Return the current panel, remapping only segments a swap has replaced."""
+        manifest = self._read_manifest()
+        with self._lock:
+            if manifest is None:
+                self._panel = None
+            elif self._panel is None or self._panel.version != manifest["version"]:
+                self._panel = self._load(manifest)
+            return self._panel
+
+    def refresh(self, start_date: str, end_date: str) -> None:
+        """Mirror ``[start_date, end_date]`` from the repository into a new version.
+
+        The reloaded range is widened to touch the existing coverage so it
+        stays contiguous, and to include the stale ranges recorded since the
+        last refresh.  Only segments overlapping the reloaded ranges are
+        rewritten.
+        """
+        with self._lock:
+            manifest = self._read_manifest()
+            panel = self._load(manifest) if manifest else None
+            segments = panel.segments if panel is not None else []
+            start, end = _to_day(start_date), _to_day(end_date)
+            spans = [(start, end)]
+            if segments:
+                first, last = segments[0].window[0], segments[-1].window[1]
+                spans = [(min(start, last + ONE_DAY), max(end, first - ONE_DAY))]
+                spans += list(panel.stale.values())
+
+            # Rewritten segments are reloaded whole, which may join spans.
+            spans = _merge_spans(spans)
+            while True:
+                overlapping = [
+                    segment for segment in segments
+                    if any(segment.window[0] <= span_end and span_start <= segment.window[1] for span_start, span_end in spans)
+                ]
+                widened = _merge_spans(spans + [(segment.window[0], segment.window[1]) for segment in overlapping])
+                if widened == spans:
+                    break
+                spans = widened
+
+            rewritten = {segment.name for segment in overlapping}
+            kept = [segment for segment in segments if segment.name not in rewritten]
+            written: list[PanelSegment] = []
+            for span_start, span_end in spans:
+                # Consecutive windows meet, so together they tile the span.
+                window_start = span_start
+                while window_start <= span_end:
+                    window_end = min(window_start + (SEGMENT_DAYS - 1) * ONE_DAY, span_end)
+                    written.append(self._write_segment(window_start, window_end))
+                    window_start = window_end + ONE_DAY
+
+            segments = sorted(kept + written, key=lambda segment: segment.window[0])
+            version = self._swap_current([segment.name for segment in segments], {})
+            logger.info(
+                "行情面板已刷新: version=%s spans=%s rewritten=%s reused=%s",
+                version,
+                [(str(span_start), str(span_end)) for span_start, span_end in spans],
+                len(written),
+                len(kept),
+            )
+
+    def invalidate(self, codes: list[str], start_date: str, end_date: str) -> None:
+        """Mark ``codes`` stale over ``[start_date, end_date]`` until the next refresh."""
+        with self._lock:
+            manifest = self._read_manifest()
+            if manifest is None:
+                return
+            panel = self._load(manifest)
+            if not panel.segments:
+                return
+            start = max(_to_day(start_date), panel.segments[0].window[0])
+            end = min(_to_day(end_date), panel.segments[-1].window[1])
+            if start > end:
+                return
+
+            stale = dict(panel.stale)
+            for code in codes:
+                previous = stale.get(str(code))
+                stale[str(code)] = (min(start, previous[0]), max(end, previous[1])) if previous else (start, end)
+            version = self._swap_current([segment.name for segment in panel.segments], stale)
+            logger.info("行情面板已标记过期: version=%s codes=%s start=%s end=%s", version, len(codes), start, end)
+
+    def _write_segment(self, start: np.datetime64, end: np.datetime64) -> PanelSegment:
+        panel = self.repository.get_daily_panel(
+            pd.Timestamp(start).strftime("%Y%m%d"),
+            pd.Timestamp(end).strftime("%Y%m%d"),
+        )
+        present = panel["present"]
+
+        segment_name = f"s{uuid4().hex}"
+        target = self.panel_dir / segment_name
+        target.mkdir(parents=True)
+        np.save(target / "dates.npy", present.index.to_numpy(dtype="datetime64[D]"))
+        np.save(target / "codes.npy", present.columns.astype(str).to_numpy(dtype=str))
+        np.save(target / "window.npy", np.array([start, end], dtype="datetime64[D]"))
+        np.save(target / "present.npy", present.to_numpy(dtype=np.bool_))
+        for field in PANEL_FIELDS:
+            np.save(target / f"{field}.npy", panel[field].to_numpy(dtype=np.float64))
+        return self._load_segment(segment_name)
+
+    def _swap_current(self, segments: list[str], stale: dict[str, tuple[np.datetime64, np.datetime64]]) -> str:
+        version = f"v{uuid4().hex}"
+        manifest = {
+            "version": version,
+            "segments": segments,
+            "stale": {code: [str(start), str(end)] for code, (start, end) in stale.items()},
+        }
+        pointer = self.panel_dir / "CURRENT"
+        staged = self.panel_dir / f"CURRENT.{version}"
+        self.panel_dir.mkdir(parents=True, exist_ok=True)
+        staged.write_text(json.dumps(manifest), encoding="utf-8")
+        os.replace(staged, pointer)
+        referenced = set(segments)
+        for path in self.panel_dir.iterdir():
+            if path.is_dir() and path.name not in referenced:
+                # Open mappings stay valid on POSIX; elsewhere the unreferenced
+                # segment is retried on the next swap.
+                shutil.rmtree(path, ignore_errors=True)
+        return version
+
+    def _read_manifest(self) -> dict | None:
+        pointer = self.panel_dir / "CURRENT"
+        if not pointer.exists():
+            return None
+        try:
+            manifest = json.loads(pointer.read_text(encoding="utf-8"))
+        except ValueError:
+            # Panels written before segmentation are rebuilt by the next refresh.
+            return None
+        return manifest if isinstance(manifest, dict) else None
+
+    def _load(self, manifest: dict) -> OHLCVPanel:
+        reused = {segment.name: segment for segment in self._panel.segments} if self._panel is not None else {}
+        return OHLCVPanel(
+            version=manifest["version"],
+            segments=[reused.get(name) or self._load_segment(name) for name in manifest["segments"]],
+            stale={
+                code: (np.datetime64(start, "D"), np.datetime64(end, "D"))
+                for code, (start, end) in manifest.get("stale", {}).items()
+            },
+        )
+
+    def _load_segment(self, name: str) -> PanelSegment:
+        source = self.panel_dir / name
+        return PanelSegment(
+            name=name,
+            dates=np.load(source / "dates.npy"),
+            codes=np.load(source / "codes.npy"),
+            window=np.load(source / "window.npy"),
+            fields={field: np.load(source / f"{field}.npy", mmap_mode="r") for field in PANEL_FIELDS},
+            present=np.load(source / "present.npy", mmap_mode="r"),
+        )
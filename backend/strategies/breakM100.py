@@ -1,10 +1,16 @@
 ﻿from .base_strategy import BaseStrategy
+from backend.domain.strategy import StrategyContext
 import pandas as pd
 
 
 class BreakM100(BaseStrategy):
     """突破M100日线"""
 
+    indicators = ('ma100',)
+    min_history = 101
+    lookback = 101
+    window_bounded = True
+
     def __init__(self):
         super().__init__('突破M100日线')
 
@@ -19,7 +25,7 @@ class BreakM100(BaseStrategy):
                 "volume"
             ]]
     """
-    def check(self, hist_data: pd.DataFrame) -> bool:
+    def check(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> bool:
         """
         判断股票是否首次突破 M100 日线（100日均线）
         条件：
@@ -29,16 +35,20 @@ class BreakM100(BaseStrategy):
         if len(hist_data) < 101:
             return False
 
-        # 计算100日均线
-        hist_data['ma100'] = hist_data['close'].rolling(window=100).mean()
-
-        # 获取当日和前一日数据
-        today = hist_data.iloc[-1]
-        yesterday = hist_data.iloc[-2]
+        # 100日均线取自共享上下文，不写回 hist_data
+        context = context or StrategyContext(hist_data)
+        close = context.array('close')
+        ma100 = context.indicator('ma100')
 
         # 判断是否为首次突破 M100
-        if today['close'] > today['ma100'] and yesterday['close'] <= yesterday['ma100']:
+        if close[-1] > ma100.iloc[-1] and close[-2] <= ma100.iloc[-2]:
             return True
 
         return False
 
+    def check_series(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> pd.Series:
+        context = context or StrategyContext(hist_data)
+        close = hist_data['close']
+        ma100 = context.indicator('ma100')
+        enough = pd.Series(range(len(hist_data)), index=hist_data.index) >= 100
+        return enough & (close > ma100) & (close.shift(1) <= ma100.shift(1))
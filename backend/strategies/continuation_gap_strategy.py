@@ -5,6 +5,12 @@ import pandas as pd
 class ContinuationGapStrategy(BaseStrategy):
     """持续缺口策略"""
 
+    min_history = 2
+    lookback = 60  # 成交量均值取当日之前 59 个交易日，与扫描读取的窗口长度无关
+    window_bounded = True
+    # 跳空高开 ≥ 20%，阈值略放宽以免浮点误差漏掉边界
+    prefilter_sql = "open >= LAG(close) OVER w * 1.199"
+
     def __init__(self):
         """
         初始化策略
@@ -26,8 +32,25 @@ class ContinuationGapStrategy(BaseStrategy):
         not_filled = today['low'] > yesterday['close']
 
         # 成交量判断（可选）
-        recent_volume_mean = hist_data['volume'].iloc[:-1].mean()
+        recent_volume_mean = hist_data['volume'].iloc[-self.lookback:-1].mean()
         sufficient_volume = today['volume'] > recent_volume_mean * 2
 
         return is_gap_up and not_filled and sufficient_volume
 
+    def check_series(self, hist_data: pd.DataFrame) -> pd.Series:
+        return self._signals(hist_data)
+
+    def check_panel(self, panel: dict[str, pd.DataFrame]) -> pd.DataFrame:
+        return self._signals(panel)
+
+    @classmethod
+    def _signals(cls, bars):
+        """bars 为单只股票的 DataFrame 或全市场宽表映射，两者按列计算结果一致。"""
+        open_, close, low, volume = bars['open'], bars['close'], bars['low'], bars['volume']
+        yesterday_close = close.shift(1)
+        is_gap_up = (open_ - yesterday_close) / yesterday_close >= 0.2
+        not_filled = low > yesterday_close
+        # 当日之前 lookback - 1 个交易日的平均成交量
+        recent_volume_mean = volume.rolling(cls.lookback - 1, min_periods=1).mean().shift(1)
+        sufficient_volume = volume > recent_volume_mean * 2
+        return is_gap_up & not_filled & sufficient_volume
@@ -1,4 +1,5 @@
 ﻿from .base_strategy import BaseStrategy
+from backend.domain.strategy import StrategyContext
 import pandas as pd
 
 
@@ -18,40 +19,50 @@ class DualMATrendStrategy(BaseStrategy):
     初始止损: 入场当日最低价下方1%
     """
 
+    indicators = ('ma100', 'vol_ma20')
+    min_history = 101
+    lookback = 101
+    window_bounded = True
+
     def __init__(self):
         super().__init__('双均线趋势策略')
 
-    def check(self, hist_data: pd.DataFrame) -> bool:
+    def check(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> bool:
         """检查是否符合双均线趋势策略的买入条件"""
         if len(hist_data) < 101:  # 需要至少101天数据计算MA100
             return False
 
-        # 计算均线
-        hist_data = hist_data.copy()
-        hist_data['ma100'] = hist_data['close'].rolling(window=100).mean()
-        hist_data['ma60'] = hist_data['close'].rolling(window=60).mean()
-        hist_data['ma20'] = hist_data['close'].rolling(window=20).mean()
-        hist_data['vol_ma20'] = hist_data['volume'].rolling(window=20).mean()
-
-        today = hist_data.iloc[-1]
-        yesterday = hist_data.iloc[-2]
+        # 均线由上下文按需计算并缓存，不再复制整张行情表
+        context = context or StrategyContext(hist_data)
+        close = context.array('close')
+        ma100 = context.indicator('ma100')
 
         # 检查是否为首次突破MA100
         # 今日收盘价 > MA100 且 昨日收盘价 <= 昨日MA100
-        if pd.isna(today['ma100']) or pd.isna(yesterday['ma100']):
+        if pd.isna(ma100.iloc[-1]) or pd.isna(ma100.iloc[-2]):
             return False
 
-        breakout_ma100 = (today['close'] > today['ma100'] and 
-                         yesterday['close'] <= yesterday['ma100'])
+        breakout_ma100 = (close[-1] > ma100.iloc[-1] and
+                         close[-2] <= ma100.iloc[-2])
 
         if not breakout_ma100:
             return False
 
         # 检查成交量是否大于20日均量
-        if pd.isna(today['vol_ma20']) or today['vol_ma20'] == 0:
+        vol_ma20 = context.indicator('vol_ma20').iloc[-1]
+        if pd.isna(vol_ma20) or vol_ma20 == 0:
             return False
 
-        volume_condition = today['volume'] > today['vol_ma20']
+        volume_condition = context.array('volume')[-1] > vol_ma20
 
         return breakout_ma100 and volume_condition
 
+    def check_series(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> pd.Series:
+        context = context or StrategyContext(hist_data)
+        close, volume = hist_data['close'], hist_data['volume']
+        ma100 = context.indicator('ma100')
+        vol_ma20 = context.indicator('vol_ma20')
+        enough = pd.Series(range(len(hist_data)), index=hist_data.index) >= 100
+        breakout_ma100 = (close > ma100) & (close.shift(1) <= ma100.shift(1))
+        volume_condition = vol_ma20.notna() & (vol_ma20 != 0) & (volume > vol_ma20)
+        return enough & breakout_ma100 & volume_condition
@@ -1,4 +1,6 @@
 ﻿from .base_strategy import BaseStrategy
+from backend.domain.indicators import precomputed_or_rolling
+from backend.domain.strategy import StrategyContext
 import pandas as pd
 
 
@@ -23,10 +25,16 @@ class GapBreakoutStrategy(BaseStrategy):
     止损设置: 缺口上沿价格下方0.5%
     """
 
+    indicators = ('vol_ma20', 'ma100')
+    min_history = 61
+    lookback = 100  # MA100 阻力需要 100 根K线
+    window_bounded = True
+    prefilter_sql = "low > LAG(high) OVER w"
+
     def __init__(self):
         super().__init__('向上突破缺口追涨')
 
-    def check(self, hist_data: pd.DataFrame) -> bool:
+    def check(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> bool:
         """检查是否符合向上突破缺口追涨策略"""
         if len(hist_data) < 61:  # 需要至少61天数据
             return False
@@ -49,7 +57,8 @@ class GapBreakoutStrategy(BaseStrategy):
             return False
 
         # 条件3: 成交量 > 20日均量的1.5倍
-        vol_ma20 = hist_data['volume'].rolling(window=20).mean().iloc[-2]  # 使用昨日的20日均量
+        context = context or StrategyContext(hist_data)
+        vol_ma20 = context.indicator('vol_ma20').iloc[-2]  # 使用昨日的20日均量
         if pd.isna(vol_ma20) or vol_ma20 == 0:
             return False
         
@@ -63,7 +72,7 @@ class GapBreakoutStrategy(BaseStrategy):
         prev_60_days_high = hist_data['high'].iloc[-61:-1].max()
         
         # 或者突破MA100
-        ma100 = hist_data['close'].rolling(window=100).mean().iloc[-1]
+        ma100 = context.indicator('ma100').iloc[-1]
         
         # 今日收盘价突破任一阻力位
         breakout_resistance = (today['close'] > prev_60_days_high or 
@@ -71,3 +80,24 @@ class GapBreakoutStrategy(BaseStrategy):
 
         return breakout_resistance
 
+    def check_series(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> pd.Series:
+        context = context or StrategyContext(hist_data)
+        position = pd.Series(range(len(hist_data)), index=hist_data.index)
+        return self._signals(hist_data, position, context.indicator)
+
+    def check_panel(self, panel: dict[str, pd.DataFrame]) -> pd.DataFrame:
+        return self._signals(panel, panel['position'], lambda name: precomputed_or_rolling(panel, name))
+
+    @staticmethod
+    def _signals(bars, position, indicator):
+        """bars 为单只股票的 DataFrame 或全市场宽表映射，两者按列计算结果一致。"""
+        close, high, low, volume = bars['close'], bars['high'], bars['low'], bars['volume']
+        yesterday_high = high.shift(1)
+        gap_exists = low > yesterday_high
+        gap_ratio = (low - yesterday_high) / yesterday_high
+        vol_ma20 = indicator('vol_ma20').shift(1)
+        volume_condition = vol_ma20.notna() & (vol_ma20 != 0) & (volume > vol_ma20 * 1.5)
+        prev_60_days_high = high.shift(1).rolling(window=60, min_periods=1).max()
+        ma100 = indicator('ma100')
+        breakout_resistance = (close > prev_60_days_high) | (ma100.notna() & (close > ma100))
+        return (position >= 60) & gap_exists & ~(gap_ratio < 0.01) & volume_condition & breakout_resistance
@@ -1,4 +1,6 @@
 ﻿from .base_strategy import BaseStrategy
+from backend.domain.strategy import StrategyContext
+import numpy as np
 import pandas as pd
 
 
@@ -19,14 +21,20 @@ class GapPullbackStrategy(BaseStrategy):
     止损设置: 缺口上沿下方1%
     """
 
+    indicators = ('ma100', 'vol_ma20')
+    min_history = 40
+    lookback = 121  # 缺口可在 20 日前，其突破判断还要读取缺口前一日的 MA100
+    window_bounded = True
+
     def __init__(self):
         super().__init__('缺口回踩支撑买入')
 
-    def _find_recent_gap(self, hist_data, lookback=20):
+    def _find_recent_gap(self, hist_data, lookback=20, context=None):
         """寻找最近20日内的向上突破缺口"""
         if len(hist_data) < lookback + 1:
             return None
 
+        ma100_series = (context or StrategyContext(hist_data)).indicator('ma100')
         for i in range(len(hist_data) - lookback, len(hist_data)):
             if i == 0:
                 continue
@@ -43,7 +51,7 @@ class GapPullbackStrategy(BaseStrategy):
                     # 检查是否突破阻力位(前60日高点或MA100)
                     if i >= 60:
                         prev_60_high = hist_data['high'].iloc[i-61:i-1].max()
-                        ma100 = hist_data['close'].iloc[:i].rolling(window=100).mean().iloc[-1]
+                        ma100 = ma100_series.iloc[i - 1]
                         
                         breakout = (today['close'] > prev_60_high or 
                                    (not pd.isna(ma100) and today['close'] > ma100))
@@ -57,13 +65,14 @@ class GapPullbackStrategy(BaseStrategy):
 
         return None
 
-    def check(self, hist_data: pd.DataFrame) -> bool:
+    def check(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> bool:
         """检查是否符合缺口回踩支撑买入策略"""
         if len(hist_data) < 40:  # 需要足够数据
             return False
 
         # 步骤1: 寻找最近的突破缺口
-        recent_gap = self._find_recent_gap(hist_data, lookback=20)
+        context = context or StrategyContext(hist_data)
+        recent_gap = self._find_recent_gap(hist_data, lookback=20, context=context)
         
         if recent_gap is None:
             return False
@@ -100,7 +109,7 @@ class GapPullbackStrategy(BaseStrategy):
             return False
 
         # 步骤4: 检查回落过程中成交量是否萎缩
-        vol_ma20_before = hist_data['volume'].rolling(window=20).mean().iloc[-2]
+        vol_ma20_before = context.indicator('vol_ma20').iloc[-2]
         if pd.isna(vol_ma20_before) or vol_ma20_before == 0:
             return False
 
@@ -121,3 +130,68 @@ class GapPullbackStrategy(BaseStrategy):
 
         return volume_condition
 
+    def check_series(
+        self,
+        hist_data: pd.DataFrame,
+        lookback: int = 20,
+        context: StrategyContext | None = None,
+    ) -> pd.Series:
+        context = context or StrategyContext(hist_data)
+        opens = context.array('open')
+        closes = context.array('close')
+        highs = context.array('high')
+        lows = context.array('low')
+        volumes = context.array('volume')
+        n = len(hist_data)
+        hits = np.zeros(n, dtype=bool)
+        if n < 40:
+            return pd.Series(hits, index=hist_data.index)
+
+        # 每个交易日是否为符合 ST-04 的突破缺口（与 _find_recent_gap 的判定相同）
+        high = pd.Series(highs, index=hist_data.index)
+        yesterday_high = high.shift(1).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            gap_ratio = (lows - yesterday_high) / yesterday_high
+        # _find_recent_gap 取 iloc[i-61:i-1]；i == 60 时起点为 -1，切片为空
+        prev_60_high = high.shift(2).rolling(window=60, min_periods=1).max().to_numpy()
+        prev_60_high[:61] = np.nan
+        ma100 = context.indicator('ma100').shift(1).to_numpy()
+        positions = np.arange(n)
+        is_gap = (
+            (lows > yesterday_high)
+            & (gap_ratio >= 0.01)
+            & (positions >= 60)
+            & ((closes > prev_60_high) | (~np.isnan(ma100) & (closes > ma100)))
+        )
+
+        # 今日本身的条件先向量化过滤，剩余少数日期再定位缺口后的高点
+        vol_ma20_before = context.indicator('vol_ma20').shift(1).to_numpy()
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_ratio = (closes - opens) / opens
+        candidates = (
+            (positions >= 39)
+            & ~np.isnan(vol_ma20_before) & (vol_ma20_before != 0)
+            & (closes > opens) & ~(change_ratio < 0.02)
+            & (volumes > vol_ma20_before)
+        )
+
+        gap_positions = np.flatnonzero(is_gap)
+        first_gap = np.searchsorted(gap_positions, np.maximum(positions - lookback + 1, 1))
+        for today_idx in np.flatnonzero(candidates):
+            k = first_gap[today_idx]
+            if k >= len(gap_positions) or gap_positions[k] >= today_idx:
+                continue
+            gap_date_idx = gap_positions[k]
+            after_gap = highs[gap_date_idx:today_idx + 1]
+            if np.isnan(after_gap).all():
+                continue
+            peak_idx = gap_date_idx + int(np.nanargmax(after_gap))
+            if today_idx - peak_idx + 1 < 3:
+                continue
+            gap_top = highs[gap_date_idx - 1]
+            tolerance = gap_top * 0.01
+            hits[today_idx] = (
+                abs(lows[today_idx] - gap_top) <= tolerance
+                or abs(closes[today_idx] - gap_top) <= tolerance
+            )
+        return pd.Series(hits, index=hist_data.index)
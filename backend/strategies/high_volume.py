@@ -5,6 +5,13 @@ import pandas as pd
 class HighVolumeStrategy(BaseStrategy):
     """高成交量突破策略"""
 
+    min_history = 30
+    lookback = 30
+    window_bounded = True
+    # 成交量 > 前 15 日最大量的 3 倍；窗口不足 15 日时最大量只会偏小，仍是必要条件
+    prefilter_sql = "volume > 3 * max(volume) OVER (w ROWS BETWEEN 15 PRECEDING AND 1 PRECEDING)"
+    prefilter_lookback = 16
+
     def __init__(self):
         super().__init__('高成交量成交')
 
@@ -47,3 +54,16 @@ class HighVolumeStrategy(BaseStrategy):
 
         return True
 
+    def check_series(self, hist_data: pd.DataFrame) -> pd.Series:
+        position = pd.Series(range(len(hist_data)), index=hist_data.index)
+        return self._signals(hist_data, position)
+
+    def check_panel(self, panel: dict[str, pd.DataFrame]) -> pd.DataFrame:
+        return self._signals(panel, panel['position'])
+
+    @staticmethod
+    def _signals(bars, position):
+        """bars 为单只股票的 DataFrame 或全市场宽表映射，两者按列计算结果一致。"""
+        volume = bars['volume']
+        max_vol_recent_15 = volume.shift(1).rolling(window=15, min_periods=1).max()
+        return (position >= 29) & ~(volume <= max_vol_recent_15 * 3)
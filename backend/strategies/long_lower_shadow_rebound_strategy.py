@@ -5,6 +5,10 @@ import pandas as pd
 class LongLowerShadowReboundStrategy(BaseStrategy):
     """长下阴线反弹策略"""
 
+    min_history = 1
+    lookback = 1
+    window_bounded = True
+
     def __init__(self):
         super().__init__('长下阴线反弹')
 
@@ -23,3 +27,5 @@ class LongLowerShadowReboundStrategy(BaseStrategy):
         rebound = (today['close'] - today['low']) / today['low'] > 0.04
         return is_long_lower_shadow and rebound
 
+    def check_series(self, hist_data: pd.DataFrame) -> pd.Series:
+        return pd.Series(False, index=hist_data.index)
@@ -17,6 +17,10 @@ class Low123BreakoutStrategy(BaseStrategy):
     止损设置: 初始止损设于低点3下方1%
     """
 
+    min_history = 60
+    lookback = 60
+    window_bounded = True
+
     def __init__(self):
         super().__init__('低位123结构突破')
 
@@ -80,3 +84,49 @@ class Low123BreakoutStrategy(BaseStrategy):
 
         return True
 
+    def check_series(self, hist_data: pd.DataFrame) -> pd.Series:
+        closes = hist_data['close'].to_numpy(dtype=float)
+        lows = hist_data['low'].to_numpy(dtype=float)
+        highs = hist_data['high'].to_numpy(dtype=float)
+        n = len(hist_data)
+        hits = np.zeros(n, dtype=bool)
+        if n < 60:
+            return pd.Series(hits, index=hist_data.index)
+
+        # 三个点都落在最近20日窗口内：每行一个窗口，窗口内的列号即相对位置
+        window = 20
+        today = np.arange(window - 1, n)
+        low_windows = np.lib.stride_tricks.sliding_window_view(lows, window)
+        high_windows = np.lib.stride_tricks.sliding_window_view(highs, window)
+        columns = np.arange(window)
+        rows = np.arange(len(today))
+
+        low1_col = np.argmin(low_windows, axis=1)
+        low1_price = low_windows[rows, low1_col]
+
+        # 低点1之后（不含）区间内的最高点；区间外填 -inf 不影响 argmax 对 NaN 的处理
+        after_low1 = np.where(columns > low1_col[:, None], high_windows, -np.inf)
+        high2_col = np.argmax(after_low1, axis=1)
+        high2_price = high_windows[rows, high2_col]
+
+        after_high2 = np.where(columns > high2_col[:, None], low_windows, np.inf)
+        low3_col = np.argmin(after_high2, axis=1)
+        low3_price = low_windows[rows, low3_col]
+
+        last_col = window - 1
+        with np.errstate(divide='ignore', invalid='ignore'):
+            rebound_ratio = (high2_price - low1_price) / low1_price
+            breakout_ratio = (closes[today] - high2_price) / high2_price
+        after_low3_days = last_col - low3_col
+        # 低点3是其后区间的最小值，check() 中"未创新低"的判断恒成立，这里省略
+        matched = (
+            (today >= 59)
+            & (last_col - low1_col >= 5)
+            & ~(rebound_ratio <= 0.05)
+            & (last_col - high2_col >= 3)
+            & ~(low3_price <= low1_price)
+            & (after_low3_days >= 1) & (after_low3_days <= 10)
+            & ~(breakout_ratio < 0.01)
+        )
+        hits[today] = matched
+        return pd.Series(hits, index=hist_data.index)
@@ -20,6 +20,10 @@ class MACDDivergenceBreakoutStrategy(BaseStrategy):
     止损设置: 初始止损设于低点B下方2%
     """
 
+    indicators = ('diff',)
+    min_history = 80
+    lookback = 120  # EMA 需要额外的预热数据
+
     def __init__(self):
         super().__init__('MACD底背离双突破')
 
@@ -62,10 +66,11 @@ class MACDDivergenceBreakoutStrategy(BaseStrategy):
 
         closes = hist_data['close']
         
-        # 计算MACD
-        diff, dea, macd = self._calculate_macd(closes)
+        # 计算MACD: 优先使用按全历史延续的预计算DIFF
         hist_data = hist_data.copy()
-        hist_data['diff'] = diff.values
+        if 'diff' not in hist_data.columns or hist_data['diff'].isna().any():
+            diff, dea, macd = self._calculate_macd(closes)
+            hist_data['diff'] = diff.values
 
         # 寻找60日内的显著低点
         significant_lows = self._find_significant_lows(hist_data, lookback=60)
@@ -108,3 +113,53 @@ class MACDDivergenceBreakoutStrategy(BaseStrategy):
 
         return True
 
+    def check_series(self, hist_data: pd.DataFrame, lookback: int = 60) -> pd.Series:
+        closes = hist_data['close'].to_numpy(dtype=float)
+        lows = hist_data['low'].to_numpy(dtype=float)
+        highs = hist_data['high'].to_numpy(dtype=float)
+        n = len(hist_data)
+        hits = np.zeros(n, dtype=bool)
+        if n < 80:
+            return pd.Series(hits, index=hist_data.index)
+
+        # check() 只在截至当日的预计算DIFF完整时使用它，否则在当前窗口上重算
+        computed_diff = self._calculate_macd(hist_data['close'])[0].to_numpy(dtype=float)
+        first_missing = n
+        if 'diff' in hist_data.columns:
+            stored_diff = hist_data['diff'].to_numpy(dtype=float)
+            missing = np.flatnonzero(np.isnan(stored_diff))
+            first_missing = int(missing[0]) if len(missing) else n
+        else:
+            stored_diff = computed_diff
+
+        # 局部低点只取决于前后各3天，可对全序列一次判定
+        is_local_low = np.zeros(n, dtype=bool)
+        center = lows[3:n - 3]
+        is_local_low[3:n - 3] = np.logical_and.reduce([
+            center < lows[3 - offset:n - 3 - offset] for offset in (1, 2, 3)
+        ] + [
+            center < lows[3 + offset:n - 3 + offset] for offset in (1, 2, 3)
+        ])
+        low_positions = np.flatnonzero(is_local_low)
+
+        for today_idx in range(79, n):
+            window_start = today_idx - lookback + 1
+            # _find_significant_lows 在60日窗口内取第3至倒数第4行
+            b = np.searchsorted(low_positions, today_idx - 3, side='right') - 1
+            if b < 1 or low_positions[b - 1] < window_start + 3:
+                continue
+            low_a, low_b = low_positions[b - 1], low_positions[b]
+            if lows[low_b] >= lows[low_a]:
+                continue
+
+            # 与 check() 一致：DIFF 与阻力区间按窗口内的相对位置在整段数据上取值
+            idx_a, idx_b = low_a - window_start, low_b - window_start
+            diff_values = stored_diff if today_idx < first_missing else computed_diff
+            if diff_values[idx_b] < diff_values[idx_a] * 0.97:
+                continue
+
+            after_low_b = highs[idx_b:today_idx + 1]
+            resistance_level = np.nan if np.isnan(after_low_b).all() else np.nanmax(after_low_b)
+            breakout_ratio = (closes[today_idx] - resistance_level) / resistance_level
+            hits[today_idx] = not breakout_ratio < 0.01
+        return pd.Series(hits, index=hist_data.index)
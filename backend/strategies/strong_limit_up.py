@@ -1,4 +1,6 @@
 ﻿from .base_strategy import BaseStrategy
+from backend.domain.strategy import StrategyContext
+import numpy as np
 import pandas as pd
 
 
@@ -22,10 +24,17 @@ class StrongLimitUpBreakoutStrategy(BaseStrategy):
     止损设置: 涨停阳线实体的中位价格
     """
 
+    indicators = ('vol_ma20',)
+    min_history = 61
+    lookback = 61
+    window_bounded = True
+    # 涨幅 ≥ 9.8%，阈值略放宽以免浮点误差漏掉边界
+    prefilter_sql = "close >= LAG(close) OVER w * 1.0979"
+
     def __init__(self):
         super().__init__('强势涨停突破')
 
-    def check(self, hist_data: pd.DataFrame) -> bool:
+    def check(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> bool:
         """检查是否符合强势涨停突破策略"""
         if len(hist_data) < 61:  # 需要至少61天数据
             return False
@@ -74,7 +83,8 @@ class StrongLimitUpBreakoutStrategy(BaseStrategy):
                     return False
 
         # 步骤4: 成交量合理性检查(避免异常放量)
-        vol_ma20 = hist_data['volume'].rolling(window=20).mean().iloc[-2]
+        context = context or StrategyContext(hist_data)
+        vol_ma20 = context.indicator('vol_ma20').iloc[-2]
         if pd.notna(vol_ma20) and vol_ma20 > 0:
             # 今日成交量应该在合理范围内(不超过20日均量的10倍)
             if today['volume'] > vol_ma20 * 10:
@@ -82,3 +92,23 @@ class StrongLimitUpBreakoutStrategy(BaseStrategy):
 
         return True
 
+    def check_series(self, hist_data: pd.DataFrame, context: StrategyContext | None = None) -> pd.Series:
+        context = context or StrategyContext(hist_data)
+        close, high, volume = hist_data['close'], hist_data['high'], hist_data['volume']
+        yesterday_close = close.shift(1)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            change_ratio = (close - yesterday_close) / yesterday_close
+            close_is_high = (close - high).abs() / high < 0.001
+        is_limit_up = (yesterday_close != 0) & (change_ratio >= 0.098)
+        prev_60_days_high = high.shift(1).rolling(window=60, min_periods=1).max()
+        breakout_condition = high > prev_60_days_high
+
+        hits = is_limit_up & close_is_high & breakout_condition
+        if 'turnover' in hist_data.columns:
+            turnover = hist_data['turnover']
+            hits &= ~(turnover.notna() & ((turnover < 3) | (turnover > 20)))
+
+        vol_ma20 = context.indicator('vol_ma20').shift(1)
+        hits &= ~(vol_ma20.notna() & (vol_ma20 > 0) & (volume > vol_ma20 * 10))
+        enough = pd.Series(range(len(hist_data)), index=hist_data.index) >= 60
+        return enough & hits
@@ -5,6 +5,10 @@ import pandas as pd
 class ThreeRisingPatternStrategy(BaseStrategy):
     """连续三日上涨策略"""
 
+    min_history = 3
+    lookback = 3
+    window_bounded = True
+
     def __init__(self):
         super().__init__('连续三日上涨')
 
@@ -21,3 +25,5 @@ class ThreeRisingPatternStrategy(BaseStrategy):
         close_prices = recent_data['open'].values
         return all(close_prices[i] > close_prices[i - 1] for i in range(1, 3))
 
+    def check_series(self, hist_data: pd.DataFrame) -> pd.Series:
+        return pd.Series(False, index=hist_data.index)
@@ -5,6 +5,10 @@ import pandas as pd
 class TwoDayUpStrategy(BaseStrategy):
     """高成交量突破策略"""
 
+    min_history = 30
+    lookback = 30
+    window_bounded = True
+
     def __init__(self):
         super().__init__('连续两天上涨')
 
@@ -42,3 +46,13 @@ class TwoDayUpStrategy(BaseStrategy):
 
         return True
 
+    def check_series(self, hist_data: pd.DataFrame) -> pd.Series:
+        close, open_ = hist_data['close'], hist_data['open']
+        pre_close, pre_close_02, pre_open_02 = close.shift(1), close.shift(2), open_.shift(2)
+        # min() 遇到 NaN 时保留第一个参数，与 check() 中的内置 min 一致
+        today_base = pre_close.where(~(open_ < pre_close), open_)
+        pre_day_base = pre_close_02.where(~(open_ < pre_close_02), open_)
+        today_change_percent = (close - today_base) / pre_close * 100
+        pre_day_change_percent = (pre_close - pre_day_base) / pre_open_02 * 100
+        enough = pd.Series(range(len(hist_data)), index=hist_data.index) >= 29
+        return enough & ~(today_change_percent <= 9) & ~(pre_day_change_percent <= 9)
@@ -1,6 +1,7 @@
 let equityChart = null;
 let backtestHistory = [];
 let syncPollTimer = null;
+let syncEventSource = null;
 let enabledScanStrategies = [];
 
 let API_BASE_URL = resolveApiBaseUrl();
@@ -102,7 +103,7 @@ async function submitManualSync() {
         });
         setSyncJob(job);
         await loadSyncJobs();
-        pollSyncJob(job.job_id);
+        watchSyncJob(job.job_id);
     } catch (error) {
         alert(`同步任务提交失败: ${error.message}`);
     } finally {
@@ -177,7 +178,7 @@ async function runScheduleNow() {
         const job = await apiFetch('/sync-schedules/default/run', { method: 'POST' });
         setSyncJob(job);
         await loadSyncJobs();
-        pollSyncJob(job.job_id);
+        watchSyncJob(job.job_id);
         await loadSyncSchedule();
     } catch (error) {
         alert(`立即同步失败: ${error.message}`);
@@ -186,37 +187,90 @@ async function runScheduleNow() {
     }
 }
 
-function pollSyncJob(jobId) {
-    if (syncPollTimer) {
-        clearInterval(syncPollTimer);
+function watchSyncJob(jobId) {
+    stopSyncWatch();
+    if (typeof EventSource === 'undefined') {
+        pollSyncJob(jobId);
+        return;
     }
+    const source = new EventSource(`${API_BASE_URL}/jobs/${encodeURIComponent(jobId)}/events`);
+    let latestJob = null;
+    syncEventSource = source;
+    source.addEventListener('status', async event => {
+        latestJob = JSON.parse(event.data);
+        setSyncJob(latestJob);
+        if (isJobFinished(latestJob)) {
+            stopSyncWatch();
+            await onSyncJobFinished(jobId);
+        }
+    });
+    source.addEventListener('progress', event => {
+        if (latestJob) {
+            latestJob = { ...latestJob, progress: JSON.parse(event.data).progress };
+            setSyncJob(latestJob);
+        }
+    });
+    source.onerror = () => {
+        // 事件流不可用（旧服务或代理不支持）时回退为轮询
+        if (syncEventSource === source) {
+            stopSyncWatch();
+            pollSyncJob(jobId);
+        }
+    };
+}
+
+function pollSyncJob(jobId) {
+    stopSyncWatch();
     syncPollTimer = setInterval(async () => {
         try {
             const job = await apiFetch(`/jobs/${jobId}`);
             setSyncJob(job);
-            if (job.status === 'completed' || job.status === 'failed') {
-                clearInterval(syncPollTimer);
-                syncPollTimer = null;
-                await loadSyncResults(jobId);
-                await loadSyncSchedule();
-                await loadSyncJobs();
+            if (isJobFinished(job)) {
+                stopSyncWatch();
+                await onSyncJobFinished(jobId);
             }
         } catch (error) {
-            clearInterval(syncPollTimer);
-            syncPollTimer = null;
+            stopSyncWatch();
             document.getElementById('sync-job-error').textContent = error.message;
         }
     }, 1000);
 }
 
+function stopSyncWatch() {
+    if (syncEventSource) {
+        syncEventSource.close();
+        syncEventSource = null;
+    }
+    if (syncPollTimer) {
+        clearInterval(syncPollTimer);
+        syncPollTimer = null;
+    }
+}
+
+function isJobFinished(job) {
+    return job.status === 'completed' || job.status === 'failed';
+}
+
+async function onSyncJobFinished(jobId) {
+    await loadSyncResults(jobId);
+    await loadSyncSchedule();
+    await loadSyncJobs();
+}
+
 function setSyncJob(job) {
     document.getElementById('sync-job-id').textContent = job.job_id || '--';
     document.getElementById('sync-job-status').innerHTML = renderStatus(job.status);
-    document.getElementById('sync-job-progress').textContent =
-        `${job.success_count || 0} 成功 / ${job.failed_count || 0} 失败 / ${job.total_items || 0} 项`;
+    document.getElementById('sync-job-progress').textContent = job.status === 'running' && job.progress
+        ? formatJobProgress(job.progress)
+        : `${job.success_count || 0} 成功 / ${job.failed_count || 0} 失败 / ${job.total_items || 0} 项`;
     document.getElementById('sync-job-error').textContent = job.error || '--';
 }
 
+function formatJobProgress(progress) {
+    const eta = progress.eta_seconds == null ? '--' : `${Math.ceil(progress.eta_seconds)} 秒`;
+    return `${progress.phase} ${progress.processed}/${progress.total} · ${progress.rate}/秒 · 剩余 ${eta}`;
+}
+
 async function loadSyncJobs() {
     const tbody = document.getElementById('sync-jobs-tbody');
     if (!tbody) {
@@ -261,8 +315,8 @@ async function selectSyncJob(jobId) {
         const job = await apiFetch(`/jobs/${jobId}`);
         setSyncJob(job);
         await loadSyncResults(jobId);
-        if (job.status !== 'completed' && job.status !== 'failed') {
-            pollSyncJob(jobId);
+        if (!isJobFinished(job)) {
+            watchSyncJob(jobId);
         }
     } catch (error) {
         document.getElementById('sync-job-error').textContent = error.message;
@@ -0,0 +1,94 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.application.strategy.execution import TradeDataService
+from backend.infrastructure.persistence.duckdb.coverage import CoverageBitmap, CoverageIndex, day_ordinals, load_coverage
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+
+
+def _bars(code: str, days: list[str]) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"stock_code": code, "date": day, "open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0,
+         "volume": 100, "amount": 100.0}
+        for day in days
+    ])
+
+
+class RecordingRepository(DuckDBStockRepository):
+    def __init__(self, db_path):
+        super().__init__(db_path)
+        self.loaded_codes = []
+
+    def get_stock_histories(self, codes, start_date, end_date):
+        self.loaded_codes.extend(codes or [])
+        return super().get_stock_histories(codes, start_date, end_date)
+
+
+def test_bitmap_membership_and_merge():
+    bitmap = CoverageBitmap.from_days(day_ordinals(["20260105", "20260107"]))
+    merged = bitmap.merge(day_ordinals(["20251231", "20260112"]))
+
+    assert merged.contains(day_ordinals(["20251231", "20260105", "20260106", "20260112", "20260113"])).tolist() == [
+        True, True, False, True, False,
+    ]
+    assert merged.last_between(*day_ordinals(["20260101", "20260110"])) == day_ordinals(["20260107"])[0]
+
+
+def test_out_of_order_publish_keeps_days_of_both_writers():
+    index = CoverageIndex()
+    index.snapshot(lambda: {"000001": CoverageBitmap.from_days(day_ordinals(["20260105"]))})
+    newer = CoverageBitmap.from_days(day_ordinals(["20260105", "20260106", "20260107"]))
+    older = CoverageBitmap.from_days(day_ordinals(["20260105", "20260106"]))
+
+    index.publish({"000001": newer})
+    index.publish({"000001": older, "000002": older})
+
+    bitmaps = index.snapshot(dict)
+    assert bitmaps["000001"].days().tolist() == day_ordinals(["20260105", "20260106", "20260107"]).tolist()
+    assert bitmaps["000002"] is older
+
+
+def test_coverage_is_maintained_on_upsert_and_backfilled():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        repository.upsert_stocks([{"code": "000001", "name": "A"}, {"code": "000003", "name": "C"}])
+        repository.upsert_daily_data(_bars("000001", ["20260105", "20260106"]))
+        repository.upsert_daily_data(_bars("000002", ["20260106"]))
+        repository.upsert_daily_data(_bars("000001", ["20260107"]))
+
+        targets = ["20260105", "20260106", "20260107"]
+        assert repository.get_missing_trade_dates(None, targets) == {
+            "000002": ["20260105", "20260107"],
+            "000003": targets,
+        }
+        assert repository.get_available_dates("000001", "20260106", "20260131") == {"20260106", "20260107"}
+
+        with repository.connection() as conn:
+            stored = load_coverage(conn)
+        with repository.transaction() as conn:
+            conn.execute("DROP TABLE stock_coverage")
+        DuckDBStockRepository(db_path)
+        with repository.connection() as conn:
+            rebuilt = load_coverage(conn)
+        assert sorted(rebuilt) == sorted(stored) == ["000001", "000002"]
+        for code, bitmap in stored.items():
+            np.testing.assert_array_equal(rebuilt[code].days(), bitmap.days())
+
+
+def test_scan_skips_stocks_without_target_dates_before_loading():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = RecordingRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_daily_data(_bars("000001", ["20260105", "20260106"]))
+        repository.upsert_daily_data(_bars("000002", ["20260105"]))
+        service = TradeDataService(repository, data_source=None, allow_online_fetch=False)
+
+        histories = service.get_histories_for_scan(
+            ["000001", "000002", "000003"], "20260101", "20260106", ["20260106"],
+        )
+
+        assert list(histories) == ["000001"]
+        assert repository.loaded_codes == ["000001"]
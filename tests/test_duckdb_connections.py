@@ -0,0 +1,68 @@
+import tempfile
+import threading
+from pathlib import Path
+
+import pytest
+
+from backend.infrastructure.persistence.duckdb.connection import close_database
+from backend.infrastructure.persistence.duckdb_repository import (
+    DuckDBJobRepository,
+    DuckDBScanJobRepository,
+    DuckDBStockRepository,
+)
+
+
+def test_repositories_on_same_file_share_one_database_handle():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        stock_repository = DuckDBStockRepository(db_path)
+        job_repository = DuckDBJobRepository(db_path)
+        scan_job_repository = DuckDBScanJobRepository(db_path)
+
+        assert stock_repository.database is job_repository.database
+        assert stock_repository.database is scan_job_repository.database
+        close_database(db_path)
+
+
+def test_readers_use_per_thread_cursors_without_waiting_for_each_other():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        repository.upsert_stocks([{"code": "000001", "name": "Alpha"}])
+        barrier = threading.Barrier(4, timeout=5)
+        cursors = []
+        errors = []
+
+        def reader():
+            try:
+                with repository.connection() as conn:
+                    cursors.append(conn)
+                    # Every reader holds its cursor until all of them arrive.
+                    barrier.wait()
+                    assert conn.execute("SELECT COUNT(*) FROM stocks").fetchone() == (1,)
+            except Exception as exc:  # pragma: no cover - surfaced below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=reader) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert errors == []
+        assert len({id(cursor) for cursor in cursors}) == 4
+        close_database(db_path)
+
+
+def test_transaction_rolls_back_on_error():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+
+        with pytest.raises(RuntimeError):
+            with repository.transaction() as conn:
+                conn.execute("INSERT INTO stocks (code, name) VALUES ('000001', 'Alpha')")
+                raise RuntimeError("boom")
+
+        assert repository.list_stocks() == []
+        close_database(db_path)
@@ -1,12 +1,15 @@
 import tempfile
+from datetime import date, timedelta
 from pathlib import Path
 
+import numpy as np
 import pandas as pd
 import pytest
 from fastapi.testclient import TestClient
 
 from backend.api.app import create_app
 from backend.application.job_service import ResearchJobService
+from backend.infrastructure.persistence.duckdb.period_summary import decompose_range
 from backend.infrastructure.persistence.duckdb_repository import (
     DuckDBJobRepository,
     DuckDBScanJobRepository,
@@ -63,6 +66,87 @@ def test_duckdb_high_low_gain_rank_supports_direction_and_min_percent():
         assert down_ranks[0].gain_percent == pytest.approx(50.0)
 
 
+@pytest.mark.parametrize("direction", ["up", "down"])
+def test_directional_rank_matches_brute_force_pairs_including_tie_breaks(direction):
+    rng = np.random.default_rng(11)
+    dates = pd.bdate_range("2026-01-01", periods=25)
+    codes = [f"{index:06d}" for index in range(1, 31)]
+    # Coarse integer prices produce plenty of equal lows, highs and gains.
+    bars = pd.DataFrame([
+        {"stock_code": code, "date": date, "open": 5, "close": 5,
+         "high": float(low + rng.integers(0, 3)), "low": float(low), "volume": 1}
+        for code in codes
+        for date, low in zip(dates, rng.integers(1, 6, len(dates)))
+    ])
+    expected = _brute_force_directional_rank(bars, direction, min_gain_rate=0.2)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": code} for code in codes])
+        repository.upsert_daily_data(bars)
+        ranks = repository.list_high_low_gain_rank(
+            "20260101", "20260205", limit=100, direction=direction, min_gain_percent=20,
+        )
+
+    assert [
+        (item.code, item.lowest_price, item.lowest_date, item.highest_price, item.highest_date, item.trade_days)
+        for item in ranks
+    ] == [row[:6] for row in expected]
+    assert [item.gain_rate for item in ranks] == pytest.approx([row[6] for row in expected])
+
+
+def test_decompose_range_covers_every_day_exactly_once():
+    for start, end in [(date(2025, 1, 30), date(2026, 3, 4)), (date(2026, 2, 3), date(2026, 2, 5)), (date(2026, 3, 1), date(2026, 3, 31))]:
+        months, weeks, daily_spans = decompose_range(start, end)
+        covered = []
+        for month_start in months:
+            covered += pd.date_range(month_start, month_start + pd.offsets.MonthEnd(0)).date.tolist()
+        for week_start in weeks:
+            week_end = min(week_start + timedelta(days=6 - week_start.weekday()), (week_start + pd.offsets.MonthEnd(0)).date())
+            covered += pd.date_range(week_start, week_end).date.tolist()
+        for span_start, span_end in daily_spans:
+            covered += pd.date_range(span_start, span_end).date.tolist()
+        assert sorted(covered) == pd.date_range(start, end).date.tolist()
+
+
+def test_range_rank_from_rollups_matches_daily_rows_after_updates():
+    rng = np.random.default_rng(5)
+    dates = pd.bdate_range("2025-11-20", "2026-03-10")
+    codes = [f"{index:06d}" for index in range(1, 21)]
+    bars = pd.DataFrame([
+        {"stock_code": code, "date": day, "open": 5, "close": 5,
+         "high": float(low + rng.integers(0, 4)), "low": float(low), "volume": 1}
+        for code in codes
+        for day, low in zip(dates, rng.integers(0, 8, len(dates)))
+    ])
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": code} for code in codes])
+        repository.upsert_daily_data(bars.iloc[: len(bars) // 2])
+        repository.upsert_daily_data(bars.iloc[len(bars) // 2:])
+        # Rewriting one bar must refresh the rollup of its month and week.
+        bars.loc[10, ["high", "low"]] = [50.0, 1.0]
+        repository.upsert_daily_data(bars.iloc[[10]])
+
+        for start, end in [("20251120", "20260310"), ("20251203", "20260217"), ("20260105", "20260109")]:
+            ranks = repository.list_high_low_gain_rank(start, end, limit=100)
+            expected = _brute_force_range_rank(bars, start, end)
+            assert [
+                (item.code, item.lowest_price, item.lowest_date, item.highest_price, item.highest_date, item.trade_days)
+                for item in ranks
+            ] == expected
+
+        # Databases created before the rollup existed are backfilled on open.
+        with repository.transaction() as conn:
+            conn.execute("DROP TABLE stock_period_summary")
+        reopened = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        ranks = reopened.list_high_low_gain_rank("20251201", "20260228", limit=100)
+        assert [(item.code, item.lowest_date, item.highest_date) for item in ranks] == [
+            (row[0], row[2], row[4]) for row in _brute_force_range_rank(bars, "20251201", "20260228")
+        ]
+
+
 def test_high_low_gain_rank_api_returns_sorted_results_and_validates_inputs():
     with tempfile.TemporaryDirectory() as temp_dir:
         db_path = str(Path(temp_dir) / "test.duckdb")
@@ -177,6 +261,46 @@ def test_high_low_gain_rank_api_returns_empty_list_when_no_local_data():
             assert response.json() == []
 
 
+def _brute_force_range_rank(bars: pd.DataFrame, start: str, end: str) -> list[tuple]:
+    window = bars[
+        (bars["date"] >= pd.Timestamp(start)) & (bars["date"] <= pd.Timestamp(end)) & (bars["low"] > 0)
+    ]
+    rows = []
+    for code, group in window.groupby("stock_code"):
+        lowest = group.sort_values(["low", "date"]).iloc[0]
+        highest = group.sort_values(["high", "date"], ascending=[False, True]).iloc[0]
+        gain = (highest["high"] - lowest["low"]) / lowest["low"]
+        rows.append((
+            -gain, code, lowest["low"], lowest["date"].strftime("%Y%m%d"),
+            highest["high"], highest["date"].strftime("%Y%m%d"), len(group),
+        ))
+    return [row[1:] for row in sorted(rows)]
+
+
+def _brute_force_directional_rank(bars: pd.DataFrame, direction: str, min_gain_rate: float) -> list[tuple]:
+    best = []
+    for code, group in bars.groupby("stock_code"):
+        points = [
+            (row.date.strftime("%Y%m%d"), row.high, row.low)
+            for row in group.sort_values("date").itertuples()
+        ]
+        candidates = []
+        for first_index, first in enumerate(points):
+            for second in points[first_index + 1:]:
+                if direction == "up":
+                    low, low_date, high, high_date = first[2], first[0], second[1], second[0]
+                    gain = (high - low) / low
+                else:
+                    low, low_date, high, high_date = second[2], second[0], first[1], first[0]
+                    gain = (high - low) / high
+                if gain >= min_gain_rate:
+                    candidates.append((-gain, low_date, high_date, low, high))
+        if candidates:
+            gain, low_date, high_date, low, high = min(candidates)
+            best.append((code, low, low_date, high, high_date, len(points), -gain))
+    return sorted(best, key=lambda row: (-row[6], row[0]))
+
+
 def _seed_ranking_data(repository):
     repository.upsert_stocks([
         {"code": "000001", "name": "Alpha"},
@@ -0,0 +1,198 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from backend.application.interfaces import TradeCalendarProvider
+from backend.application.sync import DataSyncService
+from backend.application.sync.incremental import missing_ranges
+from backend.domain.models import DailyCoverage
+from backend.infrastructure.data_sources.base import DataSourceBase
+from backend.infrastructure.persistence.duckdb_repository import DuckDBJobRepository, DuckDBStockRepository
+
+TRADE_DATES = ["20260105", "20260106", "20260107", "20260108", "20260109", "20260112", "20260113", "20260114"]
+
+
+class FixedCalendar(TradeCalendarProvider):
+    def recent_range(self, n_days: int = 60) -> tuple[str, str]:
+        return TRADE_DATES[-n_days], TRADE_DATES[-1]
+
+    def normalize_targets(self, target_dates: list[str]) -> list[str]:
+        return target_dates
+
+    def trade_dates(self, start_date: str, end_date: str) -> list[str] | None:
+        return [day for day in TRADE_DATES if start_date <= day <= end_date]
+
+
+class RecordingDataSource(DataSourceBase):
+    def __init__(self, suspended: dict[str, set[str]] | None = None, close: float = 1.0):
+        super().__init__(timeout=None)
+        self.requests = []
+        self.suspended = suspended or {}
+        self.close = close
+
+    def do_fetch(self, stock_code, market_code, start_date, end_date):
+        self.requests.append((stock_code, start_date, end_date))
+        days = [
+            day for day in TRADE_DATES
+            if start_date <= day <= end_date and day not in self.suspended.get(stock_code, ())
+        ]
+        return _bars(stock_code, days, self.close)
+
+
+def _bars(code: str, days: list[str], close: float = 1.0) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"stock_code": code, "date": day, "open": 1.0, "close": close, "high": close, "low": 1.0,
+         "volume": 100, "amount": 100.0}
+        for day in days
+    ])
+
+
+def test_missing_ranges_groups_consecutive_trading_days():
+    coverage = DailyCoverage("000001", "20260112", ("20260106", "20260107", "20260109", "20260112"))
+
+    assert missing_ranges(coverage, "20260105", "20260112", TRADE_DATES, refetch_days=0) == [
+        ("20260106", "20260107"),
+        ("20260109", "20260112"),
+    ]
+    assert missing_ranges(DailyCoverage("000001", "20260112"), "20260105", "20260112", TRADE_DATES, 0) == []
+    # Without a calendar only the tail after the watermark is fetched.
+    assert missing_ranges(DailyCoverage("000001", "20260107"), "20260105", "20260112", refetch_days=0) == [
+        ("20260108", "20260112"),
+    ]
+    assert missing_ranges(None, "20260105", "20260112") == [("20260105", "20260112")]
+
+
+def test_missing_ranges_always_refetches_the_last_trading_days():
+    complete = DailyCoverage("000001", "20260112")
+
+    assert missing_ranges(complete, "20260105", "20260112", TRADE_DATES) == [("20260109", "20260112")]
+    coverage = DailyCoverage("000001", "20260112", ("20260106",))
+    assert missing_ranges(coverage, "20260105", "20260112", TRADE_DATES, refetch_days=1) == [
+        ("20260106", "20260106"),
+        ("20260112", "20260112"),
+    ]
+    # Without a calendar the watermark bar itself is fetched again.
+    assert missing_ranges(complete, "20260105", "20260112") == [("20260112", "20260112")]
+
+
+def test_missing_ranges_collapses_scattered_holes():
+    coverage = DailyCoverage("000001", "20260114", ("20260105", "20260107", "20260109", "20260113"))
+
+    assert missing_ranges(coverage, "20260105", "20260114", TRADE_DATES, refetch_days=0) == [
+        ("20260105", "20260113"),
+    ]
+
+
+def test_incremental_daily_sync_fetches_only_missing_ranges():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        repository.upsert_stocks([
+            {"code": "000001", "name": "Full"},
+            {"code": "000002", "name": "Tail"},
+            {"code": "000003", "name": "Hole"},
+            {"code": "000004", "name": "New"},
+        ])
+        repository.upsert_daily_data(_bars("000001", TRADE_DATES[:6]))
+        repository.upsert_daily_data(_bars("000002", TRADE_DATES[:4]))
+        repository.upsert_daily_data(_bars("000003", TRADE_DATES[:2] + TRADE_DATES[3:6]))
+        data_source = RecordingDataSource()
+        service = DataSyncService(
+            stock_repository=repository,
+            job_repository=DuckDBJobRepository(db_path),
+            data_source=data_source,
+            incremental=True,
+            refetch_days=0,
+            calendar_provider=FixedCalendar(),
+        )
+
+        summary = service.run(job_id="sync-1", scope="daily", start_date="20260105", end_date="20260112")
+
+        assert summary == {"total_items": 4, "success_count": 4, "failed_count": 0}
+        assert sorted(data_source.requests) == [
+            ("000002", "20260109", "20260112"),
+            ("000003", "20260107", "20260107"),
+            ("000004", "20260105", "20260112"),
+        ]
+        coverage = repository.get_daily_coverage(
+            ["000001", "000002", "000003", "000004"], "20260105", "20260112", TRADE_DATES[:6],
+        )
+        assert all(not item.missing_dates for item in coverage.values())
+        assert {item.last_date for item in coverage.values()} == {"20260112"}
+
+
+def _sync_service(db_path, repository, data_source, incremental=True):
+    return DataSyncService(
+        stock_repository=repository,
+        job_repository=DuckDBJobRepository(db_path),
+        data_source=data_source,
+        incremental=incremental,
+        refetch_days=1,
+        calendar_provider=FixedCalendar(),
+    )
+
+
+def test_incremental_sync_fills_history_before_the_first_stored_bar():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        repository.upsert_stocks([{"code": "000001", "name": "Alpha"}])
+        repository.upsert_daily_data(_bars("000001", TRADE_DATES[4:]))
+        data_source = RecordingDataSource()
+
+        _sync_service(db_path, repository, data_source).run(
+            job_id="sync-1", scope="daily", start_date="20260105", end_date="20260114",
+        )
+
+        assert data_source.requests == [("000001", "20260105", "20260108"), ("000001", "20260114", "20260114")]
+        coverage = repository.get_daily_coverage(["000001"], "20260105", "20260114", TRADE_DATES)
+        assert coverage["000001"].missing_dates == ()
+
+
+def test_incremental_sync_remembers_days_the_source_did_not_return_for_a_while():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        repository.upsert_stocks([{"code": "000001", "name": "Listed"}])
+        # Listed on 0107 and suspended on 0109; 0113 was written intraday.
+        repository.upsert_daily_data(_bars("000001", ["20260107", "20260108", "20260112", "20260113"], close=0.5))
+        data_source = RecordingDataSource(suspended={"000001": {"20260105", "20260106", "20260109"}}, close=2.0)
+        service = _sync_service(db_path, repository, data_source)
+
+        service.run(job_id="sync-1", scope="daily", start_date="20260105", end_date="20260113")
+        assert data_source.requests == [
+            ("000001", "20260105", "20260106"),
+            ("000001", "20260109", "20260109"),
+            ("000001", "20260113", "20260113"),
+        ]
+
+        data_source.requests.clear()
+        service.run(job_id="sync-2", scope="daily", start_date="20260105", end_date="20260113")
+        assert data_source.requests == [("000001", "20260113", "20260113")]
+        history = repository.get_stock_history("000001", "20260112", "20260113")
+        assert history["close"].tolist() == [0.5, 2.0]
+
+        # Recorded empty days expire, so a lost response is asked for again.
+        with repository.transaction() as conn:
+            conn.execute("UPDATE stock_empty_daily_dates SET recorded_at = recorded_at - INTERVAL 31 DAY")
+        data_source.requests.clear()
+        service.run(job_id="sync-3", scope="daily", start_date="20260105", end_date="20260113")
+        assert ("000001", "20260109", "20260109") in data_source.requests
+
+
+def test_full_daily_sync_clears_recorded_empty_days():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        repository.upsert_stocks([{"code": "000001", "name": "Alpha"}])
+        repository.upsert_daily_data(_bars("000001", ["20260105", "20260107"]))
+        repository.record_empty_daily_dates({"000001": ["20260106"]})
+        assert repository.get_daily_coverage(["000001"], "20260105", "20260107", TRADE_DATES)["000001"].missing_dates == ()
+
+        _sync_service(db_path, repository, RecordingDataSource(suspended={"000001": {"20260106"}}), incremental=False).run(
+            job_id="sync-1", scope="daily", start_date="20260105", end_date="20260107",
+        )
+
+        coverage = repository.get_daily_coverage(["000001"], "20260105", "20260107", TRADE_DATES)
+        assert coverage["000001"].missing_dates == ("20260106",)
@@ -0,0 +1,95 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from backend.application.strategy.execution import TradeDataService
+from backend.domain.indicators import INDICATOR_COLUMNS, compute_indicators
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+from backend.strategies.dual_ma_trend import DualMATrendStrategy
+from backend.strategies.gap_breakout import GapBreakoutStrategy
+from backend.strategies.gap_pullback import GapPullbackStrategy
+from backend.strategies.strong_limit_up import StrongLimitUpBreakoutStrategy
+
+
+def _bars(days: int, seed: int = 7, start: str = "2025-01-01") -> pd.DataFrame:
+    rng = np.random.default_rng(seed)
+    closes = 10 * np.cumprod(1 + rng.normal(0.001, 0.03, days))
+    return pd.DataFrame({
+        "stock_code": "000001",
+        "date": pd.bdate_range(start, periods=days),
+        "open": closes * (1 + rng.uniform(-0.02, 0.02, days)),
+        "close": closes,
+        "high": closes * (1 + rng.uniform(0.0, 0.05, days)),
+        "low": closes * (1 - rng.uniform(0.0, 0.05, days)),
+        "volume": rng.integers(1_000, 10_000, days).astype(float),
+        "amount": closes * 1_000,
+    })
+
+
+def _stored_indicators(repository) -> pd.DataFrame:
+    with repository.connection() as conn:
+        return conn.execute(
+            f"SELECT {', '.join(INDICATOR_COLUMNS)} FROM stock_indicators ORDER BY trade_date"
+        ).fetchdf()
+
+
+def test_incremental_refresh_matches_full_history_computation():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        bars = _bars(180)
+        repository.upsert_daily_data(bars.iloc[:150])
+        assert repository.refresh_indicators("000001") == 150
+
+        repository.upsert_daily_data(bars.iloc[150:])
+        assert repository.refresh_indicators("000001", bars["date"].iloc[150].strftime("%Y%m%d")) == 30
+
+        expected = compute_indicators(bars)[INDICATOR_COLUMNS]
+        np.testing.assert_allclose(_stored_indicators(repository).to_numpy(), expected.to_numpy(), equal_nan=True)
+
+
+def test_refresh_recomputes_whole_code_when_ema_state_is_missing():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        bars = _bars(40)
+        repository.upsert_daily_data(bars)
+
+        assert repository.refresh_indicators("000001", bars["date"].iloc[30].strftime("%Y%m%d")) == 40
+        expected = compute_indicators(bars)[INDICATOR_COLUMNS]
+        np.testing.assert_allclose(_stored_indicators(repository).to_numpy(), expected.to_numpy(), equal_nan=True)
+
+
+def test_strategies_give_same_answers_with_precomputed_columns():
+    strategies = [
+        DualMATrendStrategy(),
+        GapBreakoutStrategy(),
+        GapPullbackStrategy(),
+        StrongLimitUpBreakoutStrategy(),
+    ]
+    full_history = _bars(260, seed=3)
+    with_indicators = pd.concat([full_history, compute_indicators(full_history).drop(columns="date")], axis=1)
+
+    for end in range(40, 260, 3):
+        # The scan window starts after the first bar, so early MAs must stay NaN.
+        window_start = max(0, end - 130)
+        plain = full_history.iloc[window_start:end].reset_index(drop=True)
+        joined = with_indicators.iloc[window_start:end].reset_index(drop=True)
+        for strategy in strategies:
+            assert strategy.check(plain) == strategy.check(joined), (strategy.name, end)
+
+
+def test_trade_data_service_joins_requested_indicator_columns():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        bars = _bars(30)
+        repository.upsert_daily_data(bars)
+        repository.refresh_indicators("000001")
+        service = TradeDataService(repository, data_source=None, allow_online_fetch=False, indicator_columns=["ma20"])
+
+        start, end = bars["date"].iloc[0].strftime("%Y%m%d"), bars["date"].iloc[-1].strftime("%Y%m%d")
+        history = service.get_histories_for_scan(["000001"], start, end, [end])["000001"]
+
+        assert list(history.columns[-1:]) == ["ma20"]
+        assert history["ma20"].iloc[-1] == pytest.approx(bars["close"].iloc[-20:].mean())
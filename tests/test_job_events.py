@@ -0,0 +1,77 @@
+import json
+import threading
+import time
+
+from backend.application.events import JobEventBus
+from backend.domain.models import JobType
+from tests.test_api import _v2_test_client
+
+
+def _read_events(lines) -> list[tuple[str, dict]]:
+    events, name = [], None
+    for line in lines:
+        if line.startswith("event: "):
+            name = line[len("event: "):]
+        elif line.startswith("data: "):
+            events.append((name, json.loads(line[len("data: "):])))
+    return events
+
+
+def test_bus_delivers_to_subscribers_of_the_job_until_unsubscribed():
+    bus, received = JobEventBus(), []
+    unsubscribe = bus.subscribe("job-1", received.append)
+    bus.subscribe("job-2", lambda event: 1 / 0)
+
+    bus.publish_progress("job-1", {"processed": 1})
+    bus.publish_status({"job_id": "job-2", "status": "running"})
+    unsubscribe()
+    bus.publish_progress("job-1", {"processed": 2})
+
+    assert received == [{"event": "progress", "data": {"job_id": "job-1", "progress": {"processed": 1}}}]
+
+
+def test_event_stream_of_finished_job_sends_current_state_and_closes():
+    with _v2_test_client() as (client, job_service):
+        job_id = client.post("/api/v1/scans", json={"start": "20260101", "end": "20260102", "targets": ["20260102"]}).json()["job_id"]
+        job_service.run_job(job_id)
+
+        with client.stream("GET", f"/api/v1/jobs/{job_id}/events") as response:
+            assert response.headers["content-type"].startswith("text/event-stream")
+            events = _read_events(response.iter_lines())
+
+        assert [(name, data["status"]) for name, data in events] == [("status", "completed")]
+        assert client.get("/api/v1/jobs/missing/events").status_code == 404
+
+
+def test_event_stream_pushes_status_and_progress_until_job_finishes():
+    with _v2_test_client() as (client, job_service):
+        job_id = client.post("/api/v1/scans", json={"start": "20260101", "end": "20260102", "targets": ["20260102"]}).json()["job_id"]
+        scan_handler = job_service.dispatcher.handlers[JobType.SCAN]
+        original = scan_handler.scan_runner
+
+        def reporting_runner(*args, job_id=None, **kwargs):
+            job_service.progress.start(job_id, "scan", 2)
+            job_service.progress.advance(job_id, 2)
+            return original(*args, job_id=job_id, **kwargs)
+
+        scan_handler.scan_runner = reporting_runner
+
+        def run_once_subscribed():
+            deadline = time.monotonic() + 10
+            while not job_service.events.subscriber_count(job_id) and time.monotonic() < deadline:
+                time.sleep(0.01)
+            # Let the route read and send the queued state first.
+            time.sleep(0.2)
+            job_service.run_job(job_id)
+
+        worker = threading.Thread(target=run_once_subscribed)
+        worker.start()
+        with client.stream("GET", f"/api/v1/jobs/{job_id}/events") as response:
+            events = _read_events(response.iter_lines())
+        worker.join()
+
+        statuses = [data["status"] for name, data in events if name == "status"]
+        progress = [data["progress"]["processed"] for name, data in events if name == "progress"]
+        assert statuses == ["queued", "running", "completed"]
+        assert progress[-1] == 2
+        assert events[-1][1]["progress"]["total"] == 2
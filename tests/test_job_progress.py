@@ -0,0 +1,104 @@
+import tempfile
+from pathlib import Path
+
+from backend.application.progress import JobProgressRegistry, track
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService
+from backend.application.tasks import ResearchJobService
+from backend.domain.models import Job, JobStatus, JobType
+from backend.infrastructure.persistence.duckdb_repository import DuckDBJobRepository, DuckDBStockRepository
+from backend.strategies.high_volume import HighVolumeStrategy
+from tests.test_panel_engine import _market
+from tests.test_task_execution_refactor import FakeCalendarProvider, _config
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+def test_registry_reports_rate_and_eta_and_throttles_persistence():
+    clock, persisted = FakeClock(), []
+    registry = JobProgressRegistry(
+        persist=lambda job_id, progress: persisted.append(progress), persist_interval=5.0, clock=clock,
+    )
+    tracker = track(registry, "job-1")
+
+    tracker.start("daily", 100)
+    for _ in range(10):
+        clock.now += 0.5
+        tracker.advance(2)
+
+    progress = registry.snapshot("job-1")
+    assert (progress["phase"], progress["processed"], progress["total"]) == ("daily", 20, 100)
+    assert progress["rate"] == 4.0 and progress["eta_seconds"] == 20.0
+    # One write at start, one after five seconds; the rest stayed in memory.
+    assert [item["processed"] for item in persisted] == [0, 20]
+
+    tracker.advance(80)
+    assert persisted[-1]["processed"] == 100 and persisted[-1]["eta_seconds"] == 0.0
+    assert registry.finish("job-1")["processed"] == 100
+    assert registry.snapshot("job-1") is None
+    track(registry, None).advance()
+
+
+def test_job_progress_is_persisted_and_exposed_while_scanning():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository, job_repository = DuckDBStockRepository(db_path), DuckDBJobRepository(db_path)
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+        for bars in market.values():
+            repository.upsert_daily_data(bars)
+        days = market["000001"]["date"]
+        start, end = days.iloc[0].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d")
+        seen = []
+
+        def scan_runner(start_date, end_date, target_dates, job_id=None):
+            executor = StrategyExecutor(
+                trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+                repository=repository,
+                strategies=[HighVolumeStrategy()],
+                max_workers=1,
+                history_batch_size=2,
+                progress=service.progress,
+            )
+            count = executor.stream(start, end, [end], job_id=job_id)
+            seen.append(service.get_unified_job(job_id)["progress"])
+            return count
+
+        service = ResearchJobService(
+            stock_repository=repository,
+            job_repository=job_repository,
+            app_config=_config(),
+            sync_service=None,
+            backtest_service=None,
+            scan_runner=scan_runner,
+            calendar_provider=FakeCalendarProvider(),
+            auto_start=False,
+        )
+        job_id = service.submit_scan(target_dates=[end])["job_id"]
+        assert service.get_unified_job(job_id)["progress"] is None
+
+        service.run_job(job_id)
+
+        assert seen[0]["phase"] == "scan" and seen[0]["processed"] == seen[0]["total"] == len(market)
+        stored = job_repository.get(job_id)
+        assert stored.status == JobStatus.COMPLETED
+        assert stored.progress["processed"] == len(market)
+        assert service.get_unified_job(job_id)["progress"]["total"] == len(market)
+
+
+def test_job_save_keeps_progress_written_by_save_progress():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        job_repository = DuckDBJobRepository(str(Path(temp_dir) / "test.duckdb"))
+        job = Job(job_id="job-1", type=JobType.SYNC, status=JobStatus.QUEUED)
+        job_repository.save(job)
+
+        job_repository.save_progress("job-1", {"phase": "daily", "processed": 3, "total": 9})
+        job.mark_running()
+        job_repository.save(job)
+
+        assert job_repository.get("job-1").progress == {"phase": "daily", "processed": 3, "total": 9}
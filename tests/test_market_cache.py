@@ -0,0 +1,92 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from backend.infrastructure.persistence.duckdb.base import normalize_stock_data
+from backend.infrastructure.persistence.duckdb.market_cache import RANK_ENTRY_BYTES, MarketDataCache
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+
+
+def _bars(code: str, dates: list[str], close: float) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"stock_code": code, "date": date, "open": close, "close": close,
+         "high": close, "low": close, "volume": 100}
+        for date in dates
+    ])
+
+
+def test_repository_reads_through_cache_and_invalidates_overlapping_writes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_daily_data(_bars("000001", ["20260105", "20260106", "20260107"], 10.0))
+        repository.upsert_daily_data(_bars("000002", ["20260105", "20260106"], 20.0))
+        cache = repository.market_cache
+
+        first = repository.get_stock_histories(["000001", "000002"], "20260101", "20260131")
+        hits_before = cache.hits
+        narrower = repository.get_stock_history("000001", "20260106", "20260107")
+        again = repository.get_stock_histories(["000001", "000002"], "20260101", "20260131")
+
+        assert cache.hits == hits_before + 3
+        assert narrower["close"].tolist() == [10.0, 10.0]
+        assert narrower.iloc[0]["date"].strftime("%Y%m%d") == "20260106"
+        assert again["000002"]["close"].tolist() == first["000002"]["close"].tolist()
+
+        # Writes outside a cached window leave it alone; overlapping writes drop it.
+        repository.upsert_daily_data(_bars("000002", ["20260210"], 21.0))
+        assert cache.get("000002", "20260101", "20260131") is not None
+        repository.upsert_daily_data(_bars("000001", ["20260107"], 11.0))
+        assert cache.get("000001", "20260101", "20260131") is None
+        assert repository.get_stock_history("000001", "20260101", "20260131")["close"].tolist() == [10.0, 10.0, 11.0]
+
+
+def test_cache_evicts_least_recently_used_codes_over_budget():
+    history = normalize_stock_data(_bars("000001", ["20260105", "20260106"], 10.0))
+    cache = MarketDataCache(max_bytes=1)
+    cache.put("000001", "20260101", "20260131", history)
+    assert cache.get("000001", "20260101", "20260131") is None
+
+    entry_bytes = MarketDataCache(max_bytes=10**6)
+    entry_bytes.put("000001", "20260101", "20260131", history)
+    cache = MarketDataCache(max_bytes=entry_bytes.current_bytes * 2)
+    for code in ["000001", "000002", "000003"]:
+        cache.put(code, "20260101", "20260131", history.assign(stock_code=code))
+        if code == "000002":
+            cache.get("000001", "20260101", "20260131")
+
+    assert cache.get("000001", "20260101", "20260131") is not None
+    assert cache.get("000002", "20260101", "20260131") is None
+    assert cache.get("000003", "20260101", "20260131") is not None
+
+
+def test_rankings_share_the_byte_budget_and_lru_order():
+    history = normalize_stock_data(_bars("000001", ["20260105", "20260106"], 10.0))
+    entry_bytes = MarketDataCache(max_bytes=10**6)
+    entry_bytes.put("000001", "20260101", "20260131", history)
+    cache = MarketDataCache(max_bytes=entry_bytes.current_bytes + RANK_ENTRY_BYTES * 4)
+
+    cache.put("000001", "20260101", "20260131", history)
+    cache.put_ranking(("a",), "20260101", "20260131", ["r1", "r2"])
+    cache.get("000001", "20260101", "20260131")
+    cache.put_ranking(("b",), "20260101", "20260131", ["r1", "r2", "r3"])
+
+    assert cache.get_ranking(("a",)) is None
+    assert cache.get_ranking(("b",)) == ["r1", "r2", "r3"]
+    assert cache.get("000001", "20260101", "20260131") is not None
+    assert cache.current_bytes <= cache.max_bytes
+
+    cache.invalidate("000002", "20260110", "20260110")
+    assert cache.get_ranking(("b",)) is None
+    assert cache.current_bytes == entry_bytes.current_bytes
+
+
+def test_repositories_on_one_file_share_the_first_cache_size(caplog):
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        first = DuckDBStockRepository(db_path, market_cache_mb=1)
+        with caplog.at_level("WARNING"):
+            second = DuckDBStockRepository(db_path, market_cache_mb=2)
+
+        assert second.market_cache is first.market_cache
+        assert "market_cache_mb=2" in caplog.text
@@ -0,0 +1,137 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService
+from backend.application.strategy.panel import PanelScanEngine
+from backend.domain.indicators import required_indicator_columns
+from backend.domain.strategy import BaseStrategy
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+from backend.strategies.continuation_gap_strategy import ContinuationGapStrategy
+from backend.strategies.gap_breakout import GapBreakoutStrategy
+from backend.strategies.high_volume import HighVolumeStrategy
+from backend.strategies.macd_divergence_breakout import MACDDivergenceBreakoutStrategy
+from tests.test_strategy_series import _eventful_bars
+
+
+class RisingCloseStrategy(BaseStrategy):
+    """Has no check_panel, so the panel engine scans it per stock."""
+
+    def __init__(self):
+        super().__init__("rising close")
+
+    def check(self, hist_data):
+        return len(hist_data) > 20 and hist_data["close"].iloc[-1] > hist_data["close"].iloc[-21:-1].max()
+
+
+class StoredDiffTurnStrategy(BaseStrategy):
+    """Hits where the stored full-history MACD diff turns up; no check_panel."""
+
+    indicators = ("diff",)
+
+    def __init__(self):
+        super().__init__("diff turn")
+
+    def check(self, hist_data):
+        return "diff" in hist_data.columns and len(hist_data) > 1 and hist_data["diff"].iloc[-2] < 0 < hist_data["diff"].iloc[-1]
+
+
+def _market() -> dict[str, pd.DataFrame]:
+    """Stocks listed on different days, one with suspensions and one never listed."""
+    market = {}
+    for number, seed in enumerate((0, 2, 3, 36)):
+        code = f"00000{number + 1}"
+        bars = _eventful_bars(240, seed).assign(stock_code=code)
+        market[code] = bars.iloc[number * 25:].reset_index(drop=True)
+    suspended = market["000002"]
+    market["000002"] = suspended.drop(index=[70, 71, 72, 130]).reset_index(drop=True)
+    market["000009"] = _eventful_bars(240, 5).assign(stock_code="000009")
+    return market
+
+
+def _hits(results: list[dict]) -> set[tuple]:
+    return {(hit["code"], hit["strategy"], hit["target_date"], hit["current_price"]) for hit in results}
+
+
+def test_panel_engine_matches_strategy_executor():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market if code != "000009"])
+        for bars in market.values():
+            repository.upsert_daily_data(bars)
+
+        days = market["000001"]["date"]
+        start, end = days.iloc[0].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d")
+        targets = [day.strftime("%Y%m%d") for day in days.iloc[1:]]
+        strategies = [HighVolumeStrategy(), ContinuationGapStrategy(), GapBreakoutStrategy(), RisingCloseStrategy()]
+
+        executor = StrategyExecutor(
+            trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+            repository=repository,
+            strategies=strategies,
+            max_workers=2,
+        )
+        expected = executor.run(start, end, targets, job_id="executor")
+        results = PanelScanEngine(repository, strategies).run(start, end, targets, job_id="panel")
+
+        assert _hits(results) == _hits(expected)
+        assert len(results) == len(expected)
+        assert {hit["strategy"] for hit in results} == {strategy.name for strategy in strategies}
+        assert "000009" not in {hit["code"] for hit in results}
+        assert len(repository.get_strategy_results("panel")) == len(results)
+
+
+def test_check_panel_matches_check_series_per_column():
+    market = _market()
+    panel_codes = list(market)
+    length = max(len(bars) for bars in market.values())
+    aligned = {}
+    for field in ["open", "close", "high", "low", "volume", "amount", "position"]:
+        matrix = np.full((length, len(panel_codes)), np.nan)
+        for column, bars in enumerate(market.values()):
+            values = np.arange(len(bars)) if field == "position" else bars[field].to_numpy()
+            matrix[length - len(bars):, column] = values
+        aligned[field] = pd.DataFrame(matrix, columns=panel_codes)
+
+    for strategy in (HighVolumeStrategy(), ContinuationGapStrategy(), GapBreakoutStrategy()):
+        flags = strategy.check_panel(aligned)
+        for code, bars in market.items():
+            expected = strategy.check_series(bars).to_numpy(dtype=bool)
+            assert flags[code].to_numpy(dtype=bool)[length - len(bars):].tolist() == expected.tolist()
+            assert not flags[code].to_numpy(dtype=bool)[:length - len(bars)].any()
+
+
+def test_per_stock_fallback_uses_stored_indicators_like_the_executor():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+        for code, bars in market.items():
+            repository.upsert_daily_data(bars)
+            repository.refresh_indicators(code)
+
+        # The window starts mid-history, so a diff recomputed on it would differ.
+        days = market["000001"]["date"]
+        start, end = days.iloc[60].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d")
+        targets = [day.strftime("%Y%m%d") for day in days.iloc[61:]]
+        strategies = [MACDDivergenceBreakoutStrategy(), StoredDiffTurnStrategy(), HighVolumeStrategy()]
+
+        executor = StrategyExecutor(
+            trade_data_service=TradeDataService(
+                repository,
+                data_source=None,
+                allow_online_fetch=False,
+                indicator_columns=required_indicator_columns(strategies),
+            ),
+            repository=repository,
+            strategies=strategies,
+            max_workers=2,
+        )
+        expected = executor.run(start, end, targets)
+        results = PanelScanEngine(repository, strategies).run(start, end, targets)
+
+        assert any(hit["strategy"] == "diff turn" for hit in expected)
+        assert _hits(results) == _hits(expected)
@@ -0,0 +1,147 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from backend.application.strategy.execution import TradeDataService
+from backend.application.sync import DataSyncService
+from backend.infrastructure.data_sources.base import DataSourceBase
+from backend.infrastructure.persistence.duckdb_repository import DuckDBJobRepository, DuckDBStockRepository
+from backend.infrastructure.persistence import panel_store
+from backend.infrastructure.persistence.panel_store import OHLCVPanelStore
+
+
+class StubDataSource(DataSourceBase):
+    def __init__(self, data):
+        super().__init__(timeout=None)
+        self.data = data
+
+    def do_fetch(self, stock_code, market_code, start_date, end_date):
+        return self.data
+
+
+def _bars(code: str, rows: list[tuple[str, float]]) -> pd.DataFrame:
+    return pd.DataFrame([
+        {"stock_code": code, "date": date, "open": close, "close": close,
+         "high": close + 1, "low": close - 1, "volume": 100, "amount": close * 100}
+        for date, close in rows
+    ])
+
+
+def test_panel_mirrors_repository_and_refreshes_incrementally():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        store = OHLCVPanelStore(Path(temp_dir) / "panel", repository)
+        repository.upsert_daily_data(_bars("000001", [("20260105", 10.0), ("20260106", 11.0)]))
+        repository.upsert_daily_data(_bars("000002", [("20260106", 20.0)]))
+
+        assert store.get_histories(None, "20260105", "20260106") is None
+        store.refresh("20260105", "20260106")
+
+        panel = store.open()
+        assert isinstance(panel.segments[0].fields["close"], np.memmap)
+        histories = store.get_histories(["000001", "000002", "000009"], "20260105", "20260106")
+        assert sorted(histories) == ["000001", "000002"]
+        assert histories["000001"]["close"].tolist() == [10.0, 11.0]
+        assert histories["000002"]["date"].dt.strftime("%Y%m%d").tolist() == ["20260106"]
+        assert store.get_histories(None, "20260105", "20260107") is None
+
+        # A later sync only names its own days; the gap back to the panel is filled too.
+        repository.upsert_daily_data(_bars("000002", [("20260107", 21.0), ("20260108", 22.0)]))
+        repository.upsert_daily_data(_bars("000003", [("20260108", 30.0)]))
+        store.refresh("20260108", "20260108")
+
+        refreshed = store.open()
+        assert refreshed.version != panel.version
+        # The new days only touch the old coverage, so its segment is reused.
+        assert refreshed.segments[0].name == panel.segments[0].name
+        histories = store.get_histories(None, "20260105", "20260108")
+        expected = repository.get_stock_histories(None, "20260105", "20260108")
+        assert sorted(histories) == sorted(expected)
+        for code, history in histories.items():
+            pd.testing.assert_frame_equal(history, expected[code], check_dtype=False)
+        assert len([path for path in (Path(temp_dir) / "panel").iterdir() if path.is_dir()]) == 2
+
+
+def test_refresh_rewrites_only_segments_touching_the_range(monkeypatch):
+    monkeypatch.setattr(panel_store, "SEGMENT_DAYS", 2)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        store = OHLCVPanelStore(Path(temp_dir) / "panel", repository)
+        days = ["20260105", "20260106", "20260107", "20260108", "20260109"]
+        repository.upsert_daily_data(_bars("000001", [(day, 10.0 + index) for index, day in enumerate(days)]))
+        store.refresh("20260105", "20260109")
+        # Segments are built from columnar panel queries, not cached histories.
+        assert repository.market_cache.current_bytes == 0
+        before = [segment.name for segment in store.open().segments]
+        assert len(before) == 3
+
+        repository.upsert_daily_data(_bars("000001", [("20260107", 99.0)]))
+        store.refresh("20260107", "20260107")
+
+        after = [segment.name for segment in store.open().segments]
+        assert after[0] == before[0] and after[2] == before[2] and after[1] != before[1]
+        closes = store.get_histories(["000001"], "20260105", "20260109")["000001"]["close"].tolist()
+        assert closes == [10.0, 11.0, 99.0, 13.0, 14.0]
+        assert store.get_panel("20260105", "20260109")["close"]["000001"].tolist() == closes
+
+
+def test_online_fetch_marks_panel_stale_until_next_refresh():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        store = OHLCVPanelStore(Path(temp_dir) / "panel", repository)
+        repository.upsert_daily_data(_bars("000001", [("20260105", 10.0)]))
+        repository.upsert_daily_data(_bars("000002", [("20260105", 20.0), ("20260106", 21.0)]))
+        store.refresh("20260105", "20260106")
+
+        online = TradeDataService(
+            repository,
+            data_source=StubDataSource(_bars("000001", [("20260105", 10.0), ("20260106", 12.0)])),
+            allow_online_fetch=True,
+            panel_store=store,
+        )
+        online.ensure_daily_data("000001", "Alpha", "20260105", "20260106", ["20260106"])
+
+        offline = TradeDataService(repository, data_source=None, allow_online_fetch=False, panel_store=store)
+        histories = offline.get_histories_for_scan(["000001", "000002"], "20260105", "20260106", ["20260106"])
+        assert histories["000001"]["close"].tolist() == [10.0, 12.0]
+        assert store.get_panel("20260105", "20260106") is None
+
+        store.refresh("20260106", "20260106")
+        assert store.get_histories(["000001"], "20260105", "20260106")["000001"]["close"].tolist() == [10.0, 12.0]
+        assert store.get_panel("20260105", "20260106")["close"]["000001"].tolist() == [10.0, 12.0]
+
+
+def test_trade_data_service_reads_scan_batches_from_panel():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        store = OHLCVPanelStore(Path(temp_dir) / "panel", repository)
+        repository.upsert_daily_data(_bars("000001", [("20260105", 10.0)]))
+        store.refresh("20260105", "20260105")
+        # Written after the refresh, so only the repository has it.
+        repository.upsert_daily_data(_bars("000002", [("20260105", 20.0)]))
+
+        service = TradeDataService(repository, data_source=None, allow_online_fetch=False, panel_store=store)
+        histories = service.get_histories_for_scan(["000001", "000002"], "20260105", "20260105", ["20260105"])
+
+        assert histories["000001"]["close"].tolist() == [10.0]
+        assert histories["000002"]["close"].tolist() == [20.0]
+
+
+def test_daily_sync_refreshes_panel_after_writing_bars():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        store = OHLCVPanelStore(Path(temp_dir) / "panel", repository)
+        service = DataSyncService(
+            stock_repository=repository,
+            job_repository=DuckDBJobRepository(db_path),
+            data_source=StubDataSource(_bars("000001", [("20260105", 10.0)])),
+            stock_fetcher=lambda: pd.DataFrame([{"code": "000001", "name": "Alpha"}]),
+            panel_store=store,
+        )
+
+        service.run(job_id="sync-1", scope="all", start_date="20260105", end_date="20260105")
+
+        assert store.get_histories(["000001"], "20260105", "20260105")["000001"]["close"].tolist() == [10.0]
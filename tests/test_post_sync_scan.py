@@ -0,0 +1,93 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService
+from backend.application.tasks import ResearchJobService
+from backend.infrastructure.persistence.duckdb_repository import DuckDBJobRepository, DuckDBStockRepository
+from backend.strategies.gap_breakout import GapBreakoutStrategy
+from backend.strategies.high_volume import HighVolumeStrategy
+from tests.test_api import _test_config
+from tests.test_panel_engine import _hits, _market
+from tests.test_sync_writer import PerCodeDataSource, _service
+
+
+class GrowingDataSource(PerCodeDataSource):
+    def __init__(self, dates):
+        super().__init__()
+        self.dates = dates
+
+    def do_fetch(self, stock_code, market_code, start_date, end_date):
+        return pd.DataFrame([
+            {"date": date, "open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0, "volume": 100, "amount": 100.0}
+            for date in self.dates
+        ])
+
+
+def test_daily_sync_reports_only_the_trade_dates_it_added():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        source = GrowingDataSource(["20260105", "20260106"])
+        added = []
+        service, _ = _service(temp_dir, source, on_new_bars=lambda job_id, dates: added.append((job_id, dates)))
+
+        service.run(job_id="sync-1", scope="daily", start_date="20260105", end_date="20260107")
+        service.run(job_id="sync-2", scope="daily", start_date="20260105", end_date="20260107")
+        source.dates.append("20260107")
+        service.run(job_id="sync-3", scope="daily", start_date="20260105", end_date="20260107")
+
+        assert [job_id for job_id, _ in added] == ["sync-1", "sync-3"]
+        assert added[0][1]["000003"] == ["20260105", "20260106"]
+        assert added[1][1] == {f"0000{index:02d}": ["20260107"] for index in range(10)}
+
+
+def test_new_bars_queue_a_scan_of_the_latest_new_dates_for_their_codes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        app_config = _test_config(db_path)
+        app_config["defaults"]["scan_after_sync_max_dates"] = 1
+        calls = []
+
+        def scan_runner(start_date, end_date, target_dates, job_id=None, strategy_classes=None, stock_codes=None):
+            calls.append((target_dates, stock_codes))
+            return 0
+
+        job_service = ResearchJobService(
+            stock_repository=DuckDBStockRepository(db_path),
+            job_repository=DuckDBJobRepository(db_path),
+            app_config=app_config,
+            sync_service=None,
+            backtest_service=None,
+            scan_runner=scan_runner,
+            auto_start=False,
+        )
+
+        job = job_service.scan_new_bars("sync-1", {"000001": ["20260101", "20260102"], "000002": ["20260101"]})
+        job_service.run_job(job["job_id"])
+
+        assert calls == [(["20260102"], ["000001"])]
+        assert job_service.scan_new_bars("sync-2", {}) is None
+
+
+def test_scan_limited_to_stock_codes_matches_the_full_scan_for_them():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+        for bars in market.values():
+            repository.upsert_daily_data(bars)
+        days = market["000001"]["date"]
+        start, end = days.iloc[0].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d")
+        targets = [day.strftime("%Y%m%d") for day in days.iloc[1:]]
+        executor = StrategyExecutor(
+            trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+            repository=repository,
+            strategies=[HighVolumeStrategy(), GapBreakoutStrategy()],
+            max_workers=2,
+        )
+
+        full = executor.run(start, end, targets)
+        limited = executor.run(start, end, targets, stock_codes=["000002", "000009"])
+
+        assert limited
+        assert _hits(limited) == {hit for hit in _hits(full) if hit[0] in {"000002", "000009"}}
@@ -0,0 +1,68 @@
+import tempfile
+from multiprocessing.shared_memory import SharedMemory
+from pathlib import Path
+
+import pytest
+
+from backend.application.strategy import process_pool
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService, scan_stock_data
+from backend.application.strategy.process_pool import pack_shard, release_shard, scan_shard
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+from backend.strategies.gap_breakout import GapBreakoutStrategy
+from backend.strategies.high_volume import HighVolumeStrategy
+from backend.strategies.strong_limit_up import StrongLimitUpBreakoutStrategy
+from tests.test_panel_engine import _hits, _market
+
+
+def test_shard_round_trips_histories_through_shared_memory(monkeypatch):
+    market = _market()
+    histories = {code: bars.drop(columns="stock_code") for code, bars in market.items()}
+    histories["000001"] = histories["000001"].assign(ma20=histories["000001"]["close"].rolling(20).mean())
+    chunk = [(code, f"S{code}") for code in market] + [("000404", "missing")]
+    strategies = [HighVolumeStrategy(), GapBreakoutStrategy()]
+    monkeypatch.setattr(process_pool, "_worker_strategies", strategies)
+    targets = [day.strftime("%Y%m%d") for day in market["000001"]["date"].iloc[1:]]
+
+    shard, memory = pack_shard(chunk, histories)
+    try:
+        assert shard.codes == tuple(market)
+        results = scan_shard(shard, targets)
+    finally:
+        release_shard(memory)
+
+    expected = []
+    for code, name in chunk[:-1]:
+        expected.extend(scan_stock_data(code, name, histories[code], targets, strategies))
+    assert results and _hits(results) == _hits(expected)
+    with pytest.raises(FileNotFoundError):
+        SharedMemory(name=shard.memory_name)
+
+
+def test_process_mode_matches_thread_mode():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+        for bars in market.values():
+            repository.upsert_daily_data(bars)
+        days = market["000001"]["date"]
+        start, end = days.iloc[0].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d")
+        targets = [day.strftime("%Y%m%d") for day in days.iloc[1:]]
+        strategies = [HighVolumeStrategy(), GapBreakoutStrategy(), StrongLimitUpBreakoutStrategy()]
+
+        def executor(**options):
+            return StrategyExecutor(
+                trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+                repository=repository,
+                strategies=strategies,
+                max_workers=2,
+                history_batch_size=3,
+                **options,
+            )
+
+        expected = executor().run(start, end, targets, job_id="threads")
+        results = executor(execution_mode="process", process_workers=2).run(start, end, targets, job_id="processes")
+
+        assert results and _hits(results) == _hits(expected)
+        assert len(repository.get_strategy_results("processes")) == len(results)
+        assert isinstance(results[0]["current_volume"], int)
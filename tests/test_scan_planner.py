@@ -0,0 +1,105 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+
+from backend.application.interfaces import TradeCalendarProvider
+from backend.application.strategy.calendar import resolve_scan_dates
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService
+from backend.application.strategy.planner import ScanPlanner, lookback_start
+from backend.application.tasks import ResearchJobService
+from backend.infrastructure.persistence.duckdb_repository import DuckDBJobRepository
+from backend.strategies.dual_ma_trend import DualMATrendStrategy
+from backend.strategies.high_volume import HighVolumeStrategy
+from tests.test_coverage_index import RecordingRepository
+
+TRADE_DATES = [day.strftime("%Y%m%d") for day in pd.bdate_range("2025-06-02", "2026-01-09")]
+
+
+class BusinessDayCalendar(TradeCalendarProvider):
+    def recent_range(self, n_days: int = 60) -> tuple[str, str]:
+        return TRADE_DATES[-n_days], TRADE_DATES[-1]
+
+    def normalize_targets(self, target_dates: list[str]) -> list[str]:
+        return target_dates
+
+    def trade_dates(self, start_date: str, end_date: str) -> list[str] | None:
+        return [day for day in TRADE_DATES if start_date <= day <= end_date]
+
+
+class NoListCalendar(BusinessDayCalendar):
+    def trade_dates(self, start_date: str, end_date: str) -> list[str] | None:
+        return None
+
+
+def _bars(code: str, days: list[str]) -> pd.DataFrame:
+    return pd.DataFrame({
+        "stock_code": code, "date": days, "open": 1.0, "close": 1.0, "high": 1.0, "low": 1.0,
+        "volume": 100, "amount": 100.0,
+    })
+
+
+def test_planner_takes_requirements_from_strategies():
+    planner = ScanPlanner([HighVolumeStrategy(), DualMATrendStrategy()])
+
+    assert (planner.lookback, planner.min_history) == (101, 30)
+    assert ScanPlanner([]).lookback == 1
+
+
+def test_scan_window_is_sized_by_lookback():
+    calendar = BusinessDayCalendar()
+
+    start, end, targets = resolve_scan_dates(
+        {"defaults": {"check_days": 60}}, None, None, ["20260109", "20260102"], calendar, lookback=101,
+    )
+
+    assert (start, end, targets) == (TRADE_DATES[-106], "20260109", ["20260109", "20260102"])
+    assert len([day for day in TRADE_DATES if start <= day <= "20260102"]) == 101
+    # Without a trade list the window is estimated generously from calendar days.
+    assert lookback_start(NoListCalendar(), "20260109", 101) < TRADE_DATES[-101]
+    assert lookback_start(calendar, "20260109", 1) == "20260109"
+
+
+def test_submit_scan_defaults_window_to_strategy_lookback():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        service = ResearchJobService(
+            stock_repository=RecordingRepository(db_path),
+            job_repository=DuckDBJobRepository(db_path),
+            app_config={
+                "data_source": {},
+                "defaults": {"check_days": 20, "max_workers": 1},
+                "strategies": {"HighVolumeStrategy": {"enabled": True}, "BreakM100": {"enabled": True}},
+            },
+            sync_service=None,
+            backtest_service=None,
+            scan_runner=lambda *args, **kwargs: [],
+            calendar_provider=BusinessDayCalendar(),
+            auto_start=False,
+        )
+
+        assert service.submit_scan(target_dates=["20260109"])["start_date"] == TRADE_DATES[-101]
+        job = service.submit_scan(target_dates=["20260109"], strategy_classes=["HighVolumeStrategy"])
+        assert job["start_date"] == TRADE_DATES[-30]
+
+
+def test_executor_skips_stocks_too_short_for_every_strategy():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = RecordingRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": "000001", "name": "Long"}, {"code": "000002", "name": "Short"}])
+        repository.upsert_daily_data(_bars("000001", TRADE_DATES[-120:]))
+        repository.upsert_daily_data(_bars("000002", TRADE_DATES[-50:]))
+        start, end = TRADE_DATES[-120], TRADE_DATES[-1]
+
+        assert repository.get_bar_counts(["000001", "000002", "000003"], TRADE_DATES[-60], end) == {
+            "000001": 60, "000002": 50, "000003": 0,
+        }
+        executor = StrategyExecutor(
+            trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+            repository=repository,
+            strategies=[DualMATrendStrategy()],
+            max_workers=1,
+        )
+        executor.run(start, end, [end])
+
+        assert repository.loaded_codes == ["000001"]
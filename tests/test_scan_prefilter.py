@@ -0,0 +1,63 @@
+import tempfile
+from pathlib import Path
+
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService
+from backend.application.strategy.planner import ScanPlanner
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+from backend.strategies.continuation_gap_strategy import ContinuationGapStrategy
+from backend.strategies.gap_breakout import GapBreakoutStrategy
+from backend.strategies.high_volume import HighVolumeStrategy
+from backend.strategies.strong_limit_up import StrongLimitUpBreakoutStrategy
+from backend.strategies.two_day_up import TwoDayUpStrategy
+from tests.test_coverage_index import RecordingRepository
+from tests.test_panel_engine import _hits, _market
+
+PREFILTERED = [HighVolumeStrategy(), ContinuationGapStrategy(), GapBreakoutStrategy(), StrongLimitUpBreakoutStrategy()]
+
+
+def _load(repository, market):
+    repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+    for bars in market.values():
+        repository.upsert_daily_data(bars)
+    days = market["000001"]["date"]
+    return days.iloc[0].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d"), [day.strftime("%Y%m%d") for day in days]
+
+
+def _executor(repository, strategies, sql_prefilter):
+    return StrategyExecutor(
+        trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+        repository=repository,
+        strategies=strategies,
+        max_workers=2,
+        sql_prefilter=sql_prefilter,
+    )
+
+
+def test_prefiltered_scan_matches_the_full_scan_on_every_target_date():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        start, end, days = _load(repository, market)
+
+        for target in days[1:]:
+            full = _executor(repository, PREFILTERED, False).run(start, end, [target])
+            prefiltered = _executor(repository, PREFILTERED, True).run(start, end, [target])
+            assert _hits(prefiltered) == _hits(full), target
+
+
+def test_only_candidates_are_loaded_and_a_strategy_without_prefilter_disables_it():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = RecordingRepository(str(Path(temp_dir) / "test.duckdb"))
+        start, end, days = _load(repository, market)
+        quiet_day = next(
+            day for day in days[30:]
+            if 0 < len(ScanPlanner(PREFILTERED).candidate_codes(repository, list(market), [day])) < len(market)
+        )
+
+        _executor(repository, PREFILTERED, True).run(start, end, [quiet_day])
+        assert 0 < len(repository.loaded_codes) < len(market)
+
+        mixed = ScanPlanner(PREFILTERED + [TwoDayUpStrategy()])
+        assert mixed.prefilters is None
+        assert mixed.candidate_codes(repository, list(market), [quiet_day]) == list(market)
@@ -0,0 +1,115 @@
+import tempfile
+from pathlib import Path
+
+from fastapi.testclient import TestClient
+
+from backend.api.app import create_app
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService
+from backend.application.strategy.panel import PanelScanEngine
+from backend.application.tasks import ResearchJobService
+from backend.infrastructure.persistence.duckdb_repository import (
+    DuckDBJobRepository,
+    DuckDBScanJobRepository,
+    DuckDBStockRepository,
+)
+from backend.strategies.gap_breakout import GapBreakoutStrategy
+from backend.strategies.high_volume import HighVolumeStrategy
+from tests.test_api import _test_config
+from tests.test_panel_engine import _hits, _market
+
+
+class BatchRecordingRepository(DuckDBStockRepository):
+    def __init__(self, db_path: str):
+        super().__init__(db_path)
+        self.batches = []
+
+    def upsert_strategy_results(self, results, job_id=None):
+        self.batches.append(len(results))
+        super().upsert_strategy_results(results, job_id=job_id)
+
+
+def test_stream_writes_hits_in_bounded_batches():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = BatchRecordingRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+        for bars in market.values():
+            repository.upsert_daily_data(bars)
+        days = market["000001"]["date"]
+        start, end = days.iloc[0].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d")
+        targets = [day.strftime("%Y%m%d") for day in days.iloc[1:]]
+        strategies = [HighVolumeStrategy(), GapBreakoutStrategy()]
+
+        expected = StrategyExecutor(
+            trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+            repository=repository,
+            strategies=strategies,
+            max_workers=2,
+        ).run(start, end, targets, job_id="collected")
+        repository.batches.clear()
+
+        count = StrategyExecutor(
+            trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+            repository=repository,
+            strategies=strategies,
+            max_workers=2,
+            history_batch_size=2,
+            result_flush_rows=3,
+        ).stream(start, end, targets, job_id="streamed")
+
+        assert count == len(expected) > 3
+        assert len(repository.batches) > 1 and sum(repository.batches) == count
+        assert _hits([hit.to_dict() for hit in repository.get_strategy_results("streamed")]) == _hits(expected)
+
+        repository.batches.clear()
+        panel_count = PanelScanEngine(repository, strategies, result_flush_rows=3).stream(
+            start, end, targets, job_id="panel",
+        )
+        assert panel_count == count and len(repository.batches) > 1
+
+
+def test_results_of_a_failed_scan_stay_readable_and_flagged_partial():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        job_repository = DuckDBJobRepository(db_path)
+
+        def scan_runner(start_date, end_date, target_dates, job_id=None):
+            repository.upsert_strategy_results([{
+                "code": "000001", "name": "平安银行", "strategy": "测试命中", "target_date": target_dates[0],
+            }], job_id=job_id)
+            if target_dates[0] == "20260101":
+                raise RuntimeError("scan crashed")
+            return 1
+
+        job_service = ResearchJobService(
+            stock_repository=repository,
+            job_repository=job_repository,
+            app_config=_test_config(db_path),
+            sync_service=None,
+            backtest_service=None,
+            scan_runner=scan_runner,
+            auto_start=False,
+        )
+        app = create_app(
+            app_config=_test_config(db_path),
+            repository=repository,
+            job_repository=DuckDBScanJobRepository(db_path),
+            unified_job_repository=job_repository,
+            job_service=job_service,
+        )
+        with TestClient(app) as client:
+            failed = client.post("/api/v1/scans", json={"start": "20260101", "end": "20260102", "targets": ["20260101"]})
+            done = client.post("/api/v1/scans", json={"start": "20260101", "end": "20260102", "targets": ["20260102"]})
+            failed_id, done_id = failed.json()["job_id"], done.json()["job_id"]
+            job_service.run_job(failed_id)
+            job_service.run_job(done_id)
+
+            partial = client.get(f"/api/v1/scans/{failed_id}/results")
+            complete = client.get(f"/api/v1/scans/{done_id}/results")
+
+            assert [hit["code"] for hit in partial.json()] == ["000001"]
+            assert partial.headers["X-Scan-Complete"] == "false"
+            assert client.get(f"/api/v1/scans/{failed_id}").json()["results_complete"] is False
+            assert complete.headers["X-Scan-Complete"] == "true"
+            assert client.get(f"/api/v1/scans/{done_id}").json()["total_results"] == 1
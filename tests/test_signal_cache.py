@@ -0,0 +1,124 @@
+import tempfile
+from pathlib import Path
+
+import numpy as np
+
+from backend.application.strategy.execution import StrategyExecutor, TradeDataService, scan_stock_data
+from backend.application.strategy.signal_cache import StockSignals, row_hash_sums, window_fingerprints
+from backend.domain.strategy import BaseStrategy
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+from backend.strategies.gap_breakout import GapBreakoutStrategy
+from backend.strategies.high_volume import HighVolumeStrategy
+from tests.test_api import _v2_test_client
+from tests.test_panel_engine import _hits, _market
+
+
+class CountingGapBreakoutStrategy(GapBreakoutStrategy):
+    calls = 0
+
+    def check_series(self, hist_data, context=None):
+        type(self).calls += 1
+        return super().check_series(hist_data, context=context)
+
+
+class AboveAverageVolumeStrategy(BaseStrategy):
+    """Reads every loaded row, like an EMA or an expanding mean."""
+
+    lookback = 5
+
+    def __init__(self):
+        super().__init__("放量")
+
+    def check(self, hist_data):
+        return bool(hist_data["volume"].iloc[-1] > hist_data["volume"].mean())
+
+
+class BoundedAboveAverageVolumeStrategy(AboveAverageVolumeStrategy):
+    window_bounded = True
+
+
+def _scan(repository, targets, start, end):
+    return StrategyExecutor(
+        trade_data_service=TradeDataService(repository, data_source=None, allow_online_fetch=False),
+        repository=repository,
+        strategies=[CountingGapBreakoutStrategy(), HighVolumeStrategy()],
+        max_workers=2,
+        signal_cache=True,
+    ).run(start, end, targets)
+
+
+def test_second_scan_reuses_signals_until_bars_are_rewritten():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+        for bars in market.values():
+            repository.upsert_daily_data(bars)
+        days = market["000001"]["date"]
+        start, end = days.iloc[0].strftime("%Y%m%d"), days.iloc[-1].strftime("%Y%m%d")
+        targets = [day.strftime("%Y%m%d") for day in days.iloc[-40:]]
+
+        CountingGapBreakoutStrategy.calls = 0
+        first = _scan(repository, targets, start, end)
+        evaluated = CountingGapBreakoutStrategy.calls
+        second = _scan(repository, targets, start, end)
+
+        assert evaluated == len(market)
+        assert CountingGapBreakoutStrategy.calls == evaluated
+        assert _hits(second) == _hits(first)
+
+        rewritten = market["000001"].tail(3).assign(close=lambda bars: bars["close"] * 1.01)
+        repository.upsert_daily_data(rewritten)
+        _scan(repository, targets, start, end)
+        assert CountingGapBreakoutStrategy.calls == evaluated + 1
+
+        assert repository.purge_signals("CountingGapBreakoutStrategy") == len(market) * len(targets)
+        assert repository.purge_signals() == len(market) * len(targets)
+        _scan(repository, targets, start, end)
+        assert CountingGapBreakoutStrategy.calls == evaluated * 2 + 1
+
+
+def test_window_fingerprint_changes_only_with_bars_inside_the_window():
+    bars = _market()["000001"].head(30)
+    positions = np.array([9, 29])
+    before = window_fingerprints(row_hash_sums(bars), positions, lookback=10)
+
+    changed = bars.copy()
+    changed.loc[25, "volume"] += 1
+    after = window_fingerprints(row_hash_sums(changed), positions, lookback=10)
+
+    assert after[0] == before[0]
+    assert after[1] != before[1]
+    assert window_fingerprints(row_hash_sums(bars), positions, lookback=11)[1] != before[1]
+
+
+def test_purge_endpoint_clears_the_signal_cache():
+    with _v2_test_client() as (client, _):
+        repository = client.app.state.repository
+        repository.save_signals([
+            ("GapBreakoutStrategy", "000001", "20260102", "v1", 1, True),
+            ("HighVolumeStrategy", "000001", "20260102", "v1", 2, False),
+        ])
+
+        assert client.delete("/api/v1/signal-cache", params={"strategy": "GapBreakoutStrategy"}).json() == {"deleted": 1}
+        assert client.delete("/api/v1/signal-cache").json() == {"deleted": 1}
+
+
+def test_rows_before_the_lookback_window_invalidate_only_unbounded_strategies():
+    bars = _market()["000001"].head(30).reset_index(drop=True)
+    bars["volume"] = 1_000.0
+    bars.loc[29, "volume"] = 2_000.0
+    target = [bars["date"].iloc[-1].strftime("%Y%m%d")]
+    # Only bars outside the last lookback rows change; the mean now exceeds today's volume.
+    heavy = bars.assign(volume=lambda frame: frame["volume"].where(frame.index >= 10, 100_000.0))
+
+    for strategy, reused in ((AboveAverageVolumeStrategy(), 0), (BoundedAboveAverageVolumeStrategy(), 1)):
+        key = type(strategy).__name__
+        signals = StockSignals({}, {key: "v1"})
+        assert scan_stock_data("000001", "A", bars, target, [strategy], signals=signals)
+        known = {(row[0], row[2]): (row[4], row[5]) for row in signals.fresh}
+
+        signals = StockSignals(known, {key: "v1"})
+        hits = scan_stock_data("000001", "A", heavy, target, [strategy], signals=signals)
+        assert signals.reused == reused
+        assert bool(hits) == bool(reused)
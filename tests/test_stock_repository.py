@@ -0,0 +1,129 @@
+import tempfile
+from pathlib import Path
+
+import duckdb
+import pandas as pd
+
+from backend.infrastructure.data_sources.base import normalize_stock_data as normalize_source_data
+from backend.infrastructure.persistence.duckdb.base import (
+    column_type,
+    is_normalized_stock_data,
+    normalize_stock_data,
+)
+from backend.infrastructure.persistence.duckdb_repository import DuckDBStockRepository
+
+
+def test_upsert_daily_data_merges_raw_frame_in_one_statement():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_daily_data(pd.DataFrame([
+            {"stock_code": "000001", "date": "20260101", "open": "1.0", "close": "1.1",
+             "high": "1.2", "low": "0.9", "volume": "100.7"},
+            {"stock_code": "000001", "date": "20260102", "open": 1.1, "close": 1.2,
+             "high": 1.3, "low": 1.0, "volume": 200, "amount": 1200},
+            {"stock_code": "000001", "date": "20260102", "open": 1.1, "close": 1.25,
+             "high": 1.3, "low": 1.0, "volume": 210, "amount": 1300},
+        ]), source="stub")
+        repository.upsert_daily_data(pd.DataFrame([
+            {"stock_code": "000001", "date": "20260101", "open": 1.0, "close": 1.15,
+             "high": 1.2, "low": 0.9, "volume": 110, "amount": None},
+        ]), source="stub-2")
+
+        with repository.connection() as conn:
+            rows = conn.execute(
+                """
+                SELECT strftime(trade_date, '%Y%m%d'), close, volume, amount, source
+                FROM stock_daily_data
+                ORDER BY trade_date
+                """
+            ).fetchall()
+
+        assert [(row[0], row[1], row[2], row[3], row[4]) for row in rows] == [
+            ("20260101", 1.15, 110, None, "stub-2"),
+            ("20260102", 1.25, 210, 1300.0, "stub"),
+        ]
+
+
+def test_normalized_frames_are_detected_without_renormalizing():
+    raw = pd.DataFrame([
+        {"stock_code": "000001", "date": "20260101", "open": "1", "close": "1",
+         "high": "1", "low": "1", "volume": "1"},
+    ])
+
+    assert not is_normalized_stock_data(raw)
+    assert is_normalized_stock_data(normalize_stock_data(raw))
+    assert is_normalized_stock_data(normalize_source_data(raw))
+
+
+def test_get_stock_histories_loads_batch_with_one_query_and_splits_by_code():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        repository = DuckDBStockRepository(str(Path(temp_dir) / "test.duckdb"))
+        repository.upsert_daily_data(pd.DataFrame([
+            {"stock_code": code, "date": date, "open": close, "close": close,
+             "high": close, "low": close, "volume": 1}
+            for code, date, close in [
+                ("000002", "20260102", 21.0),
+                ("000001", "20260102", 11.0),
+                ("000001", "20260101", 10.0),
+                ("000002", "20260101", 20.0),
+                ("000003", "20260101", 30.0),
+            ]
+        ]))
+
+        histories = repository.get_stock_histories(["000002", "000001", "000009"], "20260101", "20260102")
+        everything = repository.get_stock_histories(None, "20260101", "20260101")
+
+        assert sorted(histories) == ["000001", "000002"]
+        assert histories["000001"]["close"].tolist() == [10.0, 11.0]
+        assert histories["000002"]["close"].tolist() == [20.0, 21.0]
+        assert list(histories["000002"].index) == [0, 1]
+        assert sorted(everything) == ["000001", "000002", "000003"]
+        assert repository.get_stock_histories([], "20260101", "20260102") == {}
+
+
+def test_varchar_trade_dates_are_migrated_to_native_date_columns():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "legacy.duckdb")
+        legacy = duckdb.connect(db_path)
+        legacy.execute("""
+            CREATE TABLE stock_daily_data (
+                code VARCHAR NOT NULL,
+                trade_date VARCHAR NOT NULL,
+                open DOUBLE, close DOUBLE, high DOUBLE, low DOUBLE,
+                volume BIGINT, amount DOUBLE,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (code, trade_date)
+            )
+        """)
+        legacy.execute("""
+            CREATE TABLE strategy_results (
+                job_id VARCHAR NOT NULL,
+                code VARCHAR NOT NULL,
+                name VARCHAR NOT NULL,
+                strategy VARCHAR NOT NULL,
+                target_date VARCHAR NOT NULL,
+                current_price DOUBLE,
+                current_volume BIGINT,
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                PRIMARY KEY (job_id, code, strategy, target_date)
+            )
+        """)
+        legacy.execute("""
+            INSERT INTO stock_daily_data (code, trade_date, open, close, high, low, volume, amount)
+            VALUES ('000001', '20260101', 1, 1.1, 1.2, 0.9, 100, NULL),
+                   ('000001', '20260102', 1.1, 1.2, 1.3, 1.0, 200, 1200)
+        """)
+        legacy.execute("""
+            INSERT INTO strategy_results (job_id, code, name, strategy, target_date)
+            VALUES ('job-1', '000001', 'Alpha', 'demo', '20260102')
+        """)
+        legacy.close()
+
+        repository = DuckDBStockRepository(db_path)
+
+        with repository.connection() as conn:
+            assert column_type(conn, "stock_daily_data", "trade_date") == "DATE"
+            assert column_type(conn, "strategy_results", "target_date") == "DATE"
+        assert repository.get_available_dates("000001", "20260101", "20260131") == {"20260101", "20260102"}
+        assert repository.get_stock_history("000001", "20260102", "20260102")["close"].tolist() == [1.2]
+        assert [hit.target_date for hit in repository.get_strategy_results("job-1")] == ["20260102"]
@@ -48,6 +48,20 @@ class FakeTradeDataService:
         return self.histories[code]
 
 
+class FakeBulkTradeDataService(FakeTradeDataService):
+    allow_online_fetch = False
+
+    def __init__(self, stocks, histories):
+        super().__init__(stocks, histories)
+        self.bulk_requests = []
+        self.bulk_names = {}
+
+    def get_histories_for_scan(self, codes, start_date, end_date, target_dates, names=None):
+        self.bulk_requests.append(list(codes))
+        self.bulk_names.update(names or {})
+        return {code: self.histories[code] for code in codes if code in self.histories}
+
+
 class FakeStrategyRepository:
     def __init__(self):
         self.saved_results = None
@@ -189,6 +203,62 @@ def test_strategy_executor_skips_one_stock_when_history_fetch_fails():
     assert repository.saved_job_id == "scan-job-2"
 
 
+def test_strategy_executor_loads_histories_in_batches_when_provider_supports_it():
+    trade_data_service = FakeBulkTradeDataService(
+        stocks=[
+            {"code": "000001", "name": "Alpha"},
+            {"code": "000002", "name": "Beta"},
+            {"code": "000003", "name": "Gamma"},
+        ],
+        histories={
+            "000001": _history([("20260101", 10.0, 100), ("20260102", 11.0, 120)]),
+            "000003": _history([("20260101", 30.0, 300), ("20260102", 31.0, 320)]),
+        },
+    )
+    repository = FakeStrategyRepository()
+    executor = StrategyExecutor(
+        trade_data_service=trade_data_service,
+        repository=repository,
+        strategies=[AlwaysHitStrategy()],
+        max_workers=2,
+        history_batch_size=2,
+    )
+
+    results = executor.run("20260101", "20260102", ["20260102"], job_id="scan-job-3")
+
+    assert trade_data_service.bulk_requests == [["000001", "000002"], ["000003"]]
+    assert trade_data_service.history_requests == []
+    assert sorted(result["code"] for result in results) == ["000001", "000003"]
+    assert trade_data_service.bulk_names == {"000001": "Alpha", "000002": "Beta", "000003": "Gamma"}
+
+
+def test_strategy_executor_fetches_online_per_stock_on_the_worker_pool():
+    trade_data_service = FakeBulkTradeDataService(
+        stocks=[{"code": "000001", "name": "Alpha"}, {"code": "000002", "name": "Beta"}],
+        histories={
+            "000001": _history([("20260101", 10.0, 100), ("20260102", 11.0, 120)]),
+            "000002": _history([("20260101", 20.0, 200), ("20260102", 21.0, 220)]),
+        },
+    )
+    trade_data_service.allow_online_fetch = True
+    executor = StrategyExecutor(
+        trade_data_service=trade_data_service,
+        repository=FakeStrategyRepository(),
+        strategies=[AlwaysHitStrategy()],
+        max_workers=2,
+        execution_mode="process",
+    )
+
+    results = executor.run("20260101", "20260102", ["20260102"], job_id="scan-job-4")
+
+    assert trade_data_service.bulk_requests == []
+    assert sorted((code, name) for code, name, *_ in trade_data_service.history_requests) == [
+        ("000001", "Alpha"),
+        ("000002", "Beta"),
+    ]
+    assert sorted(result["code"] for result in results) == ["000001", "000002"]
+
+
 def _history(rows):
     return pd.DataFrame(
         [
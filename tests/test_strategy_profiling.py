@@ -0,0 +1,68 @@
+import tempfile
+from pathlib import Path
+
+from backend.application.strategy.execution import scan_stock_data
+from backend.application.strategy.profiling import StrategyProfiler
+from backend.application.tasks import ResearchJobService
+from backend.infrastructure.persistence.duckdb_repository import DuckDBJobRepository, DuckDBStockRepository
+from tests.test_api import _test_config
+from tests.test_panel_engine import _market
+from tests.test_strategy_execution import AlwaysHitStrategy, ExplodingStrategy, _history
+
+
+def test_profiler_summarizes_calls_and_merges_worker_state():
+    profiler, worker = StrategyProfiler(max_samples=10), StrategyProfiler()
+    for millis in range(1, 101):
+        profiler.record("Slow", millis / 1000, hits=1)
+    worker.record("Slow", 0.5, error=True)
+    worker.record("Fast", 0.001)
+
+    profiler.merge(worker.state())
+    summary = {entry["strategy"]: entry for entry in profiler.summary()}
+
+    assert [entry["strategy"] for entry in profiler.summary()] == ["Slow", "Fast"]
+    assert (summary["Slow"]["calls"], summary["Slow"]["hits"], summary["Slow"]["errors"]) == (101, 100, 1)
+    assert summary["Slow"]["wall_seconds"] == round(sum(range(1, 101)) / 1000 + 0.5, 6)
+    assert 0 < summary["Slow"]["p50_ms"] <= summary["Slow"]["p99_ms"] <= 500
+    assert summary["Fast"]["p50_ms"] == summary["Fast"]["p99_ms"] == 1.0
+
+
+def test_scan_stock_data_records_each_check_call_with_hits_and_exceptions():
+    history = _history([("2026-01-01", 10.0, 100), ("2026-01-02", 11.0, 100), ("2026-01-05", 12.0, 100)])
+    profiler = StrategyProfiler()
+
+    scan_stock_data("000001", "平安银行", history, ["20260102", "20260105"], [AlwaysHitStrategy(), ExplodingStrategy()], profiler=profiler)
+
+    summary = {entry["strategy"]: entry for entry in profiler.summary()}
+    assert (summary["AlwaysHitStrategy"]["calls"], summary["AlwaysHitStrategy"]["hits"]) == (2, 2)
+    assert (summary["ExplodingStrategy"]["calls"], summary["ExplodingStrategy"]["errors"]) == (2, 2)
+
+
+def test_scan_job_persists_and_returns_strategy_profile():
+    market = _market()
+    with tempfile.TemporaryDirectory() as temp_dir:
+        db_path = str(Path(temp_dir) / "test.duckdb")
+        repository = DuckDBStockRepository(db_path)
+        repository.upsert_stocks([{"code": code, "name": f"S{code}"} for code in market])
+        for bars in market.values():
+            repository.upsert_daily_data(bars)
+        days = [day.strftime("%Y%m%d") for day in market["000001"]["date"]]
+        app_config = _test_config(db_path)
+        app_config["trade_calendar"]["dates"] = days
+        job_service = ResearchJobService(
+            stock_repository=repository,
+            job_repository=DuckDBJobRepository(db_path),
+            app_config=app_config,
+            sync_service=None,
+            backtest_service=None,
+            auto_start=False,
+        )
+
+        job = job_service.submit_scan(days[0], days[-1], days[-20:], strategy_classes=["HighVolumeStrategy"])
+        job_service.run_job(job["job_id"])
+
+        profile = job_service.get_scan_job(job["job_id"])["strategy_profile"]
+        assert [entry["strategy"] for entry in profile] == ["HighVolumeStrategy"]
+        assert profile[0]["calls"] == len(market)
+        assert profile[0]["hits"] == job_service.get_scan_job(job["job_id"])["total_results"]
+        assert DuckDBJobRepository(db_path).get(job["job_id"]).strategy_profile == profile
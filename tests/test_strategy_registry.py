@@ -0,0 +1,72 @@
+import os
+import sys
+import tempfile
+from pathlib import Path
+
+import pytest
+
+from backend.application.strategy.loader import StrategyRegistry, default_registry, load_strategies_from_config
+
+STRATEGY_SOURCE = '''from backend.domain.strategy import BaseStrategy
+
+
+class {name}(BaseStrategy):
+    def __init__(self):
+        super().__init__("{label}")
+
+    def check(self, hist_data):
+        return False
+'''
+
+
+def _write(directory, stem, name, label, mtime):
+    path = Path(directory) / f"{stem}.py"
+    path.write_text(STRATEGY_SOURCE.format(name=name, label=label), encoding="utf-8")
+    os.utime(path, (mtime, mtime))
+
+
+@pytest.fixture
+def strategy_package():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        package_dir = Path(temp_dir) / "registry_strategies"
+        package_dir.mkdir()
+        (package_dir / "__init__.py").write_text("", encoding="utf-8")
+        sys.path.insert(0, temp_dir)
+        try:
+            yield package_dir
+        finally:
+            sys.path.remove(temp_dir)
+            for module_name in [name for name in sys.modules if name.startswith("registry_strategies")]:
+                del sys.modules[module_name]
+
+
+def test_registry_looks_up_classes_and_loads_only_enabled_ones():
+    registry = default_registry()
+    config = {"strategies": {"HighVolumeStrategy": {"enabled": True}, "GapBreakoutStrategy": {"enabled": False}}}
+
+    assert registry.get("GapBreakoutStrategy").__name__ == "GapBreakoutStrategy"
+    assert registry.get("MissingStrategy") is None
+    assert [s.__class__.__name__ for s in load_strategies_from_config(config)] == ["HighVolumeStrategy"]
+    with pytest.raises(ValueError, match="GapBreakoutStrategy"):
+        registry.load(config, ["GapBreakoutStrategy"])
+    assert default_registry() is registry
+
+
+def test_reload_reimports_only_modules_whose_mtime_changed(strategy_package):
+    _write(strategy_package, "alpha", "AlphaStrategy", "甲", 1_000_000)
+    _write(strategy_package, "beta", "BetaStrategy", "乙", 1_000_000)
+    registry = StrategyRegistry(strategy_package, package="registry_strategies")
+    beta = registry.get("BetaStrategy")
+    assert list(registry.classes()) == ["AlphaStrategy", "BetaStrategy"]
+    assert registry.reload() == {"reloaded": [], "removed": [], "strategy_count": 2}
+
+    _write(strategy_package, "alpha", "AlphaStrategy", "甲二", 1_000_100)
+    _write(strategy_package, "gamma", "GammaStrategy", "丙", 1_000_000)
+    (strategy_package / "beta.py").unlink()
+
+    assert registry.reload() == {"reloaded": ["alpha", "gamma"], "removed": ["beta"], "strategy_count": 2}
+    assert registry.get("AlphaStrategy")().name == "甲二"
+    assert registry.get("BetaStrategy") is None
+    assert beta().name == "乙"
+    config = {"strategies": {"AlphaStrategy": {"enabled": True}, "GammaStrategy": {"enabled": True}}}
+    assert [s.name for s in registry.load(config)] == ["甲二", "丙"]
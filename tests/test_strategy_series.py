@@ -0,0 +1,167 @@
+import importlib
+import pkgutil
+
+import numpy as np
+import pandas as pd
+import pytest
+
+import backend.strategies
+from backend.application.strategy.execution import scan_stock_data
+from backend.domain.indicators import compute_indicators
+from backend.domain.strategy import BaseStrategy
+
+
+def _strategy_classes() -> list[type]:
+    classes = []
+    for module_info in pkgutil.iter_modules(backend.strategies.__path__):
+        module = importlib.import_module(f"backend.strategies.{module_info.name}")
+        for attr in vars(module).values():
+            if isinstance(attr, type) and issubclass(attr, BaseStrategy) and attr is not BaseStrategy:
+                if attr not in classes:
+                    classes.append(attr)
+    return classes
+
+
+def _eventful_bars(days: int, seed: int) -> pd.DataFrame:
+    """Random walk with limit-up days, large gaps and volume spikes."""
+    rng = np.random.default_rng(seed)
+    returns = rng.normal(0, 0.03, days)
+    events = rng.random(days)
+    returns[events < 0.04] = 0.1
+    returns[(events > 0.04) & (events < 0.07)] = -0.08
+    close = 10 * np.cumprod(1 + returns)
+    gaps = np.where(rng.random(days) < 0.06, rng.uniform(0.01, 0.25, days), rng.normal(0, 0.01, days))
+    open_ = np.r_[close[0], close[:-1] * (1 + gaps[1:])]
+    high = np.maximum(open_, close) * (1 + np.abs(rng.normal(0, 0.01, days)) * (rng.random(days) > 0.3))
+    low = np.minimum(open_, close) * (1 - np.abs(rng.normal(0, 0.015, days)))
+    volume = rng.integers(1_000, 5_000, days).astype(float)
+    spikes = rng.random(days) < 0.08
+    volume[spikes] *= rng.uniform(2, 12, spikes.sum())
+    return _frame(open_, close, high, low, volume)
+
+
+def _wave_bars(days: int, seed: int) -> pd.DataFrame:
+    """Oscillating prices; highs are noisy around the close so breakout patterns can fire."""
+    rng = np.random.default_rng(seed)
+    period = rng.uniform(8, 25)
+    trend = np.exp(np.cumsum(rng.normal(-0.001, 0.02, days)))
+    close = 10 * (1 + 0.15 * np.sin(2 * np.pi * np.arange(days) / period)) * trend
+    open_ = close * (1 + rng.normal(0, 0.01, days))
+    high = close * (1 + rng.normal(0, 0.03, days))
+    low = np.minimum(open_, close) * (1 - rng.uniform(0, 0.02, days))
+    volume = rng.integers(1_000, 5_000, days).astype(float)
+    return _frame(open_, close, high, low, volume)
+
+
+def _frame(open_, close, high, low, volume) -> pd.DataFrame:
+    return pd.DataFrame({
+        "stock_code": "000001",
+        "date": pd.bdate_range("2024-01-01", periods=len(close)),
+        "open": open_,
+        "close": close,
+        "high": high,
+        "low": low,
+        "volume": volume,
+        "amount": close * volume,
+    })
+
+
+# Seeds chosen so every non-disabled strategy fires at least once.
+DATASETS = [_eventful_bars(240, seed) for seed in (0, 2, 3, 36)] + [_wave_bars(200, seed) for seed in (3, 11, 15)]
+
+
+@pytest.mark.parametrize("strategy_class", _strategy_classes(), ids=lambda cls: cls.__name__)
+def test_check_series_matches_check_on_every_date(strategy_class):
+    strategy = strategy_class()
+    total_hits = 0
+    for history in DATASETS:
+        series = strategy.check_series(history)
+        assert list(series.index) == list(history.index)
+        expected = [bool(strategy.check(history.iloc[:end + 1].copy())) for end in range(len(history))]
+        assert [bool(flag) for flag in series] == expected
+        total_hits += sum(expected)
+    if strategy_class.__name__ not in {"LongLowerShadowReboundStrategy", "ThreeRisingPatternStrategy"}:
+        assert total_hits > 0
+
+
+@pytest.mark.parametrize("strategy_class", _strategy_classes(), ids=lambda cls: cls.__name__)
+def test_check_series_matches_check_with_precomputed_indicators(strategy_class):
+    strategy = strategy_class()
+    full_history = _eventful_bars(300, seed=11)
+    joined = pd.concat([full_history, compute_indicators(full_history).drop(columns="date")], axis=1)
+    window = joined.iloc[40:].reset_index(drop=True)
+
+    expected = [bool(strategy.check(window.iloc[:end + 1].copy())) for end in range(len(window))]
+    assert [bool(flag) for flag in strategy.check_series(window)] == expected
+
+
+def test_scan_stock_data_falls_back_to_check_without_series():
+    class PlainStrategy:
+        name = "plain"
+
+        def check(self, hist_data):
+            return hist_data["close"].iloc[-1] > hist_data["close"].iloc[0]
+
+    history = _eventful_bars(30, seed=1)
+    targets = [day.strftime("%Y%m%d") for day in history["date"].iloc[[5, 20, 29]]]
+
+    hits = scan_stock_data("000001", "A", history, targets, [PlainStrategy()])
+
+    expected = [day for day, end in zip(targets, [5, 20, 29]) if history["close"].iloc[end] > history["close"].iloc[0]]
+    assert [hit["target_date"] for hit in hits] == expected
+
+
+def test_strategies_share_indicators_through_context(monkeypatch):
+    import backend.domain.strategy as strategy_module
+    from backend.strategies.breakM100 import BreakM100
+    from backend.strategies.dual_ma_trend import DualMATrendStrategy
+    from backend.strategies.gap_breakout import GapBreakoutStrategy
+    from backend.strategies.gap_pullback import GapPullbackStrategy
+    from backend.strategies.strong_limit_up import StrongLimitUpBreakoutStrategy
+
+    computed = []
+    original = strategy_module.precomputed_or_rolling
+
+    def counting(hist_data, column):
+        computed.append(column)
+        return original(hist_data, column)
+
+    monkeypatch.setattr(strategy_module, "precomputed_or_rolling", counting)
+    history = _eventful_bars(240, seed=0)
+    targets = [day.strftime("%Y%m%d") for day in history["date"].iloc[-5:]]
+    strategies = [
+        GapBreakoutStrategy(), GapPullbackStrategy(), StrongLimitUpBreakoutStrategy(), DualMATrendStrategy(), BreakM100(),
+    ]
+
+    scan_stock_data("000001", "A", history, targets, strategies)
+
+    assert sorted(computed) == ["ma100", "vol_ma20"]
+
+
+def test_break_m100_check_does_not_modify_input():
+    from backend.strategies.breakM100 import BreakM100
+
+    history = _eventful_bars(150, seed=2)
+    columns = list(history.columns)
+
+    BreakM100().check(history)
+
+    assert list(history.columns) == columns
+
+
+def test_continuation_gap_ignores_bars_before_its_lookback():
+    from backend.strategies.continuation_gap_strategy import ContinuationGapStrategy
+
+    close = np.full(200, 10.0)
+    close[-1] = 12.6
+    open_ = close.copy()
+    open_[-1] = 12.5
+    volume = np.full(200, 1_000.0)
+    volume[:100] = 100_000.0
+    volume[-1] = 3_000.0
+    history = _frame(open_, close, close, close, volume)
+    strategy = ContinuationGapStrategy()
+
+    for window in (history.iloc[-strategy.lookback:].reset_index(drop=True), history):
+        assert strategy.check(window)
+        assert strategy.check_series(window).iloc[-1]
@@ -0,0 +1,110 @@
+import tempfile
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+from backend.application.sync import DataSyncService
+from backend.application.sync.writer import DailyBarWriter
+from backend.domain.models import Stock
+from backend.infrastructure.data_sources.base import DataSourceBase
+from backend.infrastructure.persistence.duckdb_repository import DuckDBJobRepository, DuckDBStockRepository
+
+
+class PerCodeDataSource(DataSourceBase):
+    def __init__(self):
+        super().__init__(timeout=None)
+
+    def do_fetch(self, stock_code, market_code, start_date, end_date):
+        close = float(stock_code[-2:]) + 1
+        rows = [
+            {"date": date, "open": close, "close": close, "high": close + 1, "low": close - 1,
+             "volume": 100, "amount": close * 100}
+            for date in ("20260105", "20260106")
+        ]
+        return pd.DataFrame(rows)
+
+
+class CountingStockRepository(DuckDBStockRepository):
+    def __init__(self, db_path, rejected_code=None):
+        super().__init__(db_path)
+        self.rejected_code = rejected_code
+        self.upsert_calls = 0
+        self.refreshed_batches = []
+
+    def refresh_indicators_batch(self, starts):
+        self.refreshed_batches.append(dict(starts))
+        return super().refresh_indicators_batch(starts)
+
+    def upsert_daily_data(self, data, source=None):
+        self.upsert_calls += 1
+        if self.rejected_code in set(data["stock_code"]):
+            raise ValueError(f"rejected {self.rejected_code}")
+        return super().upsert_daily_data(data, source=source)
+
+
+def _service(temp_dir, data_source, rejected_code=None, **kwargs):
+    db_path = str(Path(temp_dir) / "test.duckdb")
+    repository = CountingStockRepository(db_path, rejected_code)
+    repository.upsert_stocks([{"code": f"0000{index:02d}", "name": f"S{index}"} for index in range(10)])
+    service = DataSyncService(
+        stock_repository=repository,
+        job_repository=DuckDBJobRepository(db_path),
+        data_source=data_source,
+        daily_fetch_workers=4,
+        **kwargs,
+    )
+    return service, repository
+
+
+def test_daily_sync_writes_bars_in_batches():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service, repository = _service(
+            temp_dir, PerCodeDataSource(), write_batch_rows=6, write_flush_interval=60, write_queue_size=2,
+        )
+
+        summary = service.run(job_id="sync-1", scope="daily", start_date="20260105", end_date="20260106")
+
+        assert summary == {"total_items": 10, "success_count": 10, "failed_count": 0}
+        # 10 stocks x 2 rows flushed every 6 rows -> 4 batches instead of 10 upserts.
+        assert repository.upsert_calls == 4
+        histories = repository.get_stock_histories(None, "20260105", "20260106")
+        assert len(histories) == 10
+        assert histories["000007"]["close"].tolist() == [8.0, 8.0]
+        # Indicators are refreshed once per flushed batch, for all of its codes.
+        assert len(repository.refreshed_batches) == 4
+        assert sorted(code for batch in repository.refreshed_batches for code in batch) == sorted(histories)
+        assert len(repository.get_indicator_histories(list(histories), "20260105", "20260106")) == 10
+
+
+def test_failed_batch_falls_back_to_per_stock_writes():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        service, repository = _service(
+            temp_dir, PerCodeDataSource(), rejected_code="000003", write_batch_rows=1_000, write_flush_interval=60,
+        )
+
+        summary = service.run(job_id="sync-1", scope="daily", start_date="20260105", end_date="20260106")
+
+        assert summary == {"total_items": 10, "success_count": 9, "failed_count": 1}
+        failed = [item for item in service.job_repository.get_sync_results("sync-1") if item.status == "failed"]
+        assert [item.code for item in failed] == ["000003"]
+        assert "000003" not in repository.get_stock_histories(None, "20260105", "20260106")
+
+
+class BrokenRepository:
+    def upsert_daily_data(self, data, source=None):
+        raise SystemExit("writer thread died")
+
+
+def test_writer_failure_reaches_submit_and_exit_instead_of_hanging():
+    stock = Stock(code="000001", name="S1")
+    bars = PerCodeDataSource().do_fetch("000001", "sz", "20260105", "20260106").assign(stock_code="000001")
+
+    writer = DailyBarWriter(BrokenRepository(), batch_rows=1, max_pending=1)
+    with pytest.raises(RuntimeError, match="日线写入线程异常退出"):
+        with writer:
+            for _ in range(10):
+                writer.submit(stock, bars)
+    with pytest.raises(RuntimeError, match="日线写入线程异常退出"):
+        with DailyBarWriter(BrokenRepository(), batch_rows=1) as writer:
+            writer.submit(stock, bars)
@@ -122,6 +122,38 @@ def test_research_job_service_marks_failed_when_handler_raises():
         assert job.error == "sync exploded"
 
 
+def test_scan_job_forwards_selected_engine_to_runner():
+    with tempfile.TemporaryDirectory() as temp_dir:
+        stock_repository, job_repository = _repositories(temp_dir)
+        engines = []
+
+        def scan_runner(start_date, end_date, target_dates, job_id=None, engine=None):
+            engines.append(engine)
+            return []
+
+        service = ResearchJobService(
+            stock_repository=stock_repository,
+            job_repository=job_repository,
+            app_config=_config(),
+            sync_service=RecordingSyncService(),
+            backtest_service=RecordingBacktestService(),
+            scan_runner=scan_runner,
+            calendar_provider=FakeCalendarProvider(),
+            auto_start=False,
+        )
+
+        service.run_job(service.submit_scan(target_dates=["20260102"], engine="panel")["job_id"])
+        service.run_job(service.submit_scan(target_dates=["20260102"])["job_id"])
+
+        assert engines == ["panel", None]
+        try:
+            service.submit_scan(target_dates=["20260102"], engine="gpu")
+        except ValueError as exc:
+            assert "不支持的扫描引擎" in str(exc)
+        else:
+            raise AssertionError("submit_scan should reject unknown engines")
+
+
 def test_job_dispatcher_rejects_unsupported_job_type():
     dispatcher = JobDispatcher({})
     job = Job(job_id="job-1", type=JobType.SYNC, status=JobStatus.RUNNING, params={"scope": "stocks"})